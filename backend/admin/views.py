@@ -9,7 +9,7 @@ from starlette_admin.auth import AdminUser, AuthProvider
 from starlette_admin.exceptions import LoginFailed
 from starlette_admin.fields import (
     EmailField, IntegerField, StringField, TextAreaField,
-    BooleanField, EnumField, PasswordField, DateTimeField,
+    BooleanField, EnumField, PasswordField, DateTimeField, FloatField,
 )
 
 from backend.config import settings
@@ -189,6 +189,8 @@ class IndustryView(ModelView):
         IntegerField("id", label="ID", exclude_from_create=True, exclude_from_edit=True),
         StringField("name", label="行业名称", required=True),
         IntegerField("top_n", label="早报 Top N 条数"),
+        IntegerField("candidate_budget", label="候选预算（详情页抓取上限，留空按 Top N 自动计算）", required=False),
+        IntegerField("crawl_time_budget", label="采集时长上限（秒，留空按全局配置）", required=False),
         TextAreaField("keywords", label="行业关键词过滤（+必须 !排除 普通，留空不过滤）", required=False),
     ]
 
@@ -200,9 +202,8 @@ class IndustryView(ModelView):
         submit_btn_class="btn-primary",
     )
     async def send_morning_action(self, request: Request, pks: list) -> str:
-        from backend.tasks.scheduler import run_morning_push
-        for pk in pks:
-            await run_morning_push(int(pk), triggered_by="manual")
+        from backend.tasks.scheduler import run_morning_slot
+        await run_morning_slot([int(pk) for pk in pks], triggered_by="manual")
         return f"已触发 {len(pks)} 个行业的早报推送，请前往【推送记录】页面查看推送结果及内容"
 
     @action(
@@ -258,10 +259,23 @@ class NewsSourceView(ModelView):
         DateTimeField("last_check_at", label="最近检查时间", exclude_from_create=True, exclude_from_edit=True),
         StringField("last_error", label="最近错误", exclude_from_create=True, exclude_from_edit=True),
         IntegerField("consecutive_failures", label="连续失败次数", exclude_from_create=True, exclude_from_edit=True),
+        # 熔断状态不是数据库列，由 serialize_field_value 从进程内熔断器读取
+        StringField("breaker_state", label="熔断状态", exclude_from_create=True, exclude_from_edit=True),
     ]
+    searchable_fields = ["name", "url", "keywords"]
+    sortable_fields = ["id", "name", "weight", "industry_id", "health_status", "last_check_at", "consecutive_failures"]
 
     async def serialize_field_value(self, obj, field_name: str, request):
-        """健康状态列渲染颜色徽章"""
+        """健康状态、熔断状态列渲染颜色徽章"""
+        if field_name == "breaker_state":
+            from backend.services.circuit_breaker import HALF_OPEN, OPEN, breaker, host_key, source_key
+            source_state, host_state = breaker.state(source_key(obj.id)), breaker.state(host_key(obj.url))
+            if OPEN in (source_state, host_state):
+                scope = "源" if source_state == OPEN else "主机"
+                return f'<span class="badge bg-danger">熔断（{scope}）</span>'
+            if HALF_OPEN in (source_state, host_state):
+                return '<span class="badge bg-warning text-dark">半开（待探测）</span>'
+            return '<span class="badge bg-success">正常</span>'
         if field_name == "health_status":
             badge = {
                 "healthy": '<span class="badge bg-success">✓ 正常</span>',
@@ -410,6 +424,10 @@ class PushLogView(ModelView):
             choices=[("scheduler", "定时任务"), ("manual", "手动触发")],
         ),
         StringField("error_msg", label="跳过/失败原因"),
+        StringField("cut_off_sources", label="超时未完成的新闻源"),
+        FloatField("crawl_seconds", label="采集耗时（秒）"),
+        FloatField("rank_seconds", label="排序耗时（秒）"),
+        FloatField("send_seconds", label="发送耗时（秒）"),
         DateTimeField("created_at", label="推送时间"),
     ]
 
@@ -12,6 +12,7 @@ from starlette.middleware.sessions import SessionMiddleware
 from backend.config import settings
 from backend.database import init_db, AsyncSessionLocal
 from backend.tasks.scheduler import scheduler, reload_schedules
+from backend.utils import parse_pool
 from backend.utils.log_sanitizer import setup_log_sanitizer
 
 logging.basicConfig(level=getattr(logging, settings.log_level.upper(), logging.INFO))
@@ -55,6 +56,7 @@ async def lifespan(app: FastAPI):
     yield
     # 关闭
     scheduler.shutdown(wait=False)
+    parse_pool.shutdown()
     logger.info("应用关闭")
 
 
@@ -16,6 +16,59 @@ class Settings(BaseSettings):
     database_url: str = "sqlite+aiosqlite:///./data/app.db"
     log_level: str = "INFO"
     dashscope_api_key: str = ""  # 阿里云通义千问 API key，用于 AI 摘要生成
+    ai_summary_concurrency: int = 5  # 全局同时进行的 AI 摘要请求数上限
+    ai_summary_timeout: float = 30.0  # 单次 AI 摘要请求超时（秒）
+    summary_cache_ttl_days: int = 30  # AI 摘要缓存有效期（天）
+    summary_cache_max_entries: int = 20000  # AI 摘要缓存最大条数，超出按最近使用时间淘汰
+    crawl_candidate_factor: int = 3  # 行业未配置候选预算时，详情页抓取预算 = top_n × 该倍数
+    crawl_time_budget: float = 300.0  # 行业未配置时的早报采集总时长上限（秒），用尽后用已完成的结果继续推送，0 表示不限
+    crawl_list_phase_share: float = 0.5  # 采集总时长中留给列表页阶段的比例，其余留给详情页和摘要
+    precrawl_enabled: bool = False  # 是否在早报前后台预采集（提前抓取详情页、生成摘要并暂存），默认关闭
+    precrawl_window_minutes: int = 180  # 只预采集早报时刻在该分钟数之内（且早报任务尚未开始）的行业
+    precrawl_minute: str = "*/20"  # 预采集检查的分钟（cron 格式），默认每 20 分钟一次
+    precrawl_fresh_minutes: int = 90  # 行业在该时长内预采集过时，早报只做短时补充采集
+    precrawl_topup_budget: float = 8.0  # 已预采集时早报补充采集的时长上限（秒）
+    morning_on_time: bool = False  # 是否按历史耗时提前启动早报，使邮件在配置的时刻送达（默认关闭：到点才开始采集）
+    morning_max_lead_minutes: int = 30  # 早报最多提前启动的分钟数
+    morning_lead_history_runs: int = 7  # 估算提前量时参考最近几次定时早报的耗时
+    morning_lead_safety: float = 1.2  # 历史准备耗时的放大系数，留出余量
+    morning_stagger_seconds: int = 60  # 同一时刻的多个行业，相邻启动时间的最小间隔（秒）
+    # 详情页负缓存有效期（小时），按失败原因配置，0 表示该原因不缓存
+    negative_cache_hours: dict[str, float] = {
+        "http_4xx": 7 * 24, "rejected": 7 * 24, "empty": 24, "timeout": 1, "server_error": 1, "error": 1,
+    }
+    breaker_failure_threshold: int = 3  # 新闻源 / 主机连续失败该次数后熔断（快速失败），0 表示关闭熔断
+    breaker_open_seconds: float = 900.0  # 熔断后经过该秒数放行一次探测请求（不重试）；重启后只恢复该时长内的健康检查结果
+    candidate_store_days: int = 3  # 已抓取详情页、生成摘要的候选文章保留天数（期间不再重复抓取），0 表示不保存
+    finance_snapshot_ttl: float = 300.0  # 行情快照缓存有效期（秒），同一时段的多个行业晚报共享
+    dns_cache_ttl: float = 300.0  # SSRF 校验的 DNS 解析结果缓存有效期（秒）
+    crawl_max_in_flight: int = 20  # 全局同时进行的抓取请求数上限（所有源、所有行业共享）
+    crawl_per_host: int = 4  # 同一主机同时进行的抓取请求数上限
+    crawl_host_delay: float = 0.0  # 同一主机相邻两次请求的最小间隔（秒）
+    crawl_host_delays: dict[str, float] = {}  # 按主机单独配置最小间隔，JSON 格式，如 {"www.nea.gov.cn": 1.0}
+    http_cache_dir: str = "./data/http_cache"  # 列表页 / 详情页 HTTP 条件请求缓存目录
+    http_cache_max_bytes: int = 200 * 1024 * 1024  # HTTP 缓存磁盘占用上限（字节），0 表示关闭缓存
+    html_parser: str = "auto"  # HTML 解析后端：auto（优先 selectolax）| bs4
+    parse_workers: int = 0  # HTML 解析进程池大小，0 表示在事件循环内解析
+    parse_offload_min_bytes: int = 256 * 1024  # 页面不小于该字节数时才交给进程池解析
+    article_doc_cache_size: int = 256  # 文章解析结果进程内缓存条数
+    article_doc_cache_ttl: float = 3600.0  # 文章解析结果缓存有效期（秒）
+    crawl_max_response_bytes: int = 5 * 1024 * 1024  # 单个列表页 / 详情页响应体字节上限，超出部分截断，0 表示不限
+    crawl_inflight_bytes: int = 64 * 1024 * 1024  # 全局下载中响应体的字节预算，用尽时新请求排队等待，0 表示不限
+    seen_index_enabled: bool = True  # 进程内已推送 URL 索引（布隆过滤器），判定未推送的候选不再查库
+    seen_index_capacity: int = 100_000  # 布隆过滤器预期条数（实际条数更多时按 2 倍实际条数分配）
+    seen_index_error_rate: float = 0.01  # 布隆过滤器目标误判率
+    seen_index_recent_hours: int = 48  # 近期推送的 URL 保存精确哈希，命中时无需查库
+    # 规范化文章链接时去掉的跟踪参数（"utm_*" 表示前缀匹配）；from 等常用于分页、文章 ID 的参数不在默认列表中，
+    # 确认某站点的 from 只是来源标记时用 url_canonical_rules 的 drop_params 单独去掉
+    url_tracking_params: list[str] = [
+        "utm_*", "spm", "spm_id_from", "fbclid", "gclid", "share_token", "share_from", "scene", "vd_source",
+    ]
+    # 按域名的 URL 规范化规则，JSON 格式，如 {"m.example.com": {"host": "www.example.com", "https": true}}
+    url_canonical_rules: dict[str, dict] = {}
+    crawl_article_share_ttl: float = 1800.0  # 同一时段内各行业共享已抓取文章摘要的时长（秒），0 表示不共享
+    crawl_list_share_ttl: float = 300.0  # 同一时段内各行业共享列表页响应的时长（秒），0 表示不共享
+    summary_stream_max_bytes: int = 512 * 1024  # 未启用 AI 时详情页流式读取的字节上限，0 表示关闭流式读取
 
 
 settings = Settings()
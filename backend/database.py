@@ -1,8 +1,12 @@
+import logging
+
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from backend.config import settings
 
+logger = logging.getLogger(__name__)
+
 engine = create_async_engine(
     settings.database_url,
     echo=False,
@@ -25,8 +29,75 @@ async def get_db():
         yield session
 
 
+def _migrate_seen_article(conn) -> None:
+    """
+    兼容升级：seen_article 由「自增 id + url 唯一索引」改为「64 位 URL 哈希主键」。
+
+    旧表改名后按新结构重建，分批计算规范化 URL 的哈希复制数据（相同哈希只保留一条），最后删除旧表。
+    """
+    from sqlalchemy import text
+    from backend.models.seen_article import SeenArticle, url_hash
+    from backend.utils.url_canonical import canonicalize
+
+    columns = {row[1] for row in conn.execute(text("PRAGMA table_info(seen_article)"))}
+    if not columns or "url_hash" in columns:
+        return
+
+    conn.execute(text("ALTER TABLE seen_article RENAME TO seen_article_old"))
+    conn.execute(text("DROP INDEX IF EXISTS ix_seen_article_url"))
+    SeenArticle.__table__.create(conn)
+    rows = conn.execute(text("SELECT url, title, source_id, first_seen_at FROM seen_article_old"))
+    insert = text(
+        "INSERT OR IGNORE INTO seen_article (url_hash, url, title, source_id, first_seen_at) "
+        "VALUES (:url_hash, :url, :title, :source_id, :first_seen_at)"
+    )
+    migrated = 0
+    while batch := rows.fetchmany(5000):
+        conn.execute(insert, [
+            {"url_hash": url_hash(canonicalize(url)), "url": canonicalize(url), "title": title,
+             "source_id": source_id, "first_seen_at": first_seen_at}
+            for url, title, source_id, first_seen_at in batch
+        ])
+        migrated += len(batch)
+    conn.execute(text("DROP TABLE seen_article_old"))
+    logger.info("seen_article 已迁移为 URL 哈希主键：%d 条", migrated)
+
+
+def _canonicalize_seen_article(conn) -> None:
+    """
+    兼容升级：采集时候选链接先规范化再计算哈希（见 url_canonical），
+    引入规范化之前写入的 SeenArticle 按原始 URL 计算哈希，规范化后的候选查不到它们，已推送的文章会被再次推送。
+
+    这里把 URL 与规范化结果不一致的记录改写为规范化 URL 及其哈希（已存在相同哈希时只删除旧记录）。
+    每次启动都会检查，修改 url_tracking_params / url_canonical_rules 后同样适用；SeenArticle 只保留 7 天，全表扫描开销很小。
+    """
+    from sqlalchemy import text
+    from backend.models.seen_article import url_hash
+    from backend.utils.url_canonical import canonicalize
+
+    columns = {row[1] for row in conn.execute(text("PRAGMA table_info(seen_article)"))}
+    if "url_hash" not in columns:
+        return
+
+    stale = []
+    for old_hash, url in conn.execute(text("SELECT url_hash, url FROM seen_article")):
+        canonical = canonicalize(url)
+        new_hash = url_hash(canonical)
+        if new_hash != old_hash:
+            stale.append({"old_hash": old_hash, "new_hash": new_hash, "url": canonical})
+    if not stale:
+        return
+
+    conn.execute(text(
+        "INSERT OR IGNORE INTO seen_article (url_hash, url, title, source_id, first_seen_at) "
+        "SELECT :new_hash, :url, title, source_id, first_seen_at FROM seen_article WHERE url_hash = :old_hash"
+    ), stale)
+    conn.execute(text("DELETE FROM seen_article WHERE url_hash = :old_hash"), stale)
+    logger.info("seen_article 已按规范化 URL 重新计算哈希：%d 条", len(stale))
+
+
 async def init_db():
-    from backend.models import industry, news_source, finance_item, recipient, smtp_config, seen_article, push_log  # noqa: F401
+    from backend.models import industry, news_source, finance_item, recipient, smtp_config, seen_article, push_log, summary_cache, source_snapshot, candidate_article, failed_article  # noqa: F401
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
@@ -81,3 +152,49 @@ async def init_db():
             ))
         except Exception:
             pass
+
+        try:
+            await conn.execute(text(
+                "ALTER TABLE industry ADD COLUMN candidate_budget INTEGER"
+            ))
+        except Exception:
+            pass
+
+        try:
+            await conn.execute(text(
+                "ALTER TABLE industry ADD COLUMN crawl_time_budget INTEGER"
+            ))
+        except Exception:
+            pass
+
+        try:
+            await conn.execute(text(
+                "ALTER TABLE push_log ADD COLUMN cut_off_sources TEXT"
+            ))
+        except Exception:
+            pass
+
+        try:
+            await conn.execute(text(
+                "ALTER TABLE push_log ADD COLUMN crawl_seconds FLOAT"
+            ))
+        except Exception:
+            pass
+
+        try:
+            await conn.execute(text(
+                "ALTER TABLE push_log ADD COLUMN rank_seconds FLOAT"
+            ))
+        except Exception:
+            pass
+
+        try:
+            await conn.execute(text(
+                "ALTER TABLE push_log ADD COLUMN send_seconds FLOAT"
+            ))
+        except Exception:
+            pass
+
+    async with engine.begin() as conn:
+        await conn.run_sync(_migrate_seen_article)
+        await conn.run_sync(_canonicalize_seen_article)
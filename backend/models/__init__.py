@@ -6,6 +6,10 @@ from backend.models.smtp_config import SmtpConfig
 from backend.models.push_schedule import PushSchedule
 from backend.models.seen_article import SeenArticle
 from backend.models.push_log import PushLog
+from backend.models.summary_cache import SummaryCache
+from backend.models.source_snapshot import SourceSnapshot
+from backend.models.candidate_article import CandidateArticle
+from backend.models.failed_article import FailedArticle
 
 __all__ = [
     "Industry",
@@ -16,4 +20,8 @@ __all__ = [
     "PushSchedule",
     "SeenArticle",
     "PushLog",
+    "SummaryCache",
+    "SourceSnapshot",
+    "CandidateArticle",
+    "FailedArticle",
 ]
@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.database import Base
+
+
+class CandidateArticle(Base):
+    """已处理的候选文章表 - 抓取过详情页、生成过摘要但不一定推送过的文章
+
+    与 SeenArticle（已推送标记）分开保存：未进入 Top N 的文章第二天仍是候选，
+    直接复用这里的标题和摘要参与排序，不再抓取详情页、调用 AI。
+    以规范化 URL 的 64 位哈希为主键（同 SeenArticle.url_hash）。
+    """
+    __tablename__ = "candidate_article"
+
+    url_hash: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    url: Mapped[str] = mapped_column(Text, nullable=False)
+    title: Mapped[str] = mapped_column(String(500), nullable=False, default="")  # 英文源为翻译后的中文标题
+    summary: Mapped[str] = mapped_column(Text, nullable=False)
+    language: Mapped[str] = mapped_column(String(10), nullable=False, default="zh")
+    source_id: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        ForeignKey("news_source.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    fetched_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), index=True)
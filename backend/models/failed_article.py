@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.database import Base
+
+
+class FailedArticle(Base):
+    """详情页抓取失败的文章表（负缓存）- 在 expires_at 之前不再抓取
+
+    以规范化 URL 的 64 位哈希为主键（同 SeenArticle.url_hash）；
+    有效期按失败原因不同（见 settings.negative_cache_hours），写入时计算 expires_at。
+    """
+    __tablename__ = "failed_article"
+
+    url_hash: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    url: Mapped[str] = mapped_column(Text, nullable=False)
+    reason: Mapped[str] = mapped_column(String(20), nullable=False)  # http_4xx / rejected / empty / timeout / server_error / error
+    failed_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
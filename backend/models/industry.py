@@ -20,6 +20,8 @@ class Industry(Base):
     name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     top_n: Mapped[int] = mapped_column(Integer, default=10)
     keywords: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # 行业级关键词过滤，格式同 NewsSource.keywords
+    candidate_budget: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # 每次早报最多抓取详情页的候选数，留空按 top_n 倍数
+    crawl_time_budget: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # 早报采集总时长上限（秒），留空按 settings.crawl_time_budget
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
 
     news_sources: Mapped[list["NewsSource"]] = relationship(
@@ -2,7 +2,7 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
@@ -22,5 +22,10 @@ class PushLog(Base):
     recipient_count: Mapped[int] = mapped_column(Integer, default=0)
     error_msg: Mapped[Optional[str]] = mapped_column(Text, nullable=True)    # 失败原因
     html_snapshot: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # 推送邮件 HTML 快照
+    cut_off_sources: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # 采集时长用尽时仍未完成的新闻源（、分隔）
+    # 早报各阶段耗时（秒），用于估算准点送达需要的提前量（见 push_timing）
+    crawl_seconds: Mapped[Optional[float]] = mapped_column(Float, nullable=True)   # 采集
+    rank_seconds: Mapped[Optional[float]] = mapped_column(Float, nullable=True)    # 去重、排序
+    send_seconds: Mapped[Optional[float]] = mapped_column(Float, nullable=True)    # 发送邮件
     triggered_by: Mapped[str] = mapped_column(String(20), nullable=False, default="scheduler")  # "scheduler" | "manual"
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
@@ -1,18 +1,28 @@
+import hashlib
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.database import Base
 
 
+def url_hash(url: str) -> int:
+    """URL 的 64 位有符号哈希（blake2b），即 SeenArticle 的主键"""
+    return int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
+
+
 class SeenArticle(Base):
-    """已见过的文章记录表 - 用于识别新增文章"""
+    """已见过的文章记录表 - 用于识别新增文章
+
+    以 URL 的 64 位哈希为主键（SQLite 中即 rowid，无需额外索引），
+    查询和写入都按哈希进行；完整 URL 只作记录，不建索引。
+    """
     __tablename__ = "seen_article"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    url: Mapped[str] = mapped_column(String(1000), unique=True, nullable=False, index=True)
+    url_hash: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    url: Mapped[str] = mapped_column(Text, nullable=False)
     title: Mapped[str] = mapped_column(String(500), nullable=False, default="")
     source_id: Mapped[Optional[int]] = mapped_column(
         Integer,
@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.database import Base
+
+
+class SourceSnapshot(Base):
+    """新闻源列表页指纹 - 列表页未变化时跳过链接提取，变化时只返回新出现的链接"""
+    __tablename__ = "source_snapshot"
+
+    source_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("news_source.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # sha256(选择器 + 规范化后的列表页内容)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    # 上次列表页提取到的链接（URL 哈希的 JSON 数组）
+    link_hashes: Mapped[str] = mapped_column(Text, nullable=False, default="[]")
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
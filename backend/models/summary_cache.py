@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.database import Base
+
+
+class SummaryCache(Base):
+    """AI 摘要缓存表 - 按正文内容哈希复用通义千问生成结果，避免重复调用"""
+    __tablename__ = "summary_cache"
+
+    # sha256(正文 + 语言 + 摘要字数 [+ 英文原标题])
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    title: Mapped[str] = mapped_column(String(500), nullable=False, default="")  # 英文源为翻译后的中文标题
+    summary: Mapped[str] = mapped_column(Text, nullable=False)
+    tokens: Mapped[int] = mapped_column(Integer, default=0)  # 生成该摘要消耗的 token 数
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    last_used_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, index=True)
@@ -1,109 +1,71 @@
-"""AI 摘要生成模块 - 使用阿里云通义千问 API 生成高质量新闻摘要"""
+"""AI 摘要生成模块 - 使用阿里云通义千问 API 生成高质量新闻摘要
+
+API 调用使用 dashscope 的原生异步接口（AioGeneration），不阻塞事件循环；
+全局并发数和单次超时由 settings.ai_summary_concurrency / ai_summary_timeout 控制。
+调用 API 前先查询持久化摘要缓存（见 summary_cache），命中则不再调用。
+"""
+import asyncio
 import logging
-from typing import Optional
+from typing import Optional, Union
 
-from bs4 import BeautifulSoup
-import dashscope
-from dashscope import Generation
+from dashscope import AioGeneration
 
 from backend.config import settings
+from backend.services import summary_cache
+from backend.services.article_extractor import ArticleDocument, extract_document
+from backend.utils.html_parser import Markup
+from backend.utils.parse_pool import run_parse
 
 logger = logging.getLogger(__name__)
 
+# 全局 AI 请求并发限制（所有行业、所有新闻源共享），首次调用时按配置创建
+_llm_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _get_llm_semaphore() -> asyncio.Semaphore:
+    global _llm_semaphore
+    if _llm_semaphore is None:
+        _llm_semaphore = asyncio.Semaphore(max(1, settings.ai_summary_concurrency))
+    return _llm_semaphore
 
-def _extract_article_text(html: str) -> str:
+
+async def _call_qwen(prompt: str):
     """
-    从 HTML 中提取文章正文（完整版）。
+    异步调用通义千问 API。
 
-    策略：
-    1. 查找主内容区域（article/main/.content 等）
-    2. 移除无关标签（script/style/nav/footer/aside/header）
-    3. 提取所有段落文本，过滤导航、版权等无关内容
-    4. 返回完整正文（用于 AI 理解）
+    - 受全局 Semaphore 限制，避免瞬间发出过多请求
+    - 超过 settings.ai_summary_timeout 秒未返回则取消请求并抛出 TimeoutError
+    - 调用方被取消时（CancelledError），底层 HTTP 请求随之取消
     """
-    soup = BeautifulSoup(html, "html.parser")
-
-    # 查找主内容区域（扩展选择器列表，提高匹配率）
-    content_area = None
-    for selector in [
-        "article", "main",
-        ".content", ".article-content", ".post-content",
-        "#content", "#article", "#main",
-        ".detail", ".text", ".entry-content",
-        "[class*='article']", "[class*='content']", "[id*='article']",
-    ]:
-        content_area = soup.select_one(selector)
-        if content_area:
-            logger.debug(f"找到主内容区域: {selector}")
-            break
-
-    if not content_area:
-        content_area = soup.find("body") or soup
-        logger.debug("未找到主内容区域，使用整个 body")
-
-    # 移除无关标签（扩展列表，更彻底清理）
-    for tag in content_area([
-        "script", "style", "nav", "footer", "aside", "header",
-        "iframe", "form", "button", "noscript",
-        # 常见广告和导航容器
-        ".nav", ".navigation", ".menu", ".sidebar",
-        ".ad", ".advertisement", ".banner",
-        ".related", ".recommend", ".comment",
-    ]):
-        tag.decompose()
-
-    # 提取所有段落
-    paragraphs = content_area.find_all("p", recursive=True)
-    text_parts = []
-
-    skip_keywords = [
-        "版权所有", "转载请注明", "相关阅读", "点击进入", "网站地图",
-        "关于我们", "English", "联系我们", "免责声明", "隐私政策",
-        "订阅", "分享到", "责任编辑", "来源：", "编辑：", "审核：",
-        "更多精彩", "扫一扫", "关注公众号", "下载APP",
-    ]
-
-    for p in paragraphs:
-        p_text = p.get_text(strip=True)
-
-        # 过滤过短段落
-        if len(p_text) < 15:
-            continue
-
-        # 过滤导航、版权等无关段落
-        if any(keyword in p_text for keyword in skip_keywords):
-            continue
-
-        # 过滤纯链接文本
-        if p_text.count("|") >= 3 or p_text.count(">>") >= 2:
-            continue
-
-        # 过滤纯数字、纯符号
-        if p_text.replace(" ", "").replace(".", "").replace(",", "").isdigit():
-            continue
-
-        text_parts.append(p_text)
-
-    # 拼接段落，保留段落分隔
-    full_text = "\n\n".join(text_parts)
-    logger.debug(f"提取到 {len(text_parts)} 个段落，总长度 {len(full_text)} 字")
-    return full_text
+    async with _get_llm_semaphore():
+        return await asyncio.wait_for(
+            AioGeneration.call(
+                model='qwen-turbo',
+                prompt=prompt,
+                api_key=settings.dashscope_api_key,
+                max_tokens=400,
+                temperature=0.3,
+            ),
+            timeout=settings.ai_summary_timeout,
+        )
 
 
 async def generate_summary_with_ai(
-    html: str,
+    article: Union[ArticleDocument, Markup],
     max_chars: int = 140,
     source_language: str = "zh",
-    original_title: str = ""
+    original_title: str = "",
+    encoding: Optional[str] = None,
 ) -> tuple[str, str]:
     """
     使用阿里云通义千问 API 阅读全文后生成高质量摘要。
 
     Args:
-        html: 文章详情页 HTML
+        article: 已解析的文章（见 article_extractor），或文章详情页 HTML（str 或响应原始字节）
         max_chars: 摘要最大字数（默认 140 字）
         source_language: 源语言（zh=中文, en=英文）
         original_title: 原始标题（英文源时用于翻译）
+        encoding: article 为字节时的编码
 
     Returns:
         (标题, 摘要) 元组。中文源返回 (original_title, 摘要)，英文源返回 (中文标题, 中文摘要)
@@ -115,7 +77,9 @@ async def generate_summary_with_ai(
 
     try:
         # 提取完整正文
-        full_text = _extract_article_text(html)
+        if not isinstance(article, ArticleDocument):
+            article = await run_parse(extract_document, article, encoding, size=len(article))
+        full_text = article.main_text()
 
         # 过滤过短的文本（可能是导航页或错误页）
         # 英文文章通常较短，降低阈值到 50 字符
@@ -124,6 +88,13 @@ async def generate_summary_with_ai(
             logger.debug("文章正文过短（%d 字符），跳过 AI 摘要", len(full_text))
             return (original_title, "")
 
+        # 先查持久化缓存（同一正文 + 语言 + 字数已生成过则直接复用）
+        cache_key = summary_cache.make_cache_key(full_text, source_language, max_chars, original_title)
+        cached = await summary_cache.get_cached_summary(cache_key)
+        if cached:
+            logger.debug("AI 摘要缓存命中: %s", cache_key[:12])
+            return cached
+
         # 限制输入长度（避免超过 API 限制和成本）
         # 通义千问 qwen-turbo 支持 8K tokens，约 6000 汉字
         # 为平衡质量和成本，限制在 5000 字
@@ -135,9 +106,6 @@ async def generate_summary_with_ai(
 
         logger.debug("提取正文长度: %d 字，准备调用通义千问 API 生成摘要", len(full_text))
 
-        # 配置 API Key
-        dashscope.api_key = settings.dashscope_api_key
-
         # 根据源语言构建不同的 prompt
         if source_language == "en":
             prompt = f"""你是一个专业的新闻翻译和摘要助手。请完成以下任务：
@@ -175,19 +143,16 @@ async def generate_summary_with_ai(
 文章正文：
 {full_text}"""
 
-        # 调用通义千问 API（同步调用，dashscope 暂不支持异步）
-        response = Generation.call(
-            model='qwen-turbo',
-            prompt=prompt,
-            max_tokens=400,
-            temperature=0.3,
-        )
+        # 调用通义千问 API（异步，不阻塞事件循环）
+        response = await _call_qwen(prompt)
 
         if response.status_code != 200:
             logger.warning("通义千问 API 调用失败: %s", response.message)
             return (original_title, "")
 
         result_text = response.output.text.strip()
+        usage = getattr(response, "usage", None)
+        tokens_used = (getattr(usage, "input_tokens", 0) or 0) + (getattr(usage, "output_tokens", 0) or 0)
 
         # 解析结果
         if source_language == "en":
@@ -234,6 +199,7 @@ async def generate_summary_with_ai(
 
             logger.info("英文文章翻译+摘要成功，原文 %d 字 → 标题: %s, 摘要 %d 字",
                        original_length, translated_title[:30], len(summary))
+            await summary_cache.put_cached_summary(cache_key, translated_title, summary, tokens_used)
             return (translated_title, summary)
         else:
             # 中文源：直接返回摘要
@@ -249,8 +215,12 @@ async def generate_summary_with_ai(
                 summary = summary[:max_chars] + "..."
 
             logger.info("AI 摘要生成成功，原文 %d 字 → 摘要 %d 字", original_length, len(summary))
+            await summary_cache.put_cached_summary(cache_key, original_title, summary, tokens_used)
             return (original_title, summary)
 
+    except asyncio.TimeoutError:
+        logger.warning("AI 摘要生成超时（>%.0fs）", settings.ai_summary_timeout)
+        return (original_title, "")
     except Exception as e:
         logger.warning("AI 摘要生成失败: %s", e)
         return (original_title, "")
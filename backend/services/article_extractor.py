@@ -0,0 +1,230 @@
+"""文章详情页解析 - 每篇文章只解析一次
+
+AI 摘要和降级的简单摘要原先各自解析一遍 HTML，且主内容区域、清理标签的规则各不相同。
+这里一次解析生成 ArticleDocument（标题、meta 标签、主内容区域、段落文本），两条路径共用：
+- main_text()：完整正文，作为 AI 摘要的输入
+- summary()：前 N 字正文，AI 不可用或失败时的降级摘要
+
+ArticleDocument 只包含字符串，可在解析进程池中生成（见 parse_pool），
+并按页面内容哈希在进程内缓存（同一页面被多个行业抓取、或 304 命中后重复解析时直接复用）。
+
+只需要降级摘要时（未启用 AI），SummaryStream 边下载边解析，收集到足够段落即可停止下载。
+"""
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Optional
+
+from backend.config import settings
+from backend.utils.html_parser import Markup, parse_html
+from backend.utils.parse_pool import run_parse
+from backend.utils.ttl_cache import AsyncTTLCache
+
+logger = logging.getLogger(__name__)
+
+# 主内容区域选择器，按优先级排列
+_CONTENT_SELECTORS = [
+    "article", "main",
+    ".content", ".article-content", ".post-content",
+    "#content", "#article", "#main",
+    ".detail", ".text", ".entry-content",
+    "[class*='article']", "[class*='content']", "[id*='article']",
+]
+
+# 主内容区域内需要移除的无关标签
+_NOISE_TAGS = [
+    "script", "style", "nav", "footer", "aside", "header",
+    "iframe", "form", "button", "noscript",
+]
+
+# 正文（AI 输入）过滤关键词：导航、版权、功能链接等
+_TEXT_SKIP_KEYWORDS = [
+    "版权所有", "转载请注明", "相关阅读", "点击进入", "网站地图",
+    "关于我们", "English", "联系我们", "免责声明", "隐私政策",
+    "订阅", "分享到", "责任编辑", "来源：", "编辑：", "审核：",
+    "更多精彩", "扫一扫", "关注公众号", "下载APP",
+]
+
+# 降级摘要过滤关键词
+_SUMMARY_SKIP_KEYWORDS = [
+    "版权所有", "转载请注明", "相关阅读", "点击进入",
+    "网站地图", "关于我们", "English", "联系我们",
+    "免责声明", "隐私政策", "订阅", "分享到",
+]
+
+# 页面内容哈希 → ArticleDocument
+_doc_cache: AsyncTTLCache[str, "ArticleDocument"] = AsyncTTLCache(
+    ttl=settings.article_doc_cache_ttl, maxsize=settings.article_doc_cache_size,
+)
+
+
+def _is_summary_paragraph(p_text: str) -> bool:
+    """降级摘要段落过滤：过短、纯符号、导航/版权声明、纯链接文本（连续多个 | 分隔符）"""
+    if len(p_text) < 10:
+        return False
+    if any(keyword in p_text for keyword in _SUMMARY_SKIP_KEYWORDS):
+        return False
+    return p_text.count("|") < 3
+
+
+@dataclass
+class ArticleDocument:
+    """一次解析得到的文章信息"""
+    title: str = ""                                      # <title> 文本
+    meta: dict[str, str] = field(default_factory=dict)   # meta 标签：name / property → content
+    container: str = ""                                  # 命中的主内容区域选择器，空字符串表示整个 body
+    paragraphs: list[str] = field(default_factory=list)  # 主内容区域内的非空段落文本（已移除无关标签）
+
+    def main_text(self) -> str:
+        """完整正文（用于 AI 理解）：过滤过短、导航、版权、纯链接和纯数字段落，段落间空一行"""
+        text_parts = []
+        for p_text in self.paragraphs:
+            # 过滤过短段落
+            if len(p_text) < 15:
+                continue
+            # 过滤导航、版权等无关段落
+            if any(keyword in p_text for keyword in _TEXT_SKIP_KEYWORDS):
+                continue
+            # 过滤纯链接文本
+            if p_text.count("|") >= 3 or p_text.count(">>") >= 2:
+                continue
+            # 过滤纯数字、纯符号
+            if p_text.replace(" ", "").replace(".", "").replace(",", "").isdigit():
+                continue
+            text_parts.append(p_text)
+        return "\n\n".join(text_parts)
+
+    def summary(self, max_chars: int = 140) -> str:
+        """降级摘要：拼接段落直到达到字数限制，超出部分截断并加省略号"""
+        text_parts: list[str] = []
+        total_len = 0
+        for p_text in self.paragraphs:
+            if not _is_summary_paragraph(p_text):
+                continue
+            text_parts.append(p_text)
+            total_len += len(p_text)
+            if total_len >= max_chars:
+                break
+
+        summary = "".join(text_parts)
+        if len(summary) > max_chars:
+            summary = summary[:max_chars] + "..."
+        return summary
+
+
+def extract_document(html: Markup, encoding: Optional[str] = None) -> ArticleDocument:
+    """
+    解析文章详情页（str 或响应原始字节 + encoding）。
+
+    1. 读取 <title> 和 meta 标签
+    2. 按优先级查找主内容区域，找不到时使用整个 body
+    3. 移除主内容区域内的 script/style/nav/footer 等无关标签
+    4. 提取所有段落文本
+    """
+    doc = parse_html(html, encoding)
+
+    title_tag = doc.select_one("title")
+    meta: dict[str, str] = {}
+    for tag in doc.select("meta"):
+        key = tag.attr("name") or tag.attr("property")
+        content = tag.attr("content").strip()
+        if key and content:
+            meta.setdefault(key.lower(), content)
+
+    content_area = None
+    container = ""
+    for selector in _CONTENT_SELECTORS:
+        content_area = doc.select_one(selector)
+        if content_area:
+            container = selector
+            break
+    if not content_area:
+        content_area = doc.body()
+
+    content_area.remove(_NOISE_TAGS)
+    paragraphs = [text for text in (p.text() for p in content_area.find_all("p")) if text]
+
+    return ArticleDocument(
+        title=title_tag.text() if title_tag else "",
+        meta=meta,
+        container=container,
+        paragraphs=paragraphs,
+    )
+
+
+class SummaryStream(HTMLParser):
+    """
+    增量解析详情页，只收集降级摘要所需的段落（见 ArticleDocument.summary）。
+
+    调用方分块 feed() 已解码的文本，done 为 True（合格段落已达 max_chars）后即可停止下载，
+    最后调用 document() 取得结果。与 extract_document 的区别：
+    - 不做主内容区域定位（需要完整 DOM），取全文所有 <p>，但同样跳过 script/nav/footer 等无关标签内的内容
+    - 不读取 meta 标签
+    """
+
+    def __init__(self, max_chars: int = 140):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.done = False
+        self._title: list[str] = []
+        self._in_title = False
+        self._paragraphs: list[str] = []
+        self._summary_chars = 0
+        self._noise_depth = 0
+        self._current: Optional[list[str]] = None  # 当前 <p> 内的文本片段，None 表示不在段落内
+
+    def _end_paragraph(self) -> None:
+        if self._current is None:
+            return
+        text = "".join(self._current)
+        self._current = None
+        if not text:
+            return
+        self._paragraphs.append(text)
+        if _is_summary_paragraph(text):
+            self._summary_chars += len(text)
+            if self._summary_chars >= self.max_chars:
+                self.done = True
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _NOISE_TAGS:
+            self._noise_depth += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "p" and not self._noise_depth:
+            self._end_paragraph()  # 未闭合的 <p> 遇到下一个 <p> 时结束
+            self._current = []
+
+    def handle_endtag(self, tag):
+        if tag in _NOISE_TAGS:
+            self._noise_depth = max(0, self._noise_depth - 1)
+        elif tag == "title":
+            self._in_title = False
+        elif tag == "p":
+            self._end_paragraph()
+
+    def handle_data(self, data):
+        if self._in_title:
+            self._title.append(data)
+        elif self._current is not None and not self._noise_depth:
+            text = data.strip()
+            if text:
+                self._current.append(text)
+
+    def document(self) -> ArticleDocument:
+        """结束解析并返回已收集的段落"""
+        if not self.done:
+            self.close()
+            self._end_paragraph()
+        return ArticleDocument(title="".join(self._title).strip(), paragraphs=list(self._paragraphs))
+
+
+async def get_document(content: bytes, encoding: Optional[str] = None) -> ArticleDocument:
+    """解析文章详情页原始字节，相同内容直接返回缓存结果；大页面交给解析进程池"""
+    key = hashlib.sha1(content).hexdigest() + (encoding or "")
+    doc, _ = await _doc_cache.get_or_load(
+        key, lambda: run_parse(extract_document, content, encoding, size=len(content)),
+    )
+    logger.debug("文章解析：主内容区域=%s，段落 %d 个", doc.container or "body", len(doc.paragraphs))
+    return doc
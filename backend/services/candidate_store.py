@@ -0,0 +1,115 @@
+"""已处理候选文章存储
+
+每天早报只有 Top N 篇写入 SeenArticle，列表页上的其余文章第二天仍会被当作新文章，
+重新抓取详情页、生成摘要、参与排序，积压越多重复工作越多。
+这里把抓取过详情页、摘要非空的文章保存到 CandidateArticle 表（与「已推送」标记分开）：
+- crawl_sources 过滤已推送后先查这里，命中的候选直接用保存的标题和摘要进入排序，不抓取详情页、不调用 AI
+- 后台预采集（见 scheduler.run_precrawl）提前把候选写入这里，早报推送时只需短时间补充采集；
+  列表页请求失败或超时的源，从这里按 source_id 补充候选（load_staged）
+- 超过 settings.candidate_store_days 的记录视为过期（文章通常已不在列表页上），由 cleanup_old_records 删除
+- 源语言与保存时不同的记录视为未命中（英文源的标题是翻译结果）
+
+读写都使用调用方的 session，不单独提交：随推送结束时的 commit 一起生效。
+"""
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.config import settings
+from backend.database import AsyncSessionLocal
+from backend.models.candidate_article import CandidateArticle
+from backend.models.seen_article import url_hash
+
+logger = logging.getLogger(__name__)
+
+# 单条 IN 查询最多携带的哈希数
+_QUERY_CHUNK = 500
+
+
+@dataclass
+class StoredArticle:
+    title: str
+    summary: str
+    language: str
+
+
+def _utcnow() -> datetime:
+    # SQLite DateTime 列不保存时区，统一用 naive UTC 时间比较
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def load_processed(db: AsyncSession, urls: list[str]) -> dict[str, StoredArticle]:
+    """返回 urls 中已处理且未过期的文章：url → StoredArticle"""
+    if settings.candidate_store_days <= 0 or not urls:
+        return {}
+    cutoff = _utcnow() - timedelta(days=settings.candidate_store_days)
+    by_hash = {url_hash(u): u for u in urls}
+    hashes = list(by_hash)
+    found: dict[str, StoredArticle] = {}
+    for i in range(0, len(hashes), _QUERY_CHUNK):
+        result = await db.execute(
+            select(CandidateArticle.url_hash, CandidateArticle.title,
+                   CandidateArticle.summary, CandidateArticle.language)
+            .where(CandidateArticle.url_hash.in_(hashes[i:i + _QUERY_CHUNK]),
+                   CandidateArticle.fetched_at >= cutoff)
+        )
+        for h, title, summary, language in result:
+            found[by_hash[h]] = StoredArticle(title, summary, language)
+    return found
+
+
+async def load_staged(
+    db: AsyncSession,
+    source_ids: list[int],
+    since: datetime,
+    limit: Optional[int] = None,
+) -> list[tuple[int, str, str]]:
+    """
+    返回这些源在 since（naive UTC）之后已处理的文章 [(source_id, url, title), ...]，按抓取时间倒序，最多 limit 条。
+
+    列表页本次请求失败或超时时，用于从已暂存的文章中补充候选。since 通常为上次早报或本轮预采集开始的时间：
+    更早的文章已经参与过之前的推送，不能当作本次的新文章。
+    """
+    if settings.candidate_store_days <= 0 or not source_ids or limit == 0:
+        return []
+    cutoff = max(since, _utcnow() - timedelta(days=settings.candidate_store_days))
+    query = (
+        select(CandidateArticle.source_id, CandidateArticle.url, CandidateArticle.title)
+        .where(CandidateArticle.source_id.in_(source_ids), CandidateArticle.fetched_at >= cutoff)
+        .order_by(CandidateArticle.fetched_at.desc())
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    result = await db.execute(query)
+    return [(source_id, url, title) for source_id, url, title in result]
+
+
+async def save_processed(db: AsyncSession, articles: list[tuple[str, StoredArticle, Optional[int]]]) -> None:
+    """
+    保存本次抓取的文章 [(url, StoredArticle, source_id), ...]（不提交）。
+
+    摘要为空（抓取或提取失败）的文章不保存，下次仍会重新抓取。
+    """
+    if settings.candidate_store_days <= 0:
+        return
+    now = _utcnow()
+    for url, article, source_id in articles:
+        if not article.summary:
+            continue
+        await db.merge(CandidateArticle(
+            url_hash=url_hash(url), url=url, title=article.title[:500], summary=article.summary,
+            language=article.language, source_id=source_id, fetched_at=now,
+        ))
+
+
+async def evict_processed() -> int:
+    """删除超过 candidate_store_days 的记录，返回删除条数"""
+    cutoff = _utcnow() - timedelta(days=max(0, settings.candidate_store_days))
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(delete(CandidateArticle).where(CandidateArticle.fetched_at < cutoff))
+        await db.commit()
+    return result.rowcount or 0
@@ -0,0 +1,148 @@
+"""新闻源 / 主机熔断器
+
+已经失效的新闻源在早报采集时仍会经历 3 次重试和指数退避，拖慢整个 crawl_sources 的 gather。
+这里按 key（"source:<id>" 或 "host:<主机名>"）维护三态熔断器：
+- closed：正常请求；连续失败 settings.breaker_failure_threshold 次后转为 open
+- open：不发请求，直接抛出 CircuitOpen；经过 settings.breaker_open_seconds 秒后转为 half_open
+- half_open：只放行一个探测请求（不重试），成功则恢复 closed，失败则重新 open
+
+输入来自两处：采集时的实际请求结果（见 news_crawler），以及每日健康检查的结果（见 source_health_checker）。
+进程重启后熔断状态丢失，由 crawl_sources 按 NewsSource.consecutive_failures / last_check_at 恢复：
+只恢复 settings.breaker_open_seconds 之内的健康检查结果（更早的已过冷却期，按正常请求处理）。
+默认冷却 15 分钟，每日 06:00 健康检查的结果不会影响之后数小时的早报，只在健康检查后不久重启时生效。
+settings.breaker_failure_threshold 为 0 时关闭熔断。
+"""
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+from urllib.parse import urlparse
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpen(Exception):
+    """熔断器处于打开状态，请求未发出"""
+
+
+@dataclass
+class _Circuit:
+    state: str = CLOSED
+    failures: int = 0         # 连续失败次数
+    opened_at: float = 0.0    # 最近一次打开的时间（time.time()）
+    probe_at: float = 0.0     # half_open 状态下最近一次放行探测请求的时间（0 表示尚未探测）
+    last_error: str = ""
+
+
+def source_key(source_id: int) -> str:
+    return f"source:{source_id}"
+
+
+def host_key(url: str) -> str:
+    return f"host:{(urlparse(url).hostname or '').lower()}"
+
+
+class CircuitBreaker:
+    def __init__(self):
+        self._circuits: dict[str, _Circuit] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return settings.breaker_failure_threshold > 0
+
+    def state(self, key: str) -> str:
+        """当前状态（open 且冷却期已过时报告为 half_open）"""
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            return CLOSED
+        if circuit.state == OPEN and time.time() - circuit.opened_at >= settings.breaker_open_seconds:
+            return HALF_OPEN
+        return circuit.state
+
+    def allow(self, key: str) -> bool:
+        """
+        是否允许发出请求。
+
+        open 状态冷却期已过时转为 half_open 并放行一个探测请求（调用方应在 is_probe() 为 True 时不重试）；
+        探测结束前的其他请求仍被拒绝。
+        """
+        if not self.enabled:
+            return True
+        circuit = self._circuits.get(key)
+        if circuit is None or circuit.state == CLOSED:
+            return True
+        if self.state(key) != HALF_OPEN:
+            return False
+        # 探测请求未返回结果（例如被取消）超过冷却时间时，允许再次探测
+        now = time.time()
+        if circuit.probe_at and now - circuit.probe_at < settings.breaker_open_seconds:
+            return False
+        circuit.state = HALF_OPEN
+        circuit.probe_at = now
+        logger.info("熔断器 %s 进入半开状态，发出探测请求", key)
+        return True
+
+    def is_probe(self, key: str) -> bool:
+        circuit = self._circuits.get(key)
+        return circuit is not None and circuit.state == HALF_OPEN
+
+    def check(self, key: str) -> None:
+        """allow() 为 False 时抛出 CircuitOpen"""
+        if not self.allow(key):
+            circuit = self._circuits[key]
+            raise CircuitOpen(f"{key} 已熔断（连续失败 {circuit.failures} 次：{circuit.last_error}）")
+
+    def record_success(self, key: str) -> None:
+        # 保留一条 closed 记录，之后不再按数据库中过时的健康检查结果 seed()
+        circuit = self._circuits.get(key)
+        if circuit is not None and circuit.state != CLOSED:
+            logger.info("熔断器 %s 请求成功，恢复正常", key)
+        self._circuits[key] = _Circuit()
+
+    def record_failure(self, key: str, error: str = "") -> None:
+        if not self.enabled:
+            return
+        circuit = self._circuits.setdefault(key, _Circuit())
+        circuit.failures += 1
+        circuit.last_error = error[:200]
+        if circuit.state == HALF_OPEN or circuit.failures >= settings.breaker_failure_threshold:
+            if circuit.state != OPEN:
+                logger.warning("熔断器 %s 打开（连续失败 %d 次）：%s", key, circuit.failures, circuit.last_error)
+            circuit.state = OPEN
+            circuit.opened_at = time.time()
+            circuit.probe_at = 0.0
+
+    def seed(self, key: str, failures: int, last_failure_at: Optional[datetime], error: str = "") -> None:
+        """
+        进程内没有该 key 的记录时，按数据库中的健康检查结果恢复 open 状态。
+
+        last_failure_at 早于 breaker_open_seconds 之前的结果已过冷却期，不恢复；为 None 时按当前时间处理。
+        """
+        if not self.enabled or key in self._circuits or failures < settings.breaker_failure_threshold:
+            return
+        if last_failure_at is None:
+            opened_at = time.time()
+        elif last_failure_at.tzinfo is None:
+            opened_at = last_failure_at.replace(tzinfo=timezone.utc).timestamp()
+        else:
+            opened_at = last_failure_at.timestamp()
+        if time.time() - opened_at >= settings.breaker_open_seconds:
+            return
+        self._circuits[key] = _Circuit(state=OPEN, failures=failures, opened_at=opened_at, last_error=(error or "")[:200])
+
+    def snapshot(self) -> dict[str, str]:
+        """所有非 closed 的 key → 状态（用于日志和管理后台）"""
+        return {key: self.state(key) for key in self._circuits if self.state(key) != CLOSED}
+
+    def reset(self) -> None:
+        self._circuits.clear()
+
+
+breaker = CircuitBreaker()
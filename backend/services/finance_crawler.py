@@ -1,15 +1,45 @@
-"""金融数据采集模块 - 使用 AKShare"""
+"""金融数据采集模块 - 使用 AKShare
+
+AKShare 的行情接口每次都返回整个市场的快照（A 股约 5000 行），
+因此按市场分组：每次运行每个市场只下载一次快照，建立按代码索引的查找表后解析所有数据项。
+
+快照在进程内缓存 settings.finance_snapshot_ttl 秒，同一时段推送的多个行业共享同一份快照；
+多个行业同时请求同一市场时只发起一次下载（single-flight）。
+"""
 import asyncio
 import logging
 from dataclasses import dataclass
 from datetime import datetime
-from functools import lru_cache
 
 import akshare as ak
 import pandas as pd
 
+from backend.config import settings
+from backend.utils.ttl_cache import AsyncTTLCache
+
 logger = logging.getLogger(__name__)
 
+# 进程级市场快照缓存：market → (DataFrame, 下载完成时间戳)
+_snapshot_cache: AsyncTTLCache[str, pd.DataFrame] = AsyncTTLCache(ttl=settings.finance_snapshot_ttl)
+
+# 市场 → AKShare 快照接口名（运行时通过 getattr 获取，便于测试替换）
+_MARKET_SNAPSHOT_API = {
+    "stock": "stock_zh_a_spot_em",
+    "stock_hk": "stock_hk_spot_em",
+    "futures": "futures_global_spot_em",
+}
+_MARKET_LABEL = {"stock": "A股", "stock_hk": "港股", "futures": "大宗商品"}
+
+# 只保留需要的列，降低快照常驻内存
+_SNAPSHOT_COLUMNS = ["代码", "名称", "最新价", "涨跌幅"]
+
+# 商品名称关键词映射（期货代码前两位 → 名称关键词）
+_FUTURES_KEYWORD_MAP = {
+    "cu": ["铜", "Copper", "Cu"],
+    "al": ["铝", "Aluminum", "Al"],
+    "lc": ["锂", "碳酸锂", "氢氧化锂", "Lithium"],
+}
+
 
 @dataclass
 class FinanceQuote:
@@ -18,60 +48,40 @@ class FinanceQuote:
     price: float
     change_pct: float   # 涨跌幅，单位 %
     item_type: str      # "stock" | "futures"
-    timestamp: datetime  # 数据获取时间
+    timestamp: datetime  # 数据获取时间（行情快照实际下载完成的时间）
 
 
-def _fetch_stock_a(symbol: str, name: str) -> FinanceQuote | None:
-    """获取 A 股行情"""
-    try:
-        df: pd.DataFrame = ak.stock_zh_a_spot_em()
-        row = df[df["代码"] == symbol]
-        if row.empty:
-            logger.warning("A股 %s 未找到", symbol)
-            return None
-        r = row.iloc[0]
-
-        # 格式化数据：保留2位小数
-        return FinanceQuote(
-            name=name or str(r.get("名称", symbol)),
-            symbol=symbol,
-            price=round(float(r.get("最新价", 0)), 2),
-            change_pct=round(float(r.get("涨跌幅", 0)), 2),
-            item_type="stock",
-            timestamp=datetime.now(),
-        )
-    except Exception as e:
-        logger.error("获取A股 %s 失败: %s", symbol, e)
-        return None
+def _load_snapshot(market: str) -> pd.DataFrame:
+    """下载一个市场的完整行情快照（同步，需在线程池中执行）"""
+    df: pd.DataFrame = getattr(ak, _MARKET_SNAPSHOT_API[market])()
+    columns = [c for c in _SNAPSHOT_COLUMNS if c in df.columns]
+    return df[columns].copy()
 
 
-def _fetch_stock_hk(symbol: str, name: str) -> FinanceQuote | None:
-    """获取港股行情"""
-    try:
-        df: pd.DataFrame = ak.stock_hk_spot_em()
-        row = df[df["代码"] == symbol]
-        if row.empty:
-            logger.warning("港股 %s 未找到", symbol)
-            return None
-        r = row.iloc[0]
-
-        # 格式化数据：保留2位小数
-        return FinanceQuote(
-            name=name or str(r.get("名称", symbol)),
-            symbol=symbol,
-            price=round(float(r.get("最新价", 0)), 2),
-            change_pct=round(float(r.get("涨跌幅", 0)), 2),
-            item_type="stock",
-            timestamp=datetime.now(),
-        )
-    except Exception as e:
-        logger.error("获取港股 %s 失败: %s", symbol, e)
-        return None
+def _build_code_index(df: pd.DataFrame, symbols: set[str]) -> dict[str, pd.Series]:
+    """对快照做一次向量化筛选，返回 {代码: 行} 查找表（只包含需要的代码）"""
+    subset = df[df["代码"].isin(symbols)]
+    index: dict[str, pd.Series] = {}
+    for _, row in subset.iterrows():
+        index.setdefault(str(row["代码"]), row)  # 重复代码保留第一条，与逐条查找行为一致
+    return index
+
 
+def _stock_quote(row: pd.Series, symbol: str, name: str, timestamp: datetime) -> FinanceQuote:
+    """从快照行构建股票行情（保留2位小数）"""
+    return FinanceQuote(
+        name=name or str(row.get("名称", symbol)),
+        symbol=symbol,
+        price=round(float(row.get("最新价", 0)), 2),
+        change_pct=round(float(row.get("涨跌幅", 0)), 2),
+        item_type="stock",
+        timestamp=timestamp,
+    )
 
-def _fetch_futures(symbol: str, name: str) -> FinanceQuote | None:
+
+def _match_futures(df: pd.DataFrame, code_index: dict[str, pd.Series], symbol: str) -> pd.Series | None:
     """
-    获取大宗商品/期货现货价格
+    在全球商品现货快照中匹配商品。
 
     注意：由于 AKShare 的 futures_zh_spot() API 存在 Bug，改用 futures_global_spot_em() 获取全球现货数据。
 
@@ -80,108 +90,130 @@ def _fetch_futures(symbol: str, name: str) -> FinanceQuote | None:
     - al2505/沪铝 -> 综合铝 (LALT/LMEAl/etc)
     - lc2506/碳酸锂 -> 碳酸锂/氢氧化锂相关品种
     """
+    # 方法1：直接按代码匹配（如 LCPT, LALT）
+    row = code_index.get(symbol.upper())
+    if row is not None:
+        return row
+
+    # 方法2：按名称关键词模糊匹配
+    commodity_type = symbol[:2].lower() if len(symbol) >= 2 else ""
+    for keyword in _FUTURES_KEYWORD_MAP.get(commodity_type, []):
+        name_matches = df[df["名称"].str.contains(keyword, na=False, case=False)]
+        if not name_matches.empty:
+            # 优先选择名称包含"综合"的（通常是主力品种）
+            priority_matches = name_matches[name_matches["名称"].str.contains("综合", na=False)]
+            if not priority_matches.empty:
+                return priority_matches.iloc[0]
+            return name_matches.iloc[0]
+    return None
+
+
+def _futures_quote(row: pd.Series, symbol: str, name: str, timestamp: datetime) -> FinanceQuote | None:
+    """从快照行构建大宗商品行情（保留2位小数），价格无效时返回 None"""
+    price = float(row.get("最新价", 0))
+    change_pct_str = str(row.get("涨跌幅", "0"))
+
+    # 处理涨跌幅（可能带 % 符号）
+    if "%" in change_pct_str:
+        change_pct = float(change_pct_str.replace("%", ""))
+    else:
+        change_pct = float(change_pct_str)
+
+    # 检查价格有效性
+    if price == 0 or pd.isna(price):
+        logger.warning("大宗商品 %s 价格无效: %s", symbol, price)
+        return None
+
+    return FinanceQuote(
+        name=name or str(row.get("名称", symbol)),  # 优先使用用户配置的名称
+        symbol=symbol,
+        price=round(price, 2),
+        change_pct=round(change_pct, 2),
+        item_type="futures",
+        timestamp=timestamp,
+    )
+
+
+def _resolve_market(
+    market: str, items: list[dict], df: pd.DataFrame, timestamp: datetime,
+) -> list[FinanceQuote | None]:
+    """用同一份市场快照解析该市场下的所有数据项，返回与 items 一一对应的结果（失败为 None）"""
+    label = _MARKET_LABEL[market]
+    if df.empty:
+        logger.warning("%s 行情快照为空", label)
+        return [None] * len(items)
+
+    symbols = {item["symbol"] if market != "futures" else item["symbol"].upper() for item in items}
+    index = _build_code_index(df, symbols)
+
+    quotes: list[FinanceQuote | None] = []
+    for item in items:
+        symbol = item["symbol"]
+        name = item.get("name", symbol)
+        quote = None
+        try:
+            if market == "futures":
+                row = _match_futures(df, index, symbol)
+                if row is None:
+                    logger.warning("大宗商品 %s (%s) 未找到匹配数据", symbol, name)
+                else:
+                    quote = _futures_quote(row, symbol, name, timestamp)
+            else:
+                row = index.get(symbol)
+                if row is None:
+                    logger.warning("%s %s 未找到", label, symbol)
+                else:
+                    quote = _stock_quote(row, symbol, name, timestamp)
+        except Exception as e:
+            logger.error("解析%s %s 失败: %s", label, symbol, e)
+        quotes.append(quote)
+    return quotes
+
+
+async def _get_snapshot(market: str) -> tuple[pd.DataFrame, datetime]:
+    """获取市场快照（优先使用缓存），返回 (快照, 快照下载时间)"""
+    loop = asyncio.get_running_loop()
+    df, fetched_at = await _snapshot_cache.get_or_load(
+        market, lambda: loop.run_in_executor(None, _load_snapshot, market),
+    )
+    return df, datetime.fromtimestamp(fetched_at)
+
+
+async def _fetch_market(market: str, items: list[dict]) -> list[FinanceQuote | None]:
+    """获取一次市场快照并解析该市场的全部数据项"""
     try:
-        # 获取全球商品现货数据
-        df: pd.DataFrame = ak.futures_global_spot_em()
-
-        if df.empty:
-            logger.warning("futures_global_spot_em() 返回空数据")
-            return None
-
-        # 商品名称关键词映射
-        keyword_map = {
-            "cu": ["铜", "Copper", "Cu"],
-            "al": ["铝", "Aluminum", "Al"],
-            "lc": ["锂", "碳酸锂", "氢氧化锂", "Lithium"],
-        }
-
-        # 提取商品类型（如 cu2505 -> cu）
-        commodity_type = symbol[:2].lower() if len(symbol) >= 2 else ""
-
-        # 查找匹配的商品
-        matched_row = None
-
-        # 方法1：直接按代码匹配（如 LCPT, LALT）
-        code_matches = df[df["代码"] == symbol.upper()]
-        if not code_matches.empty:
-            matched_row = code_matches.iloc[0]
-
-        # 方法2：按名称关键词模糊匹配
-        if matched_row is None and commodity_type in keyword_map:
-            keywords = keyword_map[commodity_type]
-            for keyword in keywords:
-                name_matches = df[df["名称"].str.contains(keyword, na=False, case=False)]
-                if not name_matches.empty:
-                    # 优先选择名称包含"综合"的（通常是主力品种）
-                    priority_matches = name_matches[name_matches["名称"].str.contains("综合", na=False)]
-                    if not priority_matches.empty:
-                        matched_row = priority_matches.iloc[0]
-                    else:
-                        matched_row = name_matches.iloc[0]
-                    break
-
-        if matched_row is None:
-            logger.warning("大宗商品 %s (%s) 未找到匹配数据", symbol, name)
-            return None
-
-        # 提取价格和涨跌幅
-        price = float(matched_row.get("最新价", 0))
-        change_pct_str = str(matched_row.get("涨跌幅", "0"))
-
-        # 处理涨跌幅（可能带 % 符号）
-        if "%" in change_pct_str:
-            change_pct = float(change_pct_str.replace("%", ""))
-        else:
-            change_pct = float(change_pct_str)
-
-        # 检查价格有效性
-        if price == 0 or pd.isna(price):
-            logger.warning("大宗商品 %s 价格无效: %s", symbol, price)
-            return None
-
-        # 使用匹配到的商品名称（更准确）
-        actual_name = str(matched_row.get("名称", name))
-
-        # 格式化数据：保留2位小数
-        return FinanceQuote(
-            name=name or actual_name,  # 优先使用用户配置的名称
-            symbol=symbol,
-            price=round(price, 2),
-            change_pct=round(change_pct, 2),
-            item_type="futures",
-            timestamp=datetime.now(),
-        )
+        df, timestamp = await _get_snapshot(market)
     except Exception as e:
-        logger.error("获取大宗商品 %s 失败: %s", symbol, e)
-        import traceback
-        logger.error(traceback.format_exc())
-        return None
+        logger.error("获取%s行情快照失败: %s", _MARKET_LABEL[market], e)
+        return [None] * len(items)
+    return _resolve_market(market, items, df, timestamp)
 
 
 async def fetch_quotes(items: list[dict]) -> list[FinanceQuote]:
     """
-    并发获取多个金融数据项行情。
-    items: [{"symbol": ..., "name": ..., "item_type": "stock"|"futures"}]
+    获取多个金融数据项行情。
+    items: [{"symbol": ..., "name": ..., "item_type": "stock"|"stock_hk"|"futures"}]
+
+    按市场分组，每个市场只下载一次快照；返回顺序与 items 一致（跳过获取失败的项）。
     """
-    loop = asyncio.get_event_loop()
-    tasks = []
-    for item in items:
-        symbol = item["symbol"]
-        name = item.get("name", symbol)
-        item_type = item.get("item_type", "stock")
-
-        if item_type == "futures":
-            tasks.append(loop.run_in_executor(None, _fetch_futures, symbol, name))
-        elif item_type == "stock_hk":
-            tasks.append(loop.run_in_executor(None, _fetch_stock_hk, symbol, name))
-        else:
-            tasks.append(loop.run_in_executor(None, _fetch_stock_a, symbol, name))
-
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    quotes: list[FinanceQuote] = []
-    for r in results:
+    by_market: dict[str, list[int]] = {}
+    for pos, item in enumerate(items):
+        market = item.get("item_type", "stock")
+        if market not in _MARKET_SNAPSHOT_API:
+            market = "stock"
+        by_market.setdefault(market, []).append(pos)
+
+    markets = list(by_market)
+    results = await asyncio.gather(
+        *[_fetch_market(m, [items[pos] for pos in by_market[m]]) for m in markets],
+        return_exceptions=True,
+    )
+
+    resolved: list[FinanceQuote | None] = [None] * len(items)
+    for market, r in zip(markets, results):
         if isinstance(r, Exception):
             logger.error("获取行情异常: %s", r)
-        elif r is not None:
-            quotes.append(r)
-    return quotes
+            continue
+        for pos, quote in zip(by_market[market], r):
+            resolved[pos] = quote
+    return [q for q in resolved if q is not None]
@@ -0,0 +1,184 @@
+"""HTTP 条件请求磁盘缓存
+
+列表页和详情页每次运行都会重新下载，而大部分页面在两次运行之间（或 06:00 健康检查之后）并未变化。
+本模块把带 ETag / Last-Modified 的响应压缩后存到 settings.http_cache_dir：
+- 下次请求同一 URL 时附带 If-None-Match / If-Modified-Since
+- 服务器返回 304 时直接使用磁盘上的响应体
+- 缓存总大小超过 settings.http_cache_max_bytes 时按最近使用时间淘汰
+- http_cache_max_bytes <= 0 时关闭缓存
+
+每个 URL 一个文件：第一行为 JSON 元数据，其后为 zlib 压缩的响应体。
+文件读写在线程池中执行，不阻塞事件循环；缓存读写失败只记日志，不影响抓取。
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Optional
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+_SUFFIX = ".cache"
+
+# 当前缓存总字节数（首次使用时扫描目录初始化）
+_total_bytes: Optional[int] = None
+_lock = threading.Lock()
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    content: bytes
+    encoding: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def enabled() -> bool:
+    return settings.http_cache_max_bytes > 0
+
+
+def _path(url: str) -> str:
+    return os.path.join(settings.http_cache_dir, hashlib.sha256(url.encode("utf-8")).hexdigest() + _SUFFIX)
+
+
+def _scan_total() -> int:
+    total = 0
+    if os.path.isdir(settings.http_cache_dir):
+        for entry in os.scandir(settings.http_cache_dir):
+            if entry.name.endswith(_SUFFIX):
+                total += entry.stat().st_size
+    return total
+
+
+def _add_bytes(delta: int) -> int:
+    global _total_bytes
+    with _lock:
+        if _total_bytes is None:
+            _total_bytes = _scan_total()
+        else:
+            _total_bytes += delta
+        return _total_bytes
+
+
+def _load_sync(url: str) -> Optional[CachedResponse]:
+    path = _path(url)
+    try:
+        with open(path, "rb") as f:
+            meta = json.loads(f.readline())
+            body = zlib.decompress(f.read())
+    except FileNotFoundError:
+        return None
+    if meta.get("url") != url:  # 哈希冲突（几乎不可能）时视为未命中
+        return None
+    return CachedResponse(
+        url=url, content=body, encoding=meta.get("encoding"),
+        etag=meta.get("etag"), last_modified=meta.get("last_modified"),
+    )
+
+
+def _store_sync(entry: CachedResponse) -> None:
+    os.makedirs(settings.http_cache_dir, exist_ok=True)
+    path = _path(entry.url)
+    meta = {
+        "url": entry.url, "encoding": entry.encoding,
+        "etag": entry.etag, "last_modified": entry.last_modified, "stored_at": time.time(),
+    }
+    data = json.dumps(meta, ensure_ascii=False).encode("utf-8") + b"\n" + zlib.compress(entry.content, 6)
+
+    old_size = os.path.getsize(path) if os.path.exists(path) else 0
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+    if _add_bytes(len(data) - old_size) > settings.http_cache_max_bytes:
+        _evict_sync()
+
+
+def _touch_sync(url: str) -> None:
+    try:
+        os.utime(_path(url))
+    except FileNotFoundError:
+        pass
+
+
+def _evict_sync() -> int:
+    """按最近使用时间（mtime）淘汰，直到总大小降到上限的 90%"""
+    global _total_bytes
+    with _lock:
+        entries = []
+        for entry in os.scandir(settings.http_cache_dir):
+            if entry.name.endswith(_SUFFIX):
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        target = int(settings.http_cache_max_bytes * 0.9)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        _total_bytes = total
+    if removed:
+        logger.info("HTTP 缓存淘汰 %d 个文件，当前约 %.1f MB", removed, total / 1024 / 1024)
+    return removed
+
+
+async def load(url: str) -> Optional[CachedResponse]:
+    """读取 URL 的缓存响应，不存在返回 None"""
+    if not enabled():
+        return None
+    try:
+        return await asyncio.to_thread(_load_sync, url)
+    except Exception as e:
+        logger.debug("读取 HTTP 缓存失败 [%s]: %s", url, e)
+        return None
+
+
+async def contains(url: str) -> bool:
+    """URL 是否有缓存响应（只检查文件是否存在，不读取内容）"""
+    if not enabled():
+        return False
+    return await asyncio.to_thread(os.path.exists, _path(url))
+
+
+async def store(url: str, content: bytes, encoding: Optional[str],
+                etag: Optional[str], last_modified: Optional[str]) -> None:
+    """保存响应（只有带 ETag 或 Last-Modified 的响应才值得缓存）"""
+    if not enabled() or not (etag or last_modified):
+        return
+    try:
+        await asyncio.to_thread(_store_sync, CachedResponse(url, content, encoding, etag, last_modified))
+    except Exception as e:
+        logger.debug("写入 HTTP 缓存失败 [%s]: %s", url, e)
+
+
+async def touch(url: str) -> None:
+    """304 命中后刷新最近使用时间"""
+    if not enabled():
+        return
+    try:
+        await asyncio.to_thread(_touch_sync, url)
+    except Exception as e:
+        logger.debug("更新 HTTP 缓存时间失败 [%s]: %s", url, e)
@@ -0,0 +1,98 @@
+"""详情页负缓存 - 近期抓取失败的文章在有效期内不再抓取
+
+404、超时、非网页响应、提取不到正文的链接每次采集都会重新请求，超时类错误还要经历 3 次重试退避。
+这里把失败的 URL 和原因保存到 FailedArticle 表，有效期按原因设置（settings.negative_cache_hours，单位小时）：
+- http_4xx：客户端错误（404、403 等），通常不会恢复
+- rejected：Content-Type 不是网页或响应体过大（见 news_crawler.ResponseRejected）
+- empty：页面正常但提取不到摘要
+- timeout / server_error / error：超时、5xx、其他网络错误，可能很快恢复
+circuit_open（主机已熔断，请求未发出）等有效期为 0 或未配置的原因不缓存；全部为 0（或为空）时不再查询。
+
+读写都使用调用方的 session，不单独提交：随推送结束时的 commit 一起生效；过期记录由 cleanup_old_records 删除。
+"""
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.config import settings
+from backend.database import AsyncSessionLocal
+from backend.models.failed_article import FailedArticle
+from backend.models.seen_article import url_hash
+
+logger = logging.getLogger(__name__)
+
+# 单条 IN 查询最多携带的哈希数
+_QUERY_CHUNK = 500
+
+
+@dataclass
+class NegativeCacheStats:
+    """进程内累计统计，按失败原因计数"""
+    avoided: Counter = field(default_factory=Counter)   # 命中负缓存、免于抓取的次数
+    recorded: Counter = field(default_factory=Counter)  # 写入负缓存的次数
+
+
+stats = NegativeCacheStats()
+
+
+def _utcnow() -> datetime:
+    # SQLite DateTime 列不保存时区，统一用 naive UTC 时间比较
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def load_failed(db: AsyncSession, urls: list[str]) -> dict[str, str]:
+    """返回 urls 中仍在负缓存有效期内的 URL：url → 失败原因，并计入 stats.avoided"""
+    if not urls or not any(hours > 0 for hours in settings.negative_cache_hours.values()):
+        return {}
+    now = _utcnow()
+    by_hash = {url_hash(u): u for u in urls}
+    hashes = list(by_hash)
+    found: dict[str, str] = {}
+    for i in range(0, len(hashes), _QUERY_CHUNK):
+        result = await db.execute(
+            select(FailedArticle.url_hash, FailedArticle.reason)
+            .where(FailedArticle.url_hash.in_(hashes[i:i + _QUERY_CHUNK]), FailedArticle.expires_at > now)
+        )
+        for h, reason in result:
+            found[by_hash[h]] = reason
+    stats.avoided.update(found.values())
+    return found
+
+
+async def save_failed(db: AsyncSession, failures: dict[str, str]) -> None:
+    """记录本次抓取失败的 URL {url: 原因}（不提交）"""
+    now = _utcnow()
+    for url, reason in failures.items():
+        hours = settings.negative_cache_hours.get(reason, 0)
+        if hours <= 0:
+            continue
+        await db.merge(FailedArticle(
+            url_hash=url_hash(url), url=url, reason=reason, failed_at=now, expires_at=now + timedelta(hours=hours),
+        ))
+        stats.recorded[reason] += 1
+
+
+async def evict_failed() -> int:
+    """删除已过期的记录，返回删除条数"""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(delete(FailedArticle).where(FailedArticle.expires_at <= _utcnow()))
+        await db.commit()
+    return result.rowcount or 0
+
+
+def log_stats() -> None:
+    """输出累计免于抓取和新写入的负缓存条数（按原因）"""
+    if stats.avoided or stats.recorded:
+        logger.info(
+            "详情页负缓存：累计免于抓取 %d 次（%s），写入 %d 条（%s）",
+            sum(stats.avoided.values()), _by_reason(stats.avoided),
+            sum(stats.recorded.values()), _by_reason(stats.recorded),
+        )
+
+
+def _by_reason(counter: Counter) -> str:
+    return "，".join(f"{reason} {n}" for reason, n in counter.most_common()) or "无"
@@ -2,28 +2,49 @@
 
 抓取流程：
 1. httpx 请求新闻列表页（支持 SSRF 防护）
-2. BeautifulSoup 按 CSS 选择器提取文章链接
-3. 对比数据库 SeenArticle 表，找出新增文章
-4. 批量请求文章详情页，提取前 140 字作为摘要
-5. 将新文章 URL 写入 SeenArticle，避免下次重复推送
+2. 按 CSS 选择器提取文章链接（解析后端见 backend.utils.html_parser），链接规范化后去重（见 backend.utils.url_canonical）
+3. 列表页与上次相比未变化时跳过该源；变化时只保留新出现的链接，再对比 SeenArticle 表找出新增文章
+4. 之前已抓取过详情页的候选直接复用保存的摘要；其余候选仅用列表页信息（标题、来源权重、关键词）粗排，
+   按行业候选预算剪枝
+5. 批量请求保留候选的文章详情页，生成摘要（未启用 AI 时流式读取，取够降级摘要即停止下载），结果保存供之后复用
+6. 推送成功后由调用方将推送文章写入 SeenArticle，避免下次重复推送
 """
 import asyncio
+import codecs
+import hashlib
+import json
 import logging
-from dataclasses import dataclass
+import re
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Optional
+from typing import AsyncIterator, Awaitable, Callable, Optional, TypeVar
 from urllib.parse import urljoin, urlparse
 
 import httpx
-from bs4 import BeautifulSoup
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.models.seen_article import SeenArticle
-from backend.utils.ssrf_protection import validate_url
+from backend.config import settings
+from backend.models.seen_article import SeenArticle, url_hash
+from backend.models.source_snapshot import SourceSnapshot
+from backend.services import candidate_store, http_cache, negative_cache, summary_cache
+from backend.services.article_extractor import ArticleDocument, SummaryStream, get_document
+from backend.services.candidate_store import StoredArticle
+from backend.services.circuit_breaker import CircuitOpen, breaker, host_key, source_key
+from backend.services.seen_index import seen_index
+from backend.utils.html_parser import Markup, parse_html
+from backend.utils.parse_pool import run_parse
+from backend.utils.ssrf_protection import SSRFSafeTransport, validate_url_async
+from backend.utils.ttl_cache import AsyncTTLCache
+from backend.utils.url_canonical import canonicalize, dedup_key
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 # 模拟浏览器 User-Agent，避免被部分网站屏蔽
 HEADERS = {
     "User-Agent": (
@@ -35,6 +56,16 @@ HEADERS = {
     "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
 }
 
+# 流式读取详情页时接受的 Content-Type，其余类型（PDF、图片等）在下载响应体前直接放弃
+_HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+# 每个请求开始前预占的下载字节预算（响应体更大时边下载边追加）
+_BUDGET_RESERVE_BYTES = 256 * 1024
+
+
+class ResponseRejected(ValueError):
+    """响应在下载响应体前被拒绝：Content-Type 不是网页，或 Content-Length 超过上限"""
+
 
 @dataclass
 class NewsItem:
@@ -48,51 +79,54 @@ class NewsItem:
     source_id: Optional[int] = None  # 来源 ID，用于推送后写入 SeenArticle
 
 
-def _extract_links(html: str, base_url: str, selector: str) -> list[tuple[str, str]]:
+def _extract_links(
+    html: Markup, base_url: str, selector: str, encoding: Optional[str] = None,
+) -> list[tuple[str, str]]:
     """
-    从 HTML 页面中提取文章链接。
+    从 HTML 页面（str 或响应原始字节 + encoding）中提取文章链接。
 
     selector: CSS 选择器，指向 <a> 标签，例如：
       - 'a'               提取所有链接（默认）
       - 'a.article-title' 只提取 class="article-title" 的链接
       - '.news-list a'    提取 class="news-list" 容器内所有链接
 
-    返回 [(title, absolute_url), ...]，已做以下过滤：
+    返回 [(title, canonical_url), ...]，URL 已转为绝对地址并规范化（见 url_canonical），已做以下过滤：
     - 跳过锚点链接（#...）和 javascript: 链接
     - 跳过 URL 路径过短（<5字符）的导航类链接
     - 跳过标题文字过短（<4字符）的按钮类链接（如"更多"）
-    - 去重
+    - 去重（仅跟踪参数、scheme 不同的链接视为同一篇）
     """
-    soup = BeautifulSoup(html, "html.parser")
+    doc = parse_html(html, encoding)
     results: list[tuple[str, str]] = []
     seen: set[str] = set()
 
-    tags = soup.select(selector)
+    tags = doc.select(selector)
     # 如果选择器选中的不是 <a>，则在其内部继续查找 <a>
     a_tags: list = []
     for tag in tags:
-        if tag.name == "a":
+        if tag.tag == "a":
             a_tags.append(tag)
         else:
             a_tags.extend(tag.find_all("a"))
 
     for tag in a_tags:
-        href = tag.get("href", "").strip()
+        href = tag.attr("href").strip()
         if not href or href.startswith("#") or href.startswith("javascript:"):
             continue
 
-        abs_url = urljoin(base_url, href)
+        abs_url = canonicalize(urljoin(base_url, href))
         parsed = urlparse(abs_url)
         if parsed.scheme not in ("http", "https"):
             continue
         if len(parsed.path) < 5:  # 过滤 /、/about 等短路径导航链接
             continue
-        if abs_url in seen:
+        key = dedup_key(abs_url)
+        if key in seen:
             continue
-        seen.add(abs_url)
+        seen.add(key)
 
         # 标题优先取链接文字，其次取 title 属性
-        title = tag.get_text(strip=True) or tag.get("title", "").strip()
+        title = tag.text() or tag.attr("title").strip()
         if not title or len(title) < 4:
             continue
 
@@ -101,244 +135,1111 @@ def _extract_links(html: str, base_url: str, selector: str) -> list[tuple[str, s
     return results
 
 
-async def _fetch_page(client: httpx.AsyncClient, url: str, retries: int = 3) -> str:
-    """带 SSRF 防护和指数退避重试的 HTTP 请求，返回 HTML 字符串
+@dataclass
+class CrawlStats:
+    """单次采集的统计：候选漏斗（每一阶段剩余多少候选）、按主机的排队等待时间"""
+    extracted: int = 0        # 列表页提取的链接数
+    unseen: int = 0           # 过滤已推送文章后剩余
+    keyword_passed: int = 0   # 列表页关键词规则过滤后剩余
+    budget: Optional[int] = None
+    stored_reused: int = 0    # 之前已抓取过详情页、直接复用标题和摘要的候选数（见 candidate_store）
+    staged_fallback: int = 0  # 列表页未能采集、从暂存文章补充的候选数
+    negative_skipped: int = 0  # 近期抓取失败、命中负缓存跳过的候选数（见 negative_cache）
+    detail_fetched: int = 0   # 实际抓取详情页（含 AI 摘要）的文章数
+    unchanged_sources: int = 0  # 列表页与上次相同、直接跳过的源数
+    bytes_downloaded: int = 0   # 实际从网络下载的响应体字节数
+    bytes_from_cache: int = 0   # 304 命中后从磁盘缓存读取的字节数
+    streams_stopped_early: int = 0  # 流式读取详情页时取够摘要段落、提前停止下载的文章数
+    truncated_responses: int = 0  # 响应体超过 crawl_max_response_bytes、只保留前面部分的响应数
+    rejected_responses: int = 0   # Content-Type / Content-Length 不符合、未下载响应体的响应数
+    budget_waits: int = 0         # 因全局下载字节预算用尽而排队等待的请求数
+    breaker_skipped: int = 0      # 新闻源或其主机已熔断、未请求列表页的源数
+    ai_cut_off: int = 0           # 到达采集时长上限时仍在等待 AI、降级为简单提取的文章数
+    cut_off_articles: int = 0     # 到达采集时长上限时详情页仍未完成、被取消的文章数
+    duplicate_candidates: int = 0  # 多个源（或同一源不同写法）指向同一篇文章、合并掉的候选数
+    shared_articles: int = 0       # 复用其他行业已抓取（或正在抓取）结果、未再请求详情页的文章数
+    shared_list_pages: int = 0     # 复用其他行业已下载（或正在下载）的列表页数
+    # 到达采集时长上限时列表页或详情页仍未完成的新闻源名称
+    cut_off_sources: set[str] = field(default_factory=set)
+    # 到达采集时长上限、放弃 AI 摘要降级为简单提取的文章 URL：不共享给其他行业、不写入 candidate_store
+    degraded_articles: set[str] = field(default_factory=set)
+    # 本次详情页抓取失败的文章：url → 失败原因，采集结束后写入负缓存
+    failed_articles: dict[str, str] = field(default_factory=dict)
+    # 本次抓取过详情页的文章 [(url, StoredArticle, source_id)]，写入 candidate_store
+    processed: list = field(default_factory=list)
+    # 本次的列表页指纹：source_id → _ListFingerprint，写入 SourceSnapshot
+    fingerprints: dict = field(default_factory=dict)
+    # 按主机统计排队等待时间：host → [请求数, 总等待秒数, 最长等待秒数]
+    host_waits: dict[str, list] = field(default_factory=dict)
+
+    def record_wait(self, host: str, waited: float) -> None:
+        entry = self.host_waits.setdefault(host, [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += waited
+        entry[2] = max(entry[2], waited)
+
+    def log(self) -> None:
+        fresh = self.unseen - self.duplicate_candidates - self.stored_reused - self.negative_skipped
+        logger.info(
+            "候选漏斗：列表页提取 %d → 未推送 %d（剪枝 %d）→ 跨源合并 %d 个、复用已处理 %d 篇、跳过近期失败 %d 篇"
+            " → 关键词预过滤 %d（剪枝 %d）→ 预算保留 %d（预算 %s，剪枝 %d）",
+            self.extracted,
+            self.unseen, self.extracted - self.unseen,
+            self.duplicate_candidates, self.stored_reused, self.negative_skipped,
+            self.keyword_passed, fresh - self.keyword_passed,
+            self.detail_fetched, self.budget if self.budget is not None else "不限",
+            self.keyword_passed - self.detail_fetched,
+        )
+        if self.shared_articles or self.shared_list_pages:
+            logger.info(
+                "复用其他行业的抓取结果：列表页 %d 个，文章 %d 篇",
+                self.shared_list_pages, self.shared_articles,
+            )
+        if self.unchanged_sources:
+            logger.info("列表页未变化、跳过链接提取的源：%d 个", self.unchanged_sources)
+        if self.bytes_downloaded or self.bytes_from_cache:
+            logger.info(
+                "下载流量：网络 %.1f KB，HTTP 缓存 %.1f KB",
+                self.bytes_downloaded / 1024, self.bytes_from_cache / 1024,
+            )
+        if self.failed_articles:
+            logger.info("详情页抓取失败 %d 篇：%s", len(self.failed_articles), "，".join(
+                f"{reason} {n}" for reason, n in Counter(self.failed_articles.values()).most_common()
+            ))
+        if self.streams_stopped_early:
+            logger.info("详情页流式读取提前停止：%d 篇", self.streams_stopped_early)
+        if self.cut_off_sources or self.ai_cut_off:
+            logger.warning(
+                "采集时长用尽：%d 篇文章放弃 AI 摘要、%d 篇未完成抓取；未完成的源：%s",
+                self.ai_cut_off, self.cut_off_articles, "、".join(sorted(self.cut_off_sources)) or "无",
+            )
+        if self.staged_fallback:
+            logger.info("列表页未能采集、从暂存文章补充的候选：%d 个", self.staged_fallback)
+        if self.breaker_skipped:
+            logger.info("已熔断、跳过的新闻源：%d 个", self.breaker_skipped)
+        if self.truncated_responses or self.rejected_responses or self.budget_waits:
+            logger.info(
+                "响应体限制：截断 %d 个，拒绝 %d 个；等待下载字节预算 %d 次",
+                self.truncated_responses, self.rejected_responses, self.budget_waits,
+            )
+        if self.host_waits:
+            slowest = sorted(self.host_waits.items(), key=lambda kv: kv[1][1], reverse=True)[:10]
+            logger.info("主机排队等待（按总等待时间前 10）：%s", "；".join(
+                f"{host} 请求 {n} 次 平均 {total / n:.2f}s 最长 {peak:.2f}s"
+                for host, (n, total, peak) in slowest
+            ))
+
+
+class CrawlScheduler:
+    """
+    抓取并发调度器，进程内所有新闻源、所有行业共享一个实例（见 crawl_scheduler）。
+
+    - max_in_flight：全局同时进行的 HTTP 请求数上限
+    - per_host：同一主机同时进行的请求数上限（多个源指向同一网站时合并计算）
+    - host_delay / host_delays：同一主机相邻两次请求的最小间隔（秒），host_delays 可按主机单独配置
+    """
+
+    def __init__(self, max_in_flight: int, per_host: int,
+                 host_delay: float = 0.0, host_delays: Optional[dict[str, float]] = None):
+        self.max_in_flight = max(1, max_in_flight)
+        self.per_host = max(1, per_host)
+        self.host_delay = host_delay
+        self.host_delays = host_delays or {}
+        self._global = asyncio.Semaphore(self.max_in_flight)
+        self._host_semaphores: dict[str, asyncio.Semaphore] = {}
+        self._host_locks: dict[str, asyncio.Lock] = {}
+        self._host_next_start: dict[str, float] = {}
+
+    def _delay_for(self, host: str) -> float:
+        return self.host_delays.get(host, self.host_delay)
+
+    @asynccontextmanager
+    async def slot(self, url: str, stats: Optional["CrawlStats"] = None) -> AsyncIterator[None]:
+        """
+        获取一个请求名额：先排主机队列（含最小间隔），再占用全局名额。
+
+        先取主机名额再取全局名额，避免等待某个慢主机时白白占用全局名额。
+        """
+        host = (urlparse(url).hostname or "").lower()
+        host_sem = self._host_semaphores.setdefault(host, asyncio.Semaphore(self.per_host))
+        queued_at = time.monotonic()
+
+        async with host_sem:
+            delay = self._delay_for(host)
+            if delay > 0:
+                async with self._host_locks.setdefault(host, asyncio.Lock()):
+                    wait = self._host_next_start.get(host, 0.0) - time.monotonic()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    self._host_next_start[host] = time.monotonic() + delay
+            async with self._global:
+                if stats is not None:
+                    stats.record_wait(host, time.monotonic() - queued_at)
+                yield
+
+
+crawl_scheduler = CrawlScheduler(
+    max_in_flight=settings.crawl_max_in_flight,
+    per_host=settings.crawl_per_host,
+    host_delay=settings.crawl_host_delay,
+    host_delays=settings.crawl_host_delays,
+)
+
+
+class _BudgetHold:
+    """单个请求占用的下载字节：至少为预占额度，响应体更大时按实际读取量追加"""
+    __slots__ = ("_budget", "charged", "received")
+
+    def __init__(self, budget: "ByteBudget"):
+        self._budget = budget
+        self.charged = budget.reserve
+        self.received = 0
+
+    def add(self, nbytes: int) -> None:
+        self.received += nbytes
+        charge = max(self._budget.reserve, self.received)
+        self._budget.in_use += charge - self.charged
+        self.charged = charge
+
+
+class ByteBudget:
+    """
+    全局下载字节预算，进程内所有抓取请求共享一个实例（见 download_budget）。
+
+    每个请求开始前预占 reserve 字节，下载过程中按实际读取量追加（追加不阻塞，避免下载到一半互相等待）；
+    已占用字节达到 limit 时，新请求排队等待正在下载的请求结束，以此限制同时驻留内存的响应体总量。
+    limit <= 0 表示不限。
+    """
+
+    def __init__(self, limit: int, reserve: int = _BUDGET_RESERVE_BYTES):
+        self.limit = limit
+        self.reserve = reserve
+        self.in_use = 0
+        self._cond = asyncio.Condition()
+
+    def _has_room(self) -> bool:
+        return self.limit <= 0 or self.in_use == 0 or self.in_use + self.reserve <= self.limit
+
+    @asynccontextmanager
+    async def hold(self, stats: Optional[CrawlStats] = None) -> AsyncIterator[_BudgetHold]:
+        async with self._cond:
+            if not self._has_room():
+                if stats is not None:
+                    stats.budget_waits += 1
+                await self._cond.wait_for(self._has_room)
+            self.in_use += self.reserve
+        held = _BudgetHold(self)
+        try:
+            yield held
+        finally:
+            async with self._cond:
+                self.in_use -= held.charged
+                self._cond.notify_all()
+
+
+download_budget = ByteBudget(settings.crawl_inflight_bytes)
+
+
+def _media_type(resp: httpx.Response) -> str:
+    return resp.headers.get("content-type", "").split(";")[0].strip().lower()
+
+
+def _is_text_type(media_type: str) -> bool:
+    """列表页 / 详情页可接受的 Content-Type：未声明、text/* 或 XML（含 XHTML）"""
+    return not media_type or media_type.startswith("text/") or media_type.endswith("xml")
+
+
+def _is_html_type(media_type: str) -> bool:
+    return not media_type or media_type in _HTML_CONTENT_TYPES
+
+
+def _check_response(
+    resp: httpx.Response,
+    accept: Callable[[str], bool],
+    max_bytes: Optional[int] = None,
+    stats: Optional[CrawlStats] = None,
+) -> None:
+    """读取响应体之前检查 Content-Type 和 Content-Length，不符合时抛出 ResponseRejected"""
+    media_type = _media_type(resp)
+    reason = None
+    if not accept(media_type):
+        reason = f"非网页响应: {media_type}"
+    elif max_bytes:
+        length = resp.headers.get("content-length", "")
+        if length.isdigit() and int(length) > max_bytes:
+            reason = f"响应体过大: {length} 字节（上限 {max_bytes}）"
+    if reason is not None:
+        if stats is not None:
+            stats.rejected_responses += 1
+        raise ResponseRejected(reason)
+
+
+async def _read_body(resp: httpx.Response, max_bytes: int, held: _BudgetHold) -> tuple[bytes, bool]:
+    """分块读取响应体，超过 max_bytes（> 0 时）后停止读取，返回 (响应体, 是否截断)"""
+    chunks: list[bytes] = []
+    async for chunk in resp.aiter_bytes():
+        if max_bytes > 0 and held.received + len(chunk) > max_bytes:
+            chunk = chunk[:max_bytes - held.received]
+            chunks.append(chunk)
+            held.add(len(chunk))
+            return b"".join(chunks), True
+        chunks.append(chunk)
+        held.add(len(chunk))
+    return b"".join(chunks), False
+
+
+async def _fetch_page_bytes(
+    client: httpx.AsyncClient,
+    url: str,
+    retries: int = 3,
+    stats: Optional[CrawlStats] = None,
+    timeout: float = 20.0,
+    bypass_breaker: bool = False,
+) -> tuple[bytes, Optional[str]]:
+    """带 SSRF 防护、条件请求缓存、主机熔断和指数退避重试的 HTTP 请求，返回 (响应原始字节, 编码)
+
+    请求前异步校验 URL（DNS 结果有缓存）；crawl_sources 创建的 client 使用 SSRFSafeTransport，
+    实际连接只会发往校验通过的 IP，重定向目标同样会被校验。
+
+    每次请求都通过 crawl_scheduler 获取全局 / 主机名额，重试退避期间不占用名额。
+
+    磁盘上有该 URL 的缓存时附带 If-None-Match / If-Modified-Since，
+    服务器返回 304 则直接使用缓存的响应体（见 http_cache）。
+
+    响应体分块读取，受两项内存限制：
+    - 单个响应最多读取 settings.crawl_max_response_bytes 字节，超出部分截断（截断的响应不写入缓存）；
+      Content-Length 已声明超限或 Content-Type 不是网页时，不下载响应体直接抛出 ResponseRejected
+    - 所有请求共享 download_budget，下载中的响应体总量超出预算时新请求排队等待
 
-    网络超时或服务器 5xx 错误时自动重试（最多 retries 次），
-    重试间隔：1s → 2s → 4s（指数退避）。
-    4xx 客户端错误不重试，直接抛出。
+    重试和熔断规则见 _with_retries。
     """
-    validate_url(url)
+    await validate_url_async(url)
+    cached = await http_cache.load(url)
+    headers = cached.conditional_headers() if cached else None
+    max_bytes = settings.crawl_max_response_bytes
+
+    async def attempt() -> tuple[bytes, Optional[str]]:
+        async with crawl_scheduler.slot(url, stats), download_budget.hold(stats) as held:
+            async with client.stream("GET", url, headers=headers, timeout=timeout, follow_redirects=True) as resp:
+                if resp.status_code == 304 and cached is not None:
+                    if stats is not None:
+                        stats.bytes_from_cache += len(cached.content)
+                    await http_cache.touch(url)
+                    return cached.content, cached.encoding
+                resp.raise_for_status()
+                _check_response(resp, _is_text_type, max_bytes, stats)
+                content, truncated = await _read_body(resp, max_bytes, held)
+
+        if stats is not None:
+            stats.bytes_downloaded += len(content)
+        if truncated:
+            if stats is not None:
+                stats.truncated_responses += 1
+            logger.info("响应体超过 %d 字节，已截断: %s", max_bytes, url)
+        else:
+            await http_cache.store(
+                url, content, resp.encoding,
+                resp.headers.get("etag"), resp.headers.get("last-modified"),
+            )
+        return content, resp.encoding
+
+    return await _with_retries(url, attempt, retries, bypass_breaker)
+
+
+async def _with_retries(
+    url: str, attempt: Callable[[], Awaitable[T]], retries: int = 3, bypass_breaker: bool = False,
+) -> T:
+    """
+    执行一次请求 attempt()，网络超时或服务器 5xx 错误时自动重试（最多 retries 次），
+    重试间隔：1s → 2s → 4s（指数退避）。4xx 客户端错误不重试，直接抛出。
+
+    请求前检查 URL 所在主机的熔断器（见 circuit_breaker）：已熔断时直接抛出 CircuitOpen，
+    半开探测时只请求一次不重试。重试用尽后仍超时 / 网络错误 / 5xx 计为主机失败，其余结果（含 4xx）计为成功。
+    bypass_breaker=True（健康检查）时不受熔断限制，但结果仍计入熔断器。
+    """
+    key = host_key(url)
+    if not bypass_breaker:
+        breaker.check(key)
+        if breaker.is_probe(key):
+            retries = 1
+    try:
+        result = await _retry(url, attempt, retries)
+    except (httpx.TimeoutException, httpx.NetworkError) as e:
+        breaker.record_failure(key, f"{type(e).__name__}: {e}")
+        raise
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code >= 500:
+            breaker.record_failure(key, f"HTTP {e.response.status_code}")
+        else:
+            breaker.record_success(key)
+        raise
+    except ResponseRejected:
+        breaker.record_success(key)
+        raise
+    breaker.record_success(key)
+    return result
+
+
+async def _retry(url: str, attempt: Callable[[], Awaitable[T]], retries: int) -> T:
     last_exc: Exception = RuntimeError("未知错误")
-    for attempt in range(retries):
+    for i in range(retries):
         try:
-            resp = await client.get(url, timeout=20.0, follow_redirects=True)
-            resp.raise_for_status()
-            if resp.encoding and resp.encoding.upper() not in ("UTF-8", "UTF8"):
-                return resp.content.decode(resp.encoding, errors="replace")
-            return resp.text
+            return await attempt()
         except (httpx.TimeoutException, httpx.NetworkError) as e:
             last_exc = e
-            if attempt < retries - 1:
-                wait = 2 ** attempt
-                logger.warning("请求超时/网络错误（第%d次），%ds后重试: %s - %s", attempt + 1, wait, url, e)
+            if i < retries - 1:
+                wait = 2 ** i
+                logger.warning("请求超时/网络错误（第%d次），%ds后重试: %s - %s", i + 1, wait, url, e)
                 await asyncio.sleep(wait)
         except httpx.HTTPStatusError as e:
-            if e.response.status_code >= 500 and attempt < retries - 1:
+            if e.response.status_code >= 500 and i < retries - 1:
                 last_exc = e
-                wait = 2 ** attempt
-                logger.warning("服务器错误 %d（第%d次），%ds后重试: %s", e.response.status_code, attempt + 1, wait, url)
+                wait = 2 ** i
+                logger.warning("服务器错误 %d（第%d次），%ds后重试: %s", e.response.status_code, i + 1, wait, url)
                 await asyncio.sleep(wait)
             else:
                 raise
     raise last_exc
 
 
-def _extract_summary(html: str, max_chars: int = 140) -> str:
+async def _stream_article_document(
+    client: httpx.AsyncClient,
+    url: str,
+    max_chars: int = 140,
+    stats: Optional[CrawlStats] = None,
+    retries: int = 3,
+    timeout: float = 20.0,
+) -> ArticleDocument:
     """
-    从文章详情页 HTML 提取摘要（前 140 字正文）。
+    流式请求文章详情页，边下载边解析，只收集降级摘要所需的段落（见 SummaryStream）。
+
+    - 响应头 Content-Type 不是 HTML 时，在下载响应体前抛出 ResponseRejected
+    - 合格段落达到 max_chars 或已读取 settings.summary_stream_max_bytes 字节时停止下载并关闭连接
+    - 响应体不完整，不写入 HTTP 缓存
 
-    策略：
-    1. 优先从 article/main/.content 等容器中查找段落
-    2. 过滤导航、版权声明等无关内容
-    3. 拼接段落文本直到达到字数限制
-    4. 返回截断后的文本（不超过 max_chars 字符）
+    SSRF 校验、并发名额、下载字节预算、重试和熔断规则与 _fetch_page_bytes 相同。
     """
-    try:
-        soup = BeautifulSoup(html, "html.parser")
-
-        # 优先查找主内容区域（在删除标签之前查找）
-        content_area = None
-        for selector in ["article", "main", ".content", ".article-content", "#content", ".post-content"]:
-            content_area = soup.select_one(selector)
-            if content_area:
-                break
-
-        # 如果找不到主内容区，就从整个 body 中提取
-        if not content_area:
-            content_area = soup.find("body") or soup
-
-        # 移除无关标签（在选定区域内删除）
-        for tag in content_area(["script", "style", "nav", "footer", "aside"]):
-            tag.decompose()
-
-        # 提取所有段落文本（递归查找）
-        paragraphs = content_area.find_all("p", recursive=True)
-        text_parts: list[str] = []
-        total_len = 0
-
-        for p in paragraphs:
-            p_text = p.get_text(strip=True)
-            # 过滤过短、纯符号、导航/版权声明等无关段落
-            if len(p_text) < 10:
-                continue
-            # 扩展过滤关键词：导航、版权、功能链接等
-            skip_keywords = [
-                "版权所有", "转载请注明", "相关阅读", "点击进入",
-                "网站地图", "关于我们", "English", "联系我们",
-                "免责声明", "隐私政策", "订阅", "分享到",
-            ]
-            if any(keyword in p_text for keyword in skip_keywords):
-                continue
-            # 过滤纯链接文本（连续多个 | 分隔符）
-            if p_text.count("|") >= 3:
-                continue
-
-            text_parts.append(p_text)
-            total_len += len(p_text)
-            if total_len >= max_chars:
-                break
-
-        summary = "".join(text_parts)
-        if len(summary) > max_chars:
-            summary = summary[:max_chars] + "..."
-
-        return summary
-    except Exception as e:
-        logger.debug("摘要提取失败: %s", e)
-        return ""
+    await validate_url_async(url)
+    max_bytes = settings.summary_stream_max_bytes
+
+    async def attempt() -> ArticleDocument:
+        parser = SummaryStream(max_chars)
+        async with crawl_scheduler.slot(url, stats), download_budget.hold(stats) as held:
+            async with client.stream("GET", url, timeout=timeout, follow_redirects=True) as resp:
+                resp.raise_for_status()
+                _check_response(resp, _is_html_type, stats=stats)
+
+                decoder = codecs.getincrementaldecoder(resp.encoding or "utf-8")(errors="replace")
+                async for chunk in resp.aiter_bytes():
+                    held.add(len(chunk))
+                    parser.feed(decoder.decode(chunk))
+                    if parser.done or held.received >= max_bytes:
+                        break
+                else:
+                    parser.feed(decoder.decode(b"", final=True))
+        if stats is not None:
+            stats.bytes_downloaded += held.received
+            if parser.done:
+                stats.streams_stopped_early += 1
+        return parser.document()
+
+    return await _with_retries(url, attempt, retries)
+
+
+async def _use_summary_stream(url: str) -> bool:
+    """
+    只需要降级摘要时（未配置 DASHSCOPE_API_KEY）流式读取详情页。
+
+    AI 摘要需要完整正文，不适用；已有 HTTP 缓存的页面走条件请求（304 时无需下载）。
+    """
+    if settings.dashscope_api_key or settings.summary_stream_max_bytes <= 0:
+        return False
+    return not await http_cache.contains(url)
 
 
 async def _fetch_article_summary(
     client: httpx.AsyncClient,
     url: str,
-    semaphore: asyncio.Semaphore,
     max_chars: int = 140,
     source_language: str = "zh",
-    original_title: str = ""
+    original_title: str = "",
+    stats: Optional[CrawlStats] = None,
+    deadline: Optional[float] = None,
 ) -> tuple[str, str]:
     """
     请求文章详情页并提取摘要。
 
-    优先使用 AI 生成高质量摘要（需配置 DASHSCOPE_API_KEY），
-    失败时降级为简单文本提取。
+    页面只解析一次（见 article_extractor），AI 摘要和降级摘要共用解析结果：
+    优先使用 AI 生成高质量摘要（需配置 DASHSCOPE_API_KEY），失败时降级为简单文本提取。
+    未配置 AI 时只需要降级摘要，改为流式读取（见 _stream_article_document）。
 
-    使用 Semaphore 限制并发数，避免同时发起过多请求。
-    失败时返回 (original_title, "")，不阻塞主流程。
+    请求并发由 crawl_scheduler 统一控制，AI 调用并发由 ai_summary 全局限制。
+    失败时返回 (original_title, "")，不阻塞主流程；传入 stats 时失败原因记入 stats.failed_articles。
 
     Args:
         source_language: 源语言（zh=中文, en=英文）
         original_title: 原始标题（英文源时用于翻译）
+        deadline: 事件循环时间（loop.time()），到达时不再等待 AI 摘要，直接降级为简单提取
+            （URL 记入 stats.degraded_articles）
 
     Returns:
         (标题, 摘要) 元组。中文源返回 (original_title, 摘要)，英文源返回 (中文标题, 中文摘要)
     """
-    async with semaphore:
-        try:
-            html = await _fetch_page(client, url)
+    try:
+        if await _use_summary_stream(url):
+            doc = await _stream_article_document(client, url, max_chars, stats=stats)
+            title, summary = original_title, doc.summary(max_chars)
+        else:
+            content, encoding = await _fetch_page_bytes(client, url, stats=stats)
+            doc = await get_document(content, encoding)
 
-            # 优先尝试 AI 摘要生成
+            # 优先尝试 AI 摘要生成；到达 deadline 时放弃等待
             from backend.services.ai_summary import generate_summary_with_ai
-            title, summary = await generate_summary_with_ai(
-                html, max_chars, source_language, original_title
-            )
+            ai = generate_summary_with_ai(doc, max_chars, source_language, original_title)
+            if deadline is None:
+                title, summary = await ai
+            else:
+                try:
+                    title, summary = await asyncio.wait_for(ai, max(0.0, deadline - _loop_time()))
+                except asyncio.TimeoutError:
+                    title, summary = original_title, ""
+                    if stats is not None:
+                        stats.ai_cut_off += 1
+                        stats.degraded_articles.add(url)
 
             # AI 失败时降级为简单提取
             if not summary:
-                summary = _extract_summary(html, max_chars)
+                summary = doc.summary(max_chars)
+    except Exception as e:
+        logger.debug("获取摘要失败 [%s]: %s", url, e)
+        if stats is not None:
+            stats.failed_articles[url] = _failure_reason(e)
+        return (original_title, "")
+
+    if not summary and stats is not None:
+        stats.failed_articles[url] = "empty"
+    return (title, summary)
+
+
+def _failure_reason(exc: Exception) -> str:
+    """详情页抓取失败的原因分类（负缓存按原因设置有效期，见 negative_cache）"""
+    if isinstance(exc, CircuitOpen):
+        return "circuit_open"
+    if isinstance(exc, ResponseRejected):
+        return "rejected"
+    if isinstance(exc, httpx.TimeoutException):
+        return "timeout"
+    if isinstance(exc, httpx.HTTPStatusError):
+        code = exc.response.status_code
+        if 400 <= code < 500 and code not in (408, 429):
+            return "http_4xx"
+        return "server_error"
+    return "error"
+
+
+@dataclass
+class _Candidate:
+    """列表页候选文章（尚未抓取详情页）"""
+    source: dict
+    title: str
+    url: str
+    position: int  # 在列表页中的顺序，粗排同分时靠前者优先
+
+
+@dataclass
+class _ListFingerprint:
+    """列表页指纹：规范化后的页面内容哈希 + 提取到的链接集合（URL 哈希）"""
+    content_hash: str
+    link_hashes: set[str]
+
+
+# 规范化列表页时去掉脚本、样式和注释（常含时间戳、随机 token），并压缩空白
+# 直接处理响应原始字节，无需先解码
+_VOLATILE_RE = re.compile(rb"<(script|style)\b.*?</\1\s*>|<!--.*?-->", re.S | re.I)
+_WHITESPACE_RE = re.compile(rb"\s+")
+
+
+def _content_hash(content: bytes, selector: str) -> str:
+    normalized = _WHITESPACE_RE.sub(b" ", _VOLATILE_RE.sub(b"", content))
+    return hashlib.sha256(selector.encode("utf-8") + b"\x00" + normalized).hexdigest()
+
+
+def _link_hash(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+
+
+def _defer_links(fingerprints: dict[int, _ListFingerprint], candidates: list[_Candidate]) -> None:
+    """
+    从本次指纹中去掉未处理完的候选链接（被剪枝、跳过近期失败、抓取失败或到期被取消的），下次采集仍视为新链接。
+    有链接被去掉的源清空页面哈希，下次即使列表页未变化也会重新提取链接。
+    """
+    for c in candidates:
+        fp = fingerprints.get(c.source.get("id"))
+        if fp is not None:
+            fp.link_hashes.discard(_link_hash(c.url))
+            fp.content_hash = ""
+
 
-            return (title, summary)
-        except Exception as e:
-            logger.debug("获取摘要失败 [%s]: %s", url, e)
-            return (original_title, "")
+async def _load_fingerprints(db: AsyncSession, source_ids: list[int]) -> dict[int, _ListFingerprint]:
+    """一次查询读取多个源上次的列表页指纹"""
+    if not source_ids:
+        return {}
+    result = await db.execute(select(SourceSnapshot).where(SourceSnapshot.source_id.in_(source_ids)))
+    return {
+        snap.source_id: _ListFingerprint(snap.content_hash, set(json.loads(snap.link_hashes or "[]")))
+        for snap in result.scalars()
+    }
 
 
-async def _crawl_one_source(
+async def _save_fingerprints(db: AsyncSession, fingerprints: dict[int, _ListFingerprint]) -> None:
+    """写入本次的列表页指纹（不提交，随调用方的 commit 一起生效）"""
+    for source_id, fp in fingerprints.items():
+        await db.merge(SourceSnapshot(
+            source_id=source_id,
+            content_hash=fp.content_hash,
+            link_hashes=json.dumps(sorted(fp.link_hashes)),
+        ))
+
+
+# 各行业共享的列表页响应：规范化 URL → (响应原始字节, 编码)
+# 多个行业配置了同一个列表页、且在同一时段采集时只下载一次（见 run_morning_slot）
+_list_page_cache: AsyncTTLCache[str, tuple[bytes, Optional[str]]] = AsyncTTLCache(
+    ttl=settings.crawl_list_share_ttl, maxsize=256,
+)
+
+
+# 到达 deadline 后，留给正在降级为简单提取的任务完成的时间（秒）
+_DEADLINE_GRACE = 1.0
+
+
+class CrawlDeadlineExceeded(Exception):
+    """采集时长用尽，任务被取消"""
+
+
+def _loop_time() -> float:
+    return asyncio.get_running_loop().time()
+
+
+async def _gather_until(tasks: list[asyncio.Task], deadline: Optional[float] = None) -> list:
+    """
+    等待全部任务完成，或到达 deadline（事件循环时间）为止。
+
+    按任务顺序返回结果：完成的为返回值或异常，到期未完成的任务被取消，结果为 CrawlDeadlineExceeded。
+    """
+    if not tasks:
+        return []
+    timeout = None if deadline is None else max(0.0, deadline - _loop_time())
+    _, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+    return [
+        CrawlDeadlineExceeded() if task in pending or task.cancelled()
+        else task.exception() or task.result()
+        for task in tasks
+    ]
+
+
+async def _load_shared(
+    cache: AsyncTTLCache[str, T],
+    key: str,
+    loader: Callable[[], Awaitable[T]],
+) -> tuple[T, bool]:
+    """经 cache 合并同一 key 的请求，返回 (结果, 是否复用了其他调用方的结果)"""
+    loaded = False
+
+    async def load() -> T:
+        nonlocal loaded
+        loaded = True
+        return await loader()
+
+    value, _ = await cache.get_or_load(key, load)
+    return value, not loaded
+
+
+async def _fetch_list_page(
+    client: httpx.AsyncClient,
+    url: str,
+    stats: Optional[CrawlStats] = None,
+    retries: int = 3,
+) -> tuple[bytes, Optional[str]]:
+    """请求列表页；同一时段内其他行业已下载（或正在下载）的同一列表页直接复用"""
+    if settings.crawl_list_share_ttl <= 0:
+        return await _fetch_page_bytes(client, url, retries=retries, stats=stats)
+    page, shared = await _load_shared(
+        _list_page_cache, canonicalize(url), lambda: _fetch_page_bytes(client, url, retries=retries, stats=stats),
+    )
+    if shared and stats is not None:
+        stats.shared_list_pages += 1
+    return page
+
+
+async def _fetch_source_page(
     client: httpx.AsyncClient,
-    db: AsyncSession,
     source: dict,
-) -> list[NewsItem]:
+    stats: Optional[CrawlStats] = None,
+) -> tuple[bytes, Optional[str]]:
+    """
+    经新闻源熔断器请求列表页：已熔断时直接抛出 CircuitOpen，半开探测时不重试。
+
+    请求失败（含 4xx，列表页失效即源失效）计入该源的熔断器，成功则恢复。
+    """
+    if source.get("id") is None:
+        return await _fetch_list_page(client, source["url"], stats)
+    key = source_key(source["id"])
+    breaker.check(key)
+    try:
+        page = await _fetch_list_page(client, source["url"], stats, retries=1 if breaker.is_probe(key) else 3)
+    except CircuitOpen:
+        raise
+    except Exception as e:
+        breaker.record_failure(key, str(e) or type(e).__name__)
+        raise
+    breaker.record_success(key)
+    return page
+
+
+async def _collect_candidates(
+    client: httpx.AsyncClient,
+    source: dict,
+    stats: Optional[CrawlStats] = None,
+    previous: Optional[_ListFingerprint] = None,
+    fingerprints: Optional[dict[int, _ListFingerprint]] = None,
+) -> list[_Candidate]:
     """
-    爬取单个新闻网站，返回本次新增（之前未见过）的文章列表。
+    第一阶段：只请求列表页，返回候选链接（不抓取详情页，不访问数据库）。
 
-    流程：
     1. 请求新闻列表页
-    2. 用 CSS 选择器提取候选链接
-    3. 批量查询 SeenArticle 表，过滤掉已推送过的 URL
-    4. 并发请求新文章详情页，提取摘要
-    5. 返回新文章（含摘要）；SeenArticle 写入由调用方在推送成功后完成
+    2. 有 previous 时页面与其相同则直接返回空列表；传入 fingerprints 时本次指纹写入 fingerprints[source["id"]]
+    3. 用 CSS 选择器提取候选链接，有 previous 时只保留新出现的链接
+
+    多个源并发采集时共用同一个 AsyncSession 并不安全，已推送文章的过滤统一由 _filter_seen 一次查询完成。
     """
     url = source["url"]
     name = source["name"]
-    weight = source["weight"]
-    keywords = source.get("keywords")
     selector = source.get("link_selector") or "a"
-    language = source.get("language", "zh")
 
-    html = await _fetch_page(client, url)
-    candidate_links = _extract_links(html, url, selector)
+    content, encoding = await _fetch_source_page(client, source, stats)
+
+    detect_changes = fingerprints is not None and source.get("id") is not None
+    if detect_changes or previous is not None:
+        content_hash = _content_hash(content, selector)
+        if previous is not None and previous.content_hash == content_hash:
+            if stats is not None:
+                stats.unchanged_sources += 1
+            logger.info("源 [%s]：列表页未变化，跳过", name)
+            return []
+
+    candidate_links = await run_parse(_extract_links, content, url, selector, encoding, size=len(content))
+    extracted = len(candidate_links)
+    if stats is not None:
+        stats.extracted += extracted
+
+    if detect_changes:
+        link_hashes = {_link_hash(u) for _, u in candidate_links}
+        fingerprints[source["id"]] = _ListFingerprint(content_hash, link_hashes)
+    if previous is not None:
+        candidate_links = [
+            (title, u) for title, u in candidate_links if _link_hash(u) not in previous.link_hashes
+        ]
 
     if not candidate_links:
-        logger.info("源 [%s] 未提取到任何链接（selector=%s）", name, selector)
+        logger.info("源 [%s] 未提取到新链接（共 %d 个，selector=%s）", name, extracted, selector)
         return []
 
-    # 批量查询哪些 URL 已见过
-    candidate_urls = [u for _, u in candidate_links]
-    existing_result = await db.execute(
-        select(SeenArticle.url).where(SeenArticle.url.in_(candidate_urls))
+    logger.info("源 [%s]：列表页提取 %d 个链接，新出现 %d 个", name, extracted, len(candidate_links))
+    return [
+        _Candidate(source=source, title=title, url=article_url, position=i)
+        for i, (title, article_url) in enumerate(candidate_links)
+    ]
+
+
+# 单条 IN 查询最多携带的 URL 数（SQLite 默认变量上限为 999 / 32766，取保守值）
+_SEEN_QUERY_CHUNK = 500
+
+
+async def _filter_seen(
+    db: AsyncSession,
+    candidates: list[_Candidate],
+    stats: Optional[CrawlStats] = None,
+) -> list[_Candidate]:
+    """
+    过滤掉已推送过的候选。
+
+    先经进程内索引判定（见 seen_index），只有无法确定的 URL 才按 URL 哈希查询 SeenArticle 表
+    （所有源合并查询，按 _SEEN_QUERY_CHUNK 分批）。
+    """
+    urls = list(dict.fromkeys(c.url for c in candidates))
+    seen_urls, to_check = await seen_index.classify(urls)
+    by_hash = {url_hash(u): u for u in to_check}
+    hashes = list(by_hash)
+    found: set[str] = set()
+    for i in range(0, len(hashes), _SEEN_QUERY_CHUNK):
+        result = await db.execute(
+            select(SeenArticle.url_hash).where(SeenArticle.url_hash.in_(hashes[i:i + _SEEN_QUERY_CHUNK]))
+        )
+        found.update(by_hash[row[0]] for row in result)
+    seen_index.record_db_result(to_check, found)
+    seen_urls |= found
+
+    unseen = [c for c in candidates if c.url not in seen_urls]
+    if stats is not None:
+        stats.unseen += len(unseen)
+    if candidates:
+        logger.info("已推送过滤：候选 %d 个，其中 %d 个未推送", len(candidates), len(unseen))
+    return unseen
+
+
+def _dedupe_candidates(
+    candidates: list[_Candidate],
+    stats: Optional[CrawlStats] = None,
+) -> list[_Candidate]:
+    """
+    合并指向同一篇文章的候选（按 dedup_key 判断，忽略跟踪参数和 http / https 差异）。
+
+    多个源转载同一篇文章时只保留权重最高的源，同权重时保留列表页中位置靠前的；
+    其余候选的顺序不变。
+    """
+    best: dict[str, _Candidate] = {}
+    for c in candidates:
+        key = dedup_key(c.url)
+        kept = best.get(key)
+        if kept is None or (c.source["weight"], -c.position) > (kept.source["weight"], -kept.position):
+            best[key] = c
+    if len(best) == len(candidates):
+        return candidates
+
+    winners = {id(c) for c in best.values()}
+    deduped = [c for c in candidates if id(c) in winners]
+    if stats is not None:
+        stats.duplicate_candidates += len(candidates) - len(deduped)
+    logger.info("跨源去重：候选 %d 个，合并后 %d 个", len(candidates), len(deduped))
+    return deduped
+
+
+async def _skip_failed(
+    db: AsyncSession,
+    candidates: list[_Candidate],
+    stats: Optional[CrawlStats] = None,
+) -> list[_Candidate]:
+    """跳过近期详情页抓取失败、仍在负缓存有效期内的候选（见 negative_cache）"""
+    failed = await negative_cache.load_failed(db, [c.url for c in candidates])
+    if not failed:
+        return candidates
+    if stats is not None:
+        stats.negative_skipped += len(failed)
+    logger.info("跳过近期抓取失败的文章 %d 篇：%s", len(failed), "，".join(
+        f"{reason} {n}" for reason, n in Counter(failed.values()).most_common()
+    ))
+    return [c for c in candidates if c.url not in failed]
+
+
+def _prune_candidates(
+    candidates: list[_Candidate],
+    budget: Optional[int] = None,
+    industry_keywords: Optional[str] = None,
+    stats: Optional[CrawlStats] = None,
+) -> list[_Candidate]:
+    """
+    第二阶段：只用列表页信息（标题、来源权重、关键词）粗排，保留至多 budget 条进入详情页抓取。
+
+    - 必然会被 score_and_rank 过滤的候选（+/! 关键词规则）直接剪掉（英文源标题未翻译，不按关键词剪枝）
+    - 同分时按列表页顺序交错选取，避免某个源独占预算
+    - budget 为 None 时不限制数量
+    """
+    from backend.services.news_ranking import prescore_title
+
+    scored: list[tuple[float, int, _Candidate]] = []
+    for c in candidates:
+        score = prescore_title(
+            c.title, c.source["weight"], c.source.get("keywords"), industry_keywords,
+            c.source.get("language", "zh"),
+        )
+        if score is not None:
+            scored.append((score, c.position, c))
+
+    scored.sort(key=lambda x: (-x[0], x[1]))
+    kept = [c for _, _, c in scored]
+    if budget is not None:
+        kept = kept[:budget]
+
+    if stats is not None:
+        stats.keyword_passed += len(scored)
+        stats.budget = budget
+    return kept
+
+
+# 各行业共享的详情页抓取结果：dedup_key + 源语言 → (标题, 摘要, 是否为采集时长用尽后的降级摘要)
+# 同一时段多个行业的源转载同一篇文章时，详情页只请求一次，正在进行的抓取也会被合并
+_article_cache: AsyncTTLCache[str, tuple[str, str, bool]] = AsyncTTLCache(
+    ttl=settings.crawl_article_share_ttl, maxsize=4096,
+)
+
+
+async def _shared_article_summary(
+    client: httpx.AsyncClient,
+    candidate: _Candidate,
+    stats: Optional[CrawlStats] = None,
+    deadline: Optional[float] = None,
+) -> tuple[str, str]:
+    """
+    经 _article_cache 获取候选的 (标题, 摘要)。
+
+    摘要为空（请求或提取失败）的结果不保留，下次重新抓取；中文源的标题始终使用候选自己的列表页标题。
+    因采集时长用尽而放弃 AI 的降级摘要也不保留，复用到这种结果的调用方按自己的 deadline 重新抓取。
+    """
+    stats = stats if stats is not None else CrawlStats()
+    language = candidate.source.get("language", "zh")
+
+    def fetch() -> Awaitable[tuple[str, str]]:
+        return _fetch_article_summary(
+            client, candidate.url, source_language=language, original_title=candidate.title,
+            stats=stats, deadline=deadline,
+        )
+
+    if settings.crawl_article_share_ttl <= 0:
+        return await fetch()
+
+    async def load() -> tuple[str, str, bool]:
+        title, summary = await fetch()
+        return title, summary, candidate.url in stats.degraded_articles
+
+    key = f"{dedup_key(candidate.url)}\x00{language}"
+    (title, summary, degraded), shared = await _load_shared(_article_cache, key, load)
+    if not summary or degraded:
+        _article_cache.invalidate(key)
+    if shared and degraded:
+        title, summary = await fetch()
+    elif shared:
+        stats.shared_articles += 1
+    return (candidate.title if language == "zh" else title, summary)
+
+
+async def _fetch_candidates(
+    client: httpx.AsyncClient,
+    candidates: list[_Candidate],
+    stats: Optional[CrawlStats] = None,
+    deadline: Optional[float] = None,
+) -> list[NewsItem]:
+    """
+    第三阶段：并发请求候选文章详情页提取摘要，构建 NewsItem。
+
+    其他行业近期已抓取（或正在抓取）的同一篇文章直接复用结果（见 _article_cache）。
+    传入 deadline（事件循环时间）时：到达 deadline 仍在等待 AI 的文章降级为简单提取，
+    此后仍未完成的请求被取消，这些文章摘要为空，来源计入 stats.cut_off_sources。
+    SeenArticle 写入由调用方在推送成功后完成。
+    """
+    # 并发数由 crawl_scheduler 按全局 / 按主机限制，避免触发反爬
+    tasks = [asyncio.create_task(_shared_article_summary(client, c, stats, deadline)) for c in candidates]
+    results = await _gather_until(tasks, None if deadline is None else deadline + _DEADLINE_GRACE)
+
+    if stats is not None:
+        stats.detail_fetched += len(candidates)
+
+    now = datetime.now(timezone.utc)
+    items: list[NewsItem] = []
+    for c, result in zip(candidates, results):
+        if isinstance(result, BaseException):
+            if stats is not None:
+                stats.cut_off_articles += 1
+                stats.cut_off_sources.add(c.source["name"])
+            result = (c.title, "")
+        final_title, summary = result
+        items.append(_make_item(c, final_title, summary, now))  # 英文源时 final_title 为翻译后的中文标题
+    return items
+
+
+def _make_item(c: _Candidate, title: str, summary: str, now: datetime) -> NewsItem:
+    return NewsItem(
+        title=title,
+        url=c.url,
+        published_at=now,
+        source_name=c.source["name"],
+        source_weight=c.source["weight"],
+        keywords=c.source.get("keywords"),
+        summary=summary,
+        source_id=c.source.get("id"),
     )
-    seen_urls = {row[0] for row in existing_result}
 
-    # 筛选出新文章
-    new_articles: list[tuple[str, str]] = [
-        (title, article_url)
-        for title, article_url in candidate_links
-        if article_url not in seen_urls
-    ]
 
-    if not new_articles:
+async def _staged_candidates(
+    db: AsyncSession,
+    sources: list[dict],
+    since: Optional[datetime],
+    limit: Optional[int] = None,
+    stats: Optional[CrawlStats] = None,
+) -> list[_Candidate]:
+    """列表页本次未能采集的源：用 since 之后（后台预采集等）已处理、暂存的文章作为候选，最多 limit 个"""
+    if since is None or not sources:
         return []
-
-    # 并发请求新文章详情页提取摘要（限制并发数为 5，避免触发反爬）
-    semaphore = asyncio.Semaphore(5)
-    summary_tasks = [
-        _fetch_article_summary(client, article_url, semaphore, source_language=language, original_title=title)
-        for title, article_url in new_articles
+    by_id = {s["id"]: s for s in sources}
+    staged = await candidate_store.load_staged(db, list(by_id), since, limit)
+    candidates = [
+        _Candidate(source=by_id[source_id], title=title, url=url, position=i)
+        for i, (source_id, url, title) in enumerate(staged)
     ]
-    results = await asyncio.gather(*summary_tasks)
+    if candidates:
+        if stats is not None:
+            stats.extracted += len(candidates)
+            stats.staged_fallback += len(candidates)
+        logger.info("%d 个源的列表页未能采集，从暂存文章中补充候选 %d 个", len(sources), len(candidates))
+    return candidates
+
 
-    # 构建 NewsItem（不再在此处写入 SeenArticle，由调用方在推送成功后写入）
+def _reuse_processed(
+    candidates: list[_Candidate],
+    stored: dict[str, StoredArticle],
+    stats: Optional[CrawlStats] = None,
+) -> tuple[list[NewsItem], list[_Candidate]]:
+    """
+    拆分候选：之前已抓取过详情页的直接用保存的摘要构建 NewsItem（中文源标题仍取列表页标题），
+    返回 (复用的 NewsItem, 仍需抓取详情页的候选)。
+    """
     now = datetime.now(timezone.utc)
-    new_items: list[NewsItem] = []
-
-    for (original_title, article_url), (final_title, summary) in zip(new_articles, results):
-        new_items.append(NewsItem(
-            title=final_title,  # 英文源时为翻译后的中文标题
-            url=article_url,
-            published_at=now,
-            source_name=name,
-            source_weight=weight,
-            keywords=keywords,
-            summary=summary,
-            source_id=source.get("id"),
-        ))
+    reused: list[NewsItem] = []
+    remaining: list[_Candidate] = []
+    for c in candidates:
+        language = c.source.get("language", "zh")
+        article = stored.get(c.url)
+        if article is None or article.language != language:
+            remaining.append(c)
+            continue
+        reused.append(_make_item(c, c.title if language == "zh" else article.title, article.summary, now))
+    if stats is not None:
+        stats.stored_reused += len(reused)
+    if reused:
+        logger.info("复用已处理文章 %d 篇，无需抓取详情页", len(reused))
+    return reused, remaining
 
-    logger.info(
-        "源 [%s]：发现 %d 篇新文章（共提取 %d 篇候选）",
-        name, len(new_items), len(candidate_links),
-    )
 
-    return new_items
+async def save_crawl_state(db: AsyncSession, stats: CrawlStats) -> None:
+    """把 crawl_sources 记录在 stats 中的列表页指纹、已处理文章、失败文章写入 db（不提交）"""
+    await candidate_store.save_processed(db, stats.processed)
+    await negative_cache.save_failed(db, stats.failed_articles)
+    await _save_fingerprints(db, stats.fingerprints)
 
 
-async def crawl_sources(sources: list[dict], db: AsyncSession) -> list[NewsItem]:
+async def crawl_sources(
+    sources: list[dict],
+    db: AsyncSession,
+    industry_keywords: Optional[str] = None,
+    candidate_budget: Optional[int] = None,
+    detect_changes: bool = True,
+    time_budget: Optional[float] = None,
+    stats: Optional[CrawlStats] = None,
+    save_state: bool = True,
+    staged_since: Optional[datetime] = None,
+    record_fingerprints: bool = True,
+) -> list[NewsItem]:
     """
-    并发爬取多个新闻网站，汇总返回今日新增文章。
+    两阶段爬取多个新闻网站，汇总返回今日新增文章。
+
+    1. 并发请求所有源的列表页，收集候选链接
+       （列表页与上次相同的源直接跳过；页面变化时只取新出现的链接；
+        请求失败、熔断或超时的源改用 candidate_store 中 staged_since 之后暂存的文章）
+    2. 一次查询 SeenArticle 表过滤已推送的候选，合并多个源指向同一篇文章的候选
+    3. 之前已抓取过详情页（未推送）的候选直接复用保存的摘要（见 candidate_store），
+       近期抓取失败的候选直接跳过（见 negative_cache）
+    4. 其余候选仅用列表页信息粗排，整个行业只保留 candidate_budget 条
+    5. 并发抓取保留候选的详情页并生成摘要（同一时段其他行业已抓取的文章直接复用），
+       结果写入 candidate_store，失败的写入 negative_cache
+    6. 列表页指纹不记录被剪枝、跳过近期失败、抓取失败或到期被取消的链接，下次采集仍作为新链接返回
+
+    db 只在并发采集开始前（读取指纹）、列表页阶段后（过滤已推送、读取已处理文章）和详情页阶段后
+    （写入已处理文章、失败文章、指纹）顺序使用，并发的采集任务不访问 session；
+    详情页和 AI 摘要阶段之前只有读操作，不持有写锁。
+
+    本次的列表页指纹、已处理文章、失败文章通过 db 写入 SourceSnapshot / CandidateArticle / FailedArticle，但不提交：调用方推送成功后 commit 才生效，
+    推送失败回滚时指纹保持不变，下次仍会返回这些链接。
 
     sources 列表中每条记录包含：
       id, url, name, weight, keywords, link_selector, language
-    db: 需要传入 AsyncSession，用于读写 SeenArticle 表
+      以及可选的 consecutive_failures, last_check_at, last_error（进程内没有熔断记录时据此恢复冷却期内的熔断状态）
+    db: 需要传入 AsyncSession，用于查询 SeenArticle 表、读写 SourceSnapshot
+    detect_changes: 是否启用列表页变化检测
+    industry_keywords: 行业关键词，用于列表页粗排
+    candidate_budget: 行业级候选预算（进入详情页抓取的最大文章数），None 表示不限
+    time_budget: 采集总时长上限（秒），None 或 0 表示不限。列表页阶段最多占用 settings.crawl_list_phase_share，
+        到期未完成的列表页请求被取消；详情页阶段到期时见 _fetch_candidates。已完成的结果照常返回，
+        未完成的源名称记入 stats.cut_off_sources
+    stats: 传入时统计写入该对象（调用方可读取 cut_off_sources 等），否则新建
+    save_state: 为 False 时不写入 session，指纹、已处理文章、失败文章留在 stats 中，
+        由调用方稍后调用 save_crawl_state（例如等待发送期间不持有写锁）
+    staged_since: 列表页未能采集的源，用该时间（naive UTC）之后暂存的文章补充候选（至多 candidate_budget 个）；
+        None 表示不补充
+    record_fingerprints: 为 False 时只用上次推送的指纹过滤（跳过未变化的列表页、只取新出现的链接），
+        不记录本次指纹（后台预采集，见 scheduler.precrawl_industry）
     """
-    all_items: list[NewsItem] = []
+    stats = stats if stats is not None else CrawlStats()
+    deadline = list_deadline = None
+    if time_budget:
+        start = _loop_time()
+        deadline = start + time_budget
+        list_deadline = start + time_budget * settings.crawl_list_phase_share
+    candidates: list[_Candidate] = []
+    for s in sources:
+        if s.get("id") is not None:
+            breaker.seed(source_key(s["id"]), s.get("consecutive_failures") or 0,
+                         s.get("last_check_at"), s.get("last_error") or "")
 
-    async with httpx.AsyncClient(headers=HEADERS, follow_redirects=True) as client:
-        tasks = [_crawl_one_source(client, db, s) for s in sources]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+    previous: dict[int, _ListFingerprint] = {}
+    fingerprints: Optional[dict[int, _ListFingerprint]] = None
+    if detect_changes:
+        previous = await _load_fingerprints(db, [s["id"] for s in sources if s.get("id") is not None])
+        fingerprints = {} if record_fingerprints else None
 
-    for source, result in zip(sources, results):
-        if isinstance(result, Exception):
-            logger.warning("爬取 [%s] 失败: %s", source["name"], result)
-        else:
-            all_items.extend(result)
+    async with httpx.AsyncClient(
+        headers=HEADERS, follow_redirects=True, transport=SSRFSafeTransport(),
+    ) as client:
+        tasks = [
+            asyncio.create_task(_collect_candidates(client, s, stats, previous.get(s.get("id")), fingerprints))
+            for s in sources
+        ]
+        results = await _gather_until(tasks, list_deadline)
+
+        missing: list[dict] = []  # 本次列表页未能采集的源，从已暂存的文章中补充候选
+        for source, result in zip(sources, results):
+            if isinstance(result, BaseException) and source.get("id") is not None:
+                missing.append(source)
+            if isinstance(result, CircuitOpen):
+                stats.breaker_skipped += 1
+                logger.warning("跳过 [%s]：%s", source["name"], result)
+            elif isinstance(result, CrawlDeadlineExceeded):
+                stats.cut_off_sources.add(source["name"])
+                logger.warning("采集 [%s] 超出时长上限，已取消", source["name"])
+            elif isinstance(result, Exception):
+                logger.warning("爬取 [%s] 失败: %s", source["name"], result)
+            else:
+                candidates.extend(result)
+        candidates.extend(await _staged_candidates(db, missing, staged_since, candidate_budget, stats))
+
+        candidates = _dedupe_candidates(await _filter_seen(db, candidates, stats), stats)
+        stored = await candidate_store.load_processed(db, [c.url for c in candidates])
+        all_items, fresh = _reuse_processed(candidates, stored, stats)
+        candidates = await _skip_failed(db, fresh, stats)
+        kept = _prune_candidates(candidates, candidate_budget, industry_keywords, stats)
+        fetched = await _fetch_candidates(client, kept, stats, deadline)
+        # 降级摘要不写入 candidate_store，下次采集仍会抓取详情页、生成 AI 摘要
+        stats.processed.extend(
+            (c.url, StoredArticle(item.title, item.summary, c.source.get("language", "zh")), c.source.get("id"))
+            for c, item in zip(kept, fetched) if c.url not in stats.degraded_articles
+        )
+        if fingerprints:
+            # 指纹只记录已处理（或已推送、跨源合并掉）的链接，未处理完的下次仍会返回
+            done = {c.url for c, item in zip(kept, fetched) if item.summary}
+            _defer_links(fingerprints, [c for c in fresh if c.url not in done])
+        stats.fingerprints.update(fingerprints or {})
+        # 详情页阶段结束后才写入：写入后 session 持有 SQLite 写锁，若提前写入，
+        # 并发的 AI 摘要缓存读写（summary_cache 独立 session）会一直等到超时
+        if save_state:
+            await save_crawl_state(db, stats)
+        all_items.extend(fetched)
 
+    stats.log()
+    seen_index.log_stats()
+    negative_cache.log_stats()
+    summary_cache.log_stats()
+    if tripped := breaker.snapshot():
+        logger.info("熔断中：%s", "，".join(f"{key} {state}" for key, state in sorted(tripped.items())))
     return all_items
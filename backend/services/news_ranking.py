@@ -97,6 +97,41 @@ def _industry_keyword_match(text: str, keyword_str: str) -> bool:
     return True
 
 
+def prescore_title(title: str, source_weight: int, source_keywords: str | None = None,
+                   industry_keywords: str | None = None, language: str = "zh") -> float | None:
+    """
+    列表页预打分：只用列表页可得的信息（标题、来源权重），在抓取详情页之前粗排。
+
+    综合评分 = 行业关键词命中(0.4) + 来源权重(0.3) + 关键词(0.3)
+    （列表页阶段所有候选的时效性相同，用行业关键词命中代替时效性分）
+
+    返回 None 表示可以确定会被 score_and_rank 过滤：
+    - 来源关键词 +词未命中 / !词命中（_keyword_score 本身只看标题）
+    - 行业关键词 !词命中标题（标题是标题+摘要的一部分）
+    行业 +词只看标题无法确定（可能在摘要中命中），因此只加分、不过滤。
+
+    英文源（language="en"）的列表页标题未经翻译，而 score_and_rank 匹配的是 AI 翻译后的中文标题，
+    关键词规则在这里无法判断：不过滤，只按来源权重打分（同分时按列表页顺序，即发布先后）。
+    """
+    if language == "en":
+        return 0.5 * 0.4 + _weight_score(source_weight) * 0.3 + 0.5 * 0.3
+
+    kw_score = _keyword_score(title, source_keywords)
+    if kw_score is None:
+        return None
+
+    industry_hit = 0.5
+    if industry_keywords:
+        title_lower = title.lower()
+        must_have, must_not, _ = _parse_keywords(industry_keywords)
+        if any(word in title_lower for word in must_not):
+            return None
+        if must_have:
+            industry_hit = 1.0 if any(word in title_lower for word in must_have) else 0.0
+
+    return industry_hit * 0.4 + _weight_score(source_weight) * 0.3 + kw_score * 0.3
+
+
 def score_and_rank(items: list[NewsItem], top_n: int = 10,
                    industry_keywords: str | None = None) -> list[NewsItem]:
     """
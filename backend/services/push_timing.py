@@ -0,0 +1,93 @@
+"""早报准点送达 - 按各行业历史耗时提前启动流水线
+
+定时任务若在 PushSchedule 配置的时刻才开始采集，邮件要等采集、排序、发送全部完成才到达。
+这里根据 PushLog 中最近几次定时早报记录的各阶段耗时（crawl_seconds / rank_seconds / send_seconds）估算：
+- 准备阶段（采集 + 去重排序）：取最近 settings.morning_lead_history_runs 次中的最大值，
+  乘以 settings.morning_lead_safety，且不超过行业的采集时长上限；没有历史记录时按采集时长上限估计
+- 发送阶段：取最近几次的最大值，邮件在「目标时刻 - 发送耗时」交给 SMTP
+
+plan_start_times() 为同一时刻的多个行业安排启动时间：耗时长的先启动，
+相邻两个行业的启动时间至少间隔 settings.morning_stagger_seconds 秒（只会提前；早于触发时刻的推迟到触发时刻，仍保持间隔），
+避免多个行业的采集和 AI 摘要同时开始。错开启动后，共同的列表页和文章仍经 news_crawler 的共享缓存复用。
+提前量不超过 settings.morning_max_lead_minutes 分钟（定时任务在目标时刻前这么久触发）。
+"""
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.config import settings
+from backend.models.push_log import PushLog
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LeadEstimate:
+    prepare_seconds: float  # 采集 + 去重排序，需在发送前完成
+    send_seconds: float     # 发送邮件（SMTP）耗时
+
+
+async def estimate_lead(db: AsyncSession, industry_id: int, crawl_time_budget: float) -> LeadEstimate:
+    """按最近几次定时早报的各阶段耗时估算该行业需要的提前量"""
+    max_lead = settings.morning_max_lead_minutes * 60
+    result = await db.execute(
+        select(PushLog.crawl_seconds, PushLog.rank_seconds, PushLog.send_seconds)
+        .where(
+            PushLog.industry_id == industry_id,
+            PushLog.push_type == "morning",
+            PushLog.triggered_by == "scheduler",
+            PushLog.crawl_seconds.isnot(None),
+        )
+        .order_by(PushLog.created_at.desc(), PushLog.id.desc())
+        .limit(settings.morning_lead_history_runs)
+    )
+    rows = result.all()
+    if not rows:
+        prepare = crawl_time_budget if crawl_time_budget > 0 else max_lead
+        return LeadEstimate(prepare_seconds=min(prepare, max_lead), send_seconds=0.0)
+
+    crawl = max(row.crawl_seconds for row in rows)
+    if crawl_time_budget > 0:
+        crawl = min(crawl, crawl_time_budget)
+    rank = max(row.rank_seconds or 0.0 for row in rows)
+    send = max(row.send_seconds or 0.0 for row in rows)
+    prepare = (crawl + rank) * settings.morning_lead_safety
+    return LeadEstimate(prepare_seconds=min(prepare, max_lead), send_seconds=min(send, max_lead))
+
+
+def plan_start_times(
+    leads: dict[int, LeadEstimate],
+    target: datetime,
+    earliest: datetime,
+) -> dict[int, tuple[datetime, datetime]]:
+    """
+    返回 {industry_id: (启动时间, 发送时间)}。
+
+    启动时间 = 发送时间 - 准备耗时，再从最晚的开始依次检查，
+    与后一个行业的间隔不足 morning_stagger_seconds 时提前；
+    早于 earliest 的推迟到 earliest，多个行业都被推迟时从 earliest 起依次间隔 morning_stagger_seconds。
+    """
+    stagger = timedelta(seconds=settings.morning_stagger_seconds)
+    plan: dict[int, tuple[datetime, datetime]] = {}
+    for industry_id, lead in leads.items():
+        send_at = target - timedelta(seconds=lead.send_seconds)
+        plan[industry_id] = (send_at - timedelta(seconds=lead.prepare_seconds), send_at)
+
+    previous = None
+    for industry_id in sorted(plan, key=lambda i: plan[i][0], reverse=True):
+        start, send_at = plan[industry_id]
+        if previous is not None and previous - start < stagger:
+            start = previous - stagger
+        plan[industry_id] = (start, send_at)
+        previous = start
+
+    previous = None
+    for industry_id in sorted(plan, key=lambda i: plan[i][0]):
+        start, send_at = plan[industry_id]
+        start = max(start, earliest) if previous is None else max(start, earliest, previous + stagger)
+        plan[industry_id] = (start, send_at)
+        previous = start
+    return plan
@@ -0,0 +1,171 @@
+"""进程内已推送 URL 索引 - 减少对 SeenArticle 表的查询
+
+每个源的候选链接都要到 SeenArticle 表做一次 IN 查询，而绝大多数候选从未推送过。
+这里在内存中维护两层索引，数据来自 SeenArticle 表：
+- 布隆过滤器：判定「未见过」的 URL 一定未推送，不再查库
+- 近期 URL 哈希集合（settings.seen_index_recent_hours 内推送的文章，即 SeenArticle.url_hash）：命中即视为已推送，不再查库
+- 其余（布隆过滤器判定可能存在、但不在近期集合中）仍查库确认
+
+索引在首次使用时从数据库加载；推送成功提交后由调用方 add()，
+cleanup_old_records 清理后 rebuild()，手动清空已见记录后 invalidate()（下次使用时重新加载）。
+加载失败或 settings.seen_index_enabled 为 False 时全部候选都查库，行为与未启用索引相同。
+"""
+import asyncio
+import logging
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import select
+
+from backend.config import settings
+from backend.database import AsyncSessionLocal
+from backend.models.seen_article import SeenArticle, url_hash
+from backend.utils.bloom import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SeenIndexStats:
+    """进程内累计的查询统计（用于观察节省的数据库查询）"""
+    lookups: int = 0          # 经过索引判定的 URL 数
+    definite_misses: int = 0  # 布隆过滤器判定未见过，免查库
+    recent_hits: int = 0      # 命中近期哈希集合，免查库
+    db_checked: int = 0       # 仍需查库确认的 URL 数
+    false_positives: int = 0  # 查库后确认未推送（布隆过滤器误判）
+
+    @property
+    def saved_rate(self) -> float:
+        return (self.definite_misses + self.recent_hits) / self.lookups if self.lookups else 0.0
+
+
+class SeenIndex:
+    def __init__(self):
+        self._bloom: Optional[BloomFilter] = None
+        self._recent: set[int] = set()
+        self._lock = asyncio.Lock()
+        self._loading = False
+        self._pending: list[str] = []  # 加载期间 add() 的 URL，加载完成后补入
+        self.stats = SeenIndexStats()
+
+    @property
+    def loaded(self) -> bool:
+        return self._bloom is not None
+
+    async def _load(self) -> None:
+        recent_cutoff = (
+            datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=settings.seen_index_recent_hours)
+        )
+        self._loading = True
+        try:
+            async with AsyncSessionLocal() as db:
+                rows = (await db.execute(
+                    select(SeenArticle.url_hash, SeenArticle.url, SeenArticle.first_seen_at)
+                )).all()
+            bloom = BloomFilter(max(settings.seen_index_capacity, len(rows) * 2), settings.seen_index_error_rate)
+            recent: set[int] = set()
+            for h, url, first_seen_at in rows:
+                bloom.add(url)
+                if first_seen_at is not None and first_seen_at.replace(tzinfo=None) >= recent_cutoff:
+                    recent.add(h)
+        finally:
+            self._loading = False
+        self._bloom, self._recent = bloom, recent
+        pending, self._pending = self._pending, []
+        self.add(pending)
+        logger.info(
+            "已推送 URL 索引加载完成：%d 条（近期 %d 条），占用约 %.1f KB",
+            len(rows), len(self._recent), self.memory_bytes() / 1024,
+        )
+
+    async def ensure_loaded(self) -> bool:
+        """首次使用时从数据库加载，返回索引是否可用"""
+        if not settings.seen_index_enabled:
+            return False
+        if self.loaded:
+            return True
+        async with self._lock:
+            if not self.loaded:
+                try:
+                    await self._load()
+                except Exception as e:
+                    logger.warning("加载已推送 URL 索引失败，本次全部查库: %s", e)
+                    return False
+        return True
+
+    async def rebuild(self) -> None:
+        """重新从数据库加载（SeenArticle 被批量删除后调用）"""
+        self.invalidate()
+        await self.ensure_loaded()
+
+    def invalidate(self) -> None:
+        """丢弃索引，下次使用时重新加载"""
+        self._bloom = None
+        self._recent = set()
+
+    def add(self, urls: Iterable[str]) -> None:
+        """记录新推送的 URL（须在 SeenArticle 写入提交之后调用）"""
+        if self._loading:
+            self._pending.extend(urls)
+            return
+        if self._bloom is None:
+            return
+        for url in urls:
+            self._bloom.add(url)
+            self._recent.add(url_hash(url))
+
+    async def classify(self, urls: list[str]) -> tuple[set[str], list[str]]:
+        """
+        返回 (确定已推送的 URL, 需要查库确认的 URL)。
+
+        不在两者中的 URL 确定未推送。索引不可用时全部需要查库。
+        """
+        if not urls or not await self.ensure_loaded():
+            return set(), list(urls)
+        seen: set[str] = set()
+        to_check: list[str] = []
+        for url in urls:
+            if url not in self._bloom:
+                self.stats.definite_misses += 1
+            elif url_hash(url) in self._recent:
+                seen.add(url)
+                self.stats.recent_hits += 1
+            else:
+                to_check.append(url)
+        self.stats.lookups += len(urls)
+        self.stats.db_checked += len(to_check)
+        return seen, to_check
+
+    def record_db_result(self, checked: list[str], found: set[str]) -> None:
+        """记录查库结果：未找到的即布隆过滤器误判；找到的加入近期集合，之后免查库"""
+        self.stats.false_positives += len(checked) - len(found)
+        if self._bloom is not None:
+            self._recent.update(url_hash(url) for url in found)
+
+    def memory_bytes(self) -> int:
+        """布隆过滤器位数组 + 近期哈希集合的大致内存占用"""
+        if self._bloom is None:
+            return 0
+        ints = sum(sys.getsizeof(h) for h in self._recent)
+        return self._bloom.nbytes + sys.getsizeof(self._recent) + ints
+
+    def log_stats(self) -> None:
+        """输出内存占用、误判率和节省的查询"""
+        s = self.stats
+        if not s.lookups or self._bloom is None:
+            return
+        observed_fpr = s.false_positives / (s.false_positives + s.definite_misses) \
+            if s.false_positives + s.definite_misses else 0.0
+        logger.info(
+            "已推送 URL 索引：%d 条，占用约 %.1f KB；累计判定 %d 个 URL，免查库 %d 个（%.1f%%），"
+            "查库 %d 个，误判 %d 个（实测误判率 %.2f%%，估计 %.2f%%）",
+            len(self._bloom), self.memory_bytes() / 1024, s.lookups,
+            s.definite_misses + s.recent_hits, s.saved_rate * 100,
+            s.db_checked, s.false_positives, observed_fpr * 100,
+            self._bloom.estimated_error_rate() * 100,
+        )
+
+
+seen_index = SeenIndex()
@@ -6,18 +6,22 @@
 - 请求成功但无链接 → warning
 - 请求失败（超时/网络错误/4xx/5xx）→ error
 - 连续失败 ≥3 次 → 发送告警邮件
-- 失败只更新状态，不影响推送任务
+- 检查结果同时计入该源的熔断器（见 circuit_breaker）：采集时已熔断的源快速失败，
+  健康检查本身不受熔断限制，相当于每日一次探测
 """
 import asyncio
 import logging
 from datetime import datetime, timezone
 
 import httpx
-from bs4 import BeautifulSoup
 from sqlalchemy import select
 
 from backend.database import AsyncSessionLocal
 from backend.models.news_source import NewsSource
+from backend.services.circuit_breaker import breaker, source_key
+from backend.services.news_crawler import _fetch_page_bytes
+from backend.utils.html_parser import parse_html
+from backend.utils.ssrf_protection import SSRFSafeTransport
 
 logger = logging.getLogger(__name__)
 
@@ -33,11 +37,13 @@ async def check_one_source(source: NewsSource) -> tuple[str, str | None]:
         async with httpx.AsyncClient(
             follow_redirects=True,
             headers={"User-Agent": "Mozilla/5.0 (compatible; NewsBot/1.0)"},
+            transport=SSRFSafeTransport(),
         ) as client:
-            resp = await client.get(source.url, timeout=_HEALTH_TIMEOUT)
-            resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
-        links = soup.select(selector)
+            # 与采集共用 _fetch_page_bytes：检查时写入的 HTTP 缓存可供随后的早报采集做条件请求
+            content, encoding = await _fetch_page_bytes(
+                client, source.url, retries=1, timeout=_HEALTH_TIMEOUT, bypass_breaker=True,
+            )
+        links = parse_html(content, encoding).select(selector)
         if links:
             return "healthy", None
         else:
@@ -62,6 +68,10 @@ async def _check_and_save(source_id: int, source_name: str, source_url: str,
 
     status, error_msg = await check_one_source(_SourceProxy())  # type: ignore[arg-type]
     now = datetime.now(timezone.utc)
+    if status == "error":
+        breaker.record_failure(source_key(source_id), error_msg or "")
+    else:
+        breaker.record_success(source_key(source_id))
 
     async with AsyncSessionLocal() as db:
         src = await db.get(NewsSource, source_id)
@@ -0,0 +1,120 @@
+"""AI 摘要持久化缓存
+
+未推送的文章不会写入 SeenArticle，第二天会被重新抓取；手动重发早报也会重复抓取。
+为避免对同一篇文章重复调用通义千问，按「正文哈希 + 语言 + 摘要字数」缓存生成结果：
+- 命中时直接返回缓存的（标题, 摘要），不调用 API
+- 超过 settings.summary_cache_ttl_days 的条目视为过期
+- 条数超过 settings.summary_cache_max_entries 时按最近使用时间（LRU）淘汰
+- 缓存读写失败只记日志，不影响摘要生成
+"""
+import hashlib
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, func, select
+
+from backend.config import settings
+from backend.database import AsyncSessionLocal
+from backend.models.summary_cache import SummaryCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SummaryCacheStats:
+    """进程内累计的缓存命中统计（用于观察 API 成本下降）"""
+    hits: int = 0
+    misses: int = 0
+    saved_tokens: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+stats = SummaryCacheStats()
+
+
+def make_cache_key(text: str, source_language: str, max_chars: int, original_title: str = "") -> str:
+    """生成缓存 key；英文源的翻译标题依赖原标题，因此将原标题一并计入"""
+    h = hashlib.sha256()
+    h.update(text.encode("utf-8"))
+    h.update(f"\x00{source_language}\x00{max_chars}".encode("utf-8"))
+    if source_language == "en":
+        h.update(f"\x00{original_title}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _utcnow() -> datetime:
+    # SQLite DateTime 列不保存时区，统一用 naive UTC 时间比较
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def get_cached_summary(key: str) -> Optional[tuple[str, str]]:
+    """查询缓存，命中返回 (标题, 摘要)，未命中或已过期返回 None"""
+    try:
+        async with AsyncSessionLocal() as db:
+            entry = await db.get(SummaryCache, key)
+            now = _utcnow()
+            if entry is None or entry.created_at < now - timedelta(days=settings.summary_cache_ttl_days):
+                stats.misses += 1
+                return None
+            entry.last_used_at = now
+            stats.hits += 1
+            stats.saved_tokens += entry.tokens or 0
+            result = (entry.title, entry.summary)
+            await db.commit()
+            return result
+    except Exception as e:
+        logger.warning("读取 AI 摘要缓存失败: %s", e)
+        stats.misses += 1
+        return None
+
+
+async def put_cached_summary(key: str, title: str, summary: str, tokens: int = 0) -> None:
+    """写入（或覆盖）一条缓存"""
+    if not summary:
+        return
+    try:
+        async with AsyncSessionLocal() as db:
+            now = _utcnow()
+            await db.merge(SummaryCache(
+                key=key, title=title[:500], summary=summary, tokens=tokens,
+                created_at=now, last_used_at=now,
+            ))
+            await db.commit()
+    except Exception as e:
+        logger.warning("写入 AI 摘要缓存失败: %s", e)
+
+
+async def evict_summary_cache() -> int:
+    """淘汰过期条目，并按 LRU 将缓存裁剪到 summary_cache_max_entries 条，返回删除条数"""
+    cutoff = _utcnow() - timedelta(days=settings.summary_cache_ttl_days)
+    async with AsyncSessionLocal() as db:
+        expired = await db.execute(delete(SummaryCache).where(SummaryCache.created_at < cutoff))
+        removed = expired.rowcount or 0
+
+        total = (await db.execute(select(func.count()).select_from(SummaryCache))).scalar_one()
+        overflow = total - settings.summary_cache_max_entries
+        if overflow > 0:
+            oldest = (
+                select(SummaryCache.key)
+                .order_by(func.coalesce(SummaryCache.last_used_at, SummaryCache.created_at))
+                .limit(overflow)
+            )
+            lru = await db.execute(delete(SummaryCache).where(SummaryCache.key.in_(oldest)))
+            removed += lru.rowcount or 0
+        await db.commit()
+    return removed
+
+
+def log_stats() -> None:
+    """输出缓存命中率和累计节省的 token 数"""
+    if stats.hits or stats.misses:
+        logger.info(
+            "AI 摘要缓存：命中 %d 次，未命中 %d 次（命中率 %.1f%%），累计节省约 %d tokens",
+            stats.hits, stats.misses, stats.hit_rate * 100, stats.saved_tokens,
+        )
@@ -1,28 +1,42 @@
 """APScheduler 定时任务配置"""
+import asyncio
 import logging
-from datetime import datetime, timezone
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
-from sqlalchemy import select, delete
+from sqlalchemy import func, select, delete
 
+from backend.config import settings
 from backend.database import AsyncSessionLocal
 from backend.models import Industry, NewsSource, FinanceItem, Recipient, SmtpConfig, PushSchedule, SeenArticle
 from backend.models.push_log import PushLog
-from backend.services.news_crawler import crawl_sources
+from backend.models.seen_article import url_hash
+from backend.services.news_crawler import CrawlStats, crawl_sources, save_crawl_state
 from backend.services.news_deduplication import deduplicate
 from backend.services.news_ranking import score_and_rank
+from backend.services.push_timing import estimate_lead, plan_start_times
+from backend.services.seen_index import seen_index
 from backend.services.finance_crawler import fetch_quotes
 from backend.services.mailer import send_morning_report, send_evening_report
 
 logger = logging.getLogger(__name__)
 
 scheduler = AsyncIOScheduler(timezone="Asia/Shanghai")
+_TZ = ZoneInfo("Asia/Shanghai")
 
 # 连续失败计数器：key=(industry_id, push_type)，value=连续失败次数
 _consecutive_failures: dict = {}
 _ALERT_THRESHOLD = 3  # 连续失败 N 次后发送告警
 
+# 最近一次完整预采集的时间：key=industry_id，value=time.monotonic()
+_last_precrawl: dict[int, float] = {}
+# 上次早报之后第一次预采集的开始时间（naive UTC）：key=industry_id，早报推送成功后清除
+_precrawl_started: dict[int, datetime] = {}
+
 
 async def _send_failure_alert(industry_name: str, push_type: str, error_msg: str, count: int) -> None:
     """连续推送失败时，通过邮件发送告警给管理员"""
@@ -69,8 +83,57 @@ async def _send_failure_alert(industry_name: str, push_type: str, error_msg: str
         logger.error("发送告警邮件失败: %s", e)
 
 
-async def run_morning_push(industry_id: int, triggered_by: str = "scheduler") -> None:
-    """早报推送任务"""
+def _source_dicts(sources) -> list[dict]:
+    """NewsSource → crawl_sources 使用的字典（session 之外也可安全读取）"""
+    return [
+        {
+            "id": s.id,
+            "url": s.url,
+            "name": s.name,
+            "weight": s.weight,
+            "keywords": s.keywords,
+            "link_selector": s.link_selector,
+            "language": s.language,
+            "consecutive_failures": s.consecutive_failures,
+            "last_check_at": s.last_check_at,
+            "last_error": s.last_error,
+        }
+        for s in sources
+    ]
+
+
+def _candidate_budget(industry: Industry) -> int:
+    return industry.candidate_budget or industry.top_n * settings.crawl_candidate_factor
+
+
+async def _staged_since(db, industry_id: int) -> Optional[datetime]:
+    """
+    列表页失败时可用的暂存文章起点：上次早报、本轮预采集开始两者中较晚的时间（naive UTC）。
+
+    更早暂存的文章已参与过之前的推送；两者都没有时返回 None，不从暂存中补充。
+    """
+    last_push = await db.scalar(
+        select(func.max(PushLog.created_at)).where(
+            PushLog.industry_id == industry_id,
+            PushLog.push_type == "morning",
+            PushLog.status.in_(("success", "skipped")),
+        )
+    )
+    times = [t for t in (last_push, _precrawl_started.get(industry_id)) if t is not None]
+    return max(times) if times else None
+
+
+async def run_morning_push(
+    industry_id: int,
+    triggered_by: str = "scheduler",
+    send_at: Optional[datetime] = None,
+) -> None:
+    """
+    早报推送任务
+
+    send_at 不为空时（提前启动的定时早报），排序完成后等到 send_at 再发送邮件。
+    采集、去重排序、发送各阶段耗时记入 PushLog，供 push_timing 估算下次的提前量。
+    """
     async with AsyncSessionLocal() as db:
         industry = await db.get(Industry, industry_id)
         if not industry:
@@ -116,31 +179,49 @@ async def run_morning_push(industry_id: int, triggered_by: str = "scheduler") ->
             await db.commit()
             return
 
-        source_dicts = [
-            {
-                "id": s.id,
-                "url": s.url,
-                "name": s.name,
-                "weight": s.weight,
-                "keywords": s.keywords,
-                "link_selector": s.link_selector,
-                "language": s.language,
-            }
-            for s in sources
-        ]
+        source_dicts = _source_dicts(sources)
 
         # 采集 → 去重 → 打分 → 推送 → 写入 SeenArticle（仅推送成功的文章）
         # 使用独立 session 写入失败日志，避免主 session 脏状态影响日志记录
         industry_name_snapshot = industry.name
         try:
-            raw_items = await crawl_sources(source_dicts, db)
+            time_budget = industry.crawl_time_budget or settings.crawl_time_budget
+            # 近期已预采集：候选大多已暂存，只做短时补充采集
+            if _recently_precrawled(industry_id):
+                time_budget = min(time_budget, settings.precrawl_topup_budget) if time_budget > 0 \
+                    else settings.precrawl_topup_budget
+                logger.info("行业 %s 已预采集，早报补充采集时长 %.0f 秒", industry.name, time_budget)
+            crawl_stats = CrawlStats()
+            stage_start = time.monotonic()
+            raw_items = await crawl_sources(
+                source_dicts, db,
+                industry_keywords=industry.keywords,
+                candidate_budget=_candidate_budget(industry),
+                time_budget=time_budget,
+                stats=crawl_stats,
+                save_state=False,
+                staged_since=await _staged_since(db, industry_id),
+            )
+            # 采集时长用尽时只用已完成的结果排序推送，未完成的源记入 PushLog
+            cut_off_sources = "、".join(sorted(crawl_stats.cut_off_sources)) or None
+            crawl_seconds = time.monotonic() - stage_start
+            stage_start = time.monotonic()
             deduped = deduplicate(raw_items)
             top_items = score_and_rank(deduped, top_n=industry.top_n,
                                        industry_keywords=industry.keywords)
+            rank_seconds = time.monotonic() - stage_start
+            if send_at is not None and top_items:
+                # 采集结果（指纹、暂存候选、负缓存）留在 crawl_stats 中，发送后才写入：
+                # 等待期间 session 只做过读操作，不占用 SQLite 写锁
+                await _sleep_until(send_at)
+            stage_start = time.monotonic()
             html_snapshot = await send_morning_report(
                 smtp_cfg, recipients, industry.name, top_items,
                 contact_email=smtp_cfg.contact_email or smtp_cfg.username,
             )
+            send_seconds = time.monotonic() - stage_start if html_snapshot else None
+            # 与 SeenArticle、PushLog 一起提交；发送失败时不写入，下次仍视为新文章
+            await save_crawl_state(db, crawl_stats)
             status = "success" if html_snapshot else "skipped"
             error_msg = None if html_snapshot else "无新增文章（所有文章已在历史记录中）"
 
@@ -149,6 +230,7 @@ async def run_morning_push(industry_id: int, triggered_by: str = "scheduler") ->
                 now = datetime.now(timezone.utc)
                 seen_records = [
                     SeenArticle(
+                        url_hash=url_hash(item.url),
                         url=item.url,
                         title=item.title,
                         source_id=item.source_id,
@@ -163,8 +245,13 @@ async def run_morning_push(industry_id: int, triggered_by: str = "scheduler") ->
                 industry_id=industry_id, push_type="morning", status=status,
                 article_count=len(top_items), recipient_count=len(recipients),
                 error_msg=error_msg, html_snapshot=html_snapshot, triggered_by=triggered_by,
+                cut_off_sources=cut_off_sources, crawl_seconds=crawl_seconds,
+                rank_seconds=rank_seconds, send_seconds=send_seconds,
             ))
             await db.commit()
+            _precrawl_started.pop(industry_id, None)
+            if html_snapshot and top_items:
+                seen_index.add(item.url for item in top_items)
             # 推送成功，重置连续失败计数
             _consecutive_failures.pop((industry_id, "morning"), None)
         except Exception as e:
@@ -188,6 +275,140 @@ async def run_morning_push(industry_id: int, triggered_by: str = "scheduler") ->
                 pass
 
 
+async def run_morning_slot(industry_ids: list[int], triggered_by: str = "scheduler") -> None:
+    """
+    同一时刻的多个行业早报合并为一次任务，并发执行各行业的 run_morning_push。
+
+    多个行业共用的列表页、转载的同一篇文章经 news_crawler 的共享缓存合并，
+    同一 URL 只下载一次（正在进行的请求也会共享结果），再分别进入各行业的去重、排序和推送。
+    单个行业失败由 run_morning_push 自行记录，不影响其他行业。
+    """
+    results = await asyncio.gather(
+        *(run_morning_push(industry_id, triggered_by) for industry_id in industry_ids),
+        return_exceptions=True,
+    )
+    for industry_id, result in zip(industry_ids, results):
+        if isinstance(result, Exception):
+            logger.error("行业ID=%d 早报任务异常: %s", industry_id, result)
+
+
+def _recently_precrawled(industry_id: int) -> bool:
+    last = _last_precrawl.get(industry_id)
+    return (
+        settings.precrawl_enabled and last is not None
+        and time.monotonic() - last < settings.precrawl_fresh_minutes * 60
+    )
+
+
+async def precrawl_industry(industry_id: int) -> None:
+    """
+    后台预采集：提前完成列表页、详情页抓取和 AI 摘要，结果暂存到 candidate_store，不推送。
+
+    - 只用上次推送的列表页指纹过滤，不写入指纹（否则推送时列表页「未变化」，暂存的文章反而进不了候选）：
+      上次推送时已处理过的链接推送时同样会被过滤，不再为它们抓取详情页、生成 AI 摘要
+    - 不写 SeenArticle、PushLog，只提交 CandidateArticle（暂存）和 FailedArticle（负缓存）
+    - 推送时 crawl_sources 命中暂存的候选直接复用摘要；列表页失败的源也从暂存中补充候选
+    """
+    async with AsyncSessionLocal() as db:
+        industry = await db.get(Industry, industry_id)
+        if not industry:
+            return
+        sources_result = await db.execute(
+            select(NewsSource).where(NewsSource.industry_id == industry_id)
+        )
+        sources = sources_result.scalars().all()
+        if not sources:
+            return
+        industry_name = industry.name
+        _precrawl_started.setdefault(industry_id, datetime.now(timezone.utc).replace(tzinfo=None))
+        crawl_stats = CrawlStats()
+        items = await crawl_sources(
+            _source_dicts(sources), db,
+            industry_keywords=industry.keywords,
+            candidate_budget=_candidate_budget(industry),
+            time_budget=industry.crawl_time_budget or settings.crawl_time_budget,
+            stats=crawl_stats,
+            record_fingerprints=False,
+        )
+        await db.commit()
+    # 有未完成的源时不记为已预采集，推送时仍使用完整的采集时长
+    if not crawl_stats.cut_off_sources:
+        _last_precrawl[industry_id] = time.monotonic()
+    logger.info("行业 %s 预采集完成：%d 篇文章已暂存", industry_name, len(items))
+
+
+def _precrawl_due(schedules, now: datetime) -> list[int]:
+    """
+    早报时刻距 now 不超过 settings.precrawl_window_minutes 分钟、且早报任务尚未开始的行业。
+
+    schedules 为 [(industry_id, hour, minute)]；准点早报提前 morning_max_lead_minutes 分钟触发，这段时间内不再预采集。
+    """
+    lead = settings.morning_max_lead_minutes if settings.morning_on_time else 0
+    due: list[int] = []
+    for industry_id, hour, minute in schedules:
+        until = (hour * 60 + minute - now.hour * 60 - now.minute) % (24 * 60)
+        if lead < until <= settings.precrawl_window_minutes and industry_id not in due:
+            due.append(industry_id)
+    return due
+
+
+async def run_precrawl() -> None:
+    """预采集即将推送早报的行业（见 _precrawl_due；各行业并发，共享列表页和详情页抓取）"""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(PushSchedule.industry_id, PushSchedule.hour, PushSchedule.minute)
+            .where(PushSchedule.enabled == True, PushSchedule.push_type == "morning")  # noqa: E712
+        )
+        industry_ids = _precrawl_due(result.all(), datetime.now(_TZ))
+    if not industry_ids:
+        return
+    results = await asyncio.gather(
+        *(precrawl_industry(industry_id) for industry_id in industry_ids),
+        return_exceptions=True,
+    )
+    for industry_id, result in zip(industry_ids, results):
+        if isinstance(result, Exception):
+            logger.error("行业ID=%d 预采集异常: %s", industry_id, result)
+
+
+async def _sleep_until(when: datetime) -> None:
+    await asyncio.sleep(max(0.0, (when - datetime.now(when.tzinfo)).total_seconds()))
+
+
+async def run_morning_on_time(industry_ids: list[int], hour: int, minute: int) -> None:
+    """
+    准点早报：在目标时刻前 settings.morning_max_lead_minutes 分钟触发，
+    按各行业的历史耗时（见 push_timing）错开启动，排序完成后等到目标时刻再发送。
+    """
+    now = datetime.now(_TZ)
+    target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if target < now - timedelta(minutes=settings.morning_max_lead_minutes):
+        target += timedelta(days=1)  # 触发时刻与目标时刻跨天
+
+    leads = {}
+    async with AsyncSessionLocal() as db:
+        for industry_id in industry_ids:
+            industry = await db.get(Industry, industry_id)
+            if industry is None:
+                continue
+            budget = industry.crawl_time_budget or settings.crawl_time_budget
+            leads[industry_id] = await estimate_lead(db, industry_id, budget)
+    plan = plan_start_times(leads, target, earliest=now)
+    for industry_id, (start, send_at) in sorted(plan.items(), key=lambda kv: kv[1][0]):
+        logger.info("行业ID=%d 早报计划：%s 启动，%s 发送（目标 %s）", industry_id,
+                    start.strftime("%H:%M:%S"), send_at.strftime("%H:%M:%S"), target.strftime("%H:%M"))
+
+    async def run(industry_id: int) -> None:
+        start, send_at = plan[industry_id]
+        await _sleep_until(start)
+        await run_morning_push(industry_id, "scheduler", send_at=send_at)
+
+    results = await asyncio.gather(*(run(industry_id) for industry_id in plan), return_exceptions=True)
+    for industry_id, result in zip(plan, results):
+        if isinstance(result, Exception):
+            logger.error("行业ID=%d 早报任务异常: %s", industry_id, result)
+
+
 async def run_evening_push(industry_id: int, triggered_by: str = "scheduler") -> None:
     """晚报推送任务"""
     async with AsyncSessionLocal() as db:
@@ -281,6 +502,10 @@ async def cleanup_old_records() -> None:
     - SeenArticle：保留 7 天（去重窗口）
     - PushLog HTML 快照：3 天后清空（快照占空间最大），但保留记录本身
     - PushLog 记录：保留 30 天（供历史查询）
+    - AI 摘要缓存：按有效期和最大条数淘汰
+    - 已处理候选文章：保留 settings.candidate_store_days 天
+    - 详情页负缓存：删除已过期的记录
+    - 重建进程内已推送 URL 索引
     - 清理后执行 VACUUM 回收磁盘空间
     """
     from datetime import datetime, timezone, timedelta
@@ -310,7 +535,20 @@ async def cleanup_old_records() -> None:
             "每日清理完成：删除 %d 条 SeenArticle（7天前），清空 %d 条快照（3天前），删除 %d 条 PushLog（30天前）",
             seen_result.rowcount, snapshot_result.rowcount, log_result.rowcount,
         )
-        # 4. VACUUM 回收磁盘空间（SQLite 专用）
+        # 4. 淘汰过期 / 超量的 AI 摘要缓存
+        from backend.services.summary_cache import evict_summary_cache
+        cache_removed = await evict_summary_cache()
+        logger.info("AI 摘要缓存清理完成：删除 %d 条", cache_removed)
+        # 5. 删除过期的已处理候选文章和负缓存
+        from backend.services.candidate_store import evict_processed
+        candidates_removed = await evict_processed()
+        logger.info("已处理候选文章清理完成：删除 %d 条（%d 天前）", candidates_removed, settings.candidate_store_days)
+        from backend.services.negative_cache import evict_failed
+        failed_removed = await evict_failed()
+        logger.info("详情页负缓存清理完成：删除 %d 条过期记录", failed_removed)
+        # 6. 按清理后的 SeenArticle 重建已推送 URL 索引
+        await seen_index.rebuild()
+        # 7. VACUUM 回收磁盘空间（SQLite 专用）
         await db.execute(text("VACUUM"))
         logger.info("VACUUM 完成，数据库空间已回收")
 
@@ -328,6 +566,7 @@ async def reset_seen_articles(industry_id: int) -> int:
             delete(SeenArticle).where(SeenArticle.source_id.in_(source_ids))
         )
         await db.commit()
+        seen_index.invalidate()
         return result.rowcount
 
 
@@ -341,20 +580,54 @@ async def reload_schedules() -> None:
         )
         schedules = result.scalars().all()
 
+    # 早报按时刻合并：同一时刻的行业在一个任务中并发采集，共享列表页和文章详情页的抓取
+    morning_slots: dict[tuple[int, int], list[int]] = {}
     for sched in schedules:
-        job_id = f"{sched.push_type}_{sched.industry_id}"
-        fn = run_morning_push if sched.push_type == "morning" else run_evening_push
-
+        if sched.push_type == "morning":
+            morning_slots.setdefault((sched.hour, sched.minute), []).append(sched.industry_id)
+            continue
         scheduler.add_job(
-            fn,
+            run_evening_push,
             trigger=CronTrigger(hour=sched.hour, minute=sched.minute, timezone="Asia/Shanghai"),
             args=[sched.industry_id],
-            id=job_id,
+            id=f"{sched.push_type}_{sched.industry_id}",
             replace_existing=True,
         )
         logger.info("注册定时任务: %s %02d:%02d (行业ID=%d)",
                     sched.push_type, sched.hour, sched.minute, sched.industry_id)
 
+    for (hour, minute), industry_ids in sorted(morning_slots.items()):
+        if settings.morning_on_time:
+            # 提前触发，按历史耗时错开启动，邮件在配置的时刻发出
+            fire = (hour * 60 + minute - settings.morning_max_lead_minutes) % (24 * 60)
+            job_func, args, trigger = run_morning_on_time, [industry_ids, hour, minute], \
+                CronTrigger(hour=fire // 60, minute=fire % 60, timezone="Asia/Shanghai")
+        else:
+            job_func, args, trigger = run_morning_slot, [industry_ids], \
+                CronTrigger(hour=hour, minute=minute, timezone="Asia/Shanghai")
+        scheduler.add_job(
+            job_func,
+            trigger=trigger,
+            args=args,
+            id=f"morning_{hour:02d}{minute:02d}",
+            replace_existing=True,
+        )
+        logger.info("注册定时任务: morning %02d:%02d (行业ID=%s)",
+                    hour, minute, ",".join(str(i) for i in industry_ids))
+
+    # 早报前后台预采集，推送时只需短时补充采集；按各行业的早报时刻决定是否预采集（见 _precrawl_due）
+    if settings.precrawl_enabled and morning_slots:
+        scheduler.add_job(
+            run_precrawl,
+            trigger=CronTrigger(minute=settings.precrawl_minute, timezone="Asia/Shanghai"),
+            id="precrawl",
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+        )
+        logger.info("注册预采集任务: minute=%s（早报前 %d 分钟内）",
+                    settings.precrawl_minute, settings.precrawl_window_minutes)
+
     if not schedules:
         logger.warning("数据库中无推送计划，请在 Admin 后台配置推送计划后重启应用")
 
@@ -0,0 +1,187 @@
+"""HTML 解析抽象层
+
+采集、摘要提取和健康检查只用到一小组操作（CSS 选择、按标签查找、删除标签、取文本），
+这里统一封装，底层可切换：
+- selectolax（lexbor，C 实现）：默认，可直接解析 UTF-8 字节，无需先解码为 str
+- bs4（html.parser，纯 Python）：未安装 selectolax 或 settings.html_parser = "bs4" 时使用
+
+两种后端的输出与原先 BeautifulSoup(html, "html.parser") 保持一致：
+- text() 等价于 get_text(strip=True)：逐段去除首尾空白后拼接，不含注释和 script/style 内容
+- select / find_all 只返回后代节点，不含节点自身
+- 严重不规范的 HTML（如 <p> 嵌套 <p>）两种解析器建树不同，结果可能略有差异
+"""
+from typing import Iterable, Optional, Protocol, Union
+
+from bs4 import BeautifulSoup
+
+from backend.config import settings
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover - 未安装时降级为 bs4
+    LexborHTMLParser = None
+
+Markup = Union[str, bytes]
+
+# get_text 默认不计入这些标签内的文本（bs4 将其视为 Script / Stylesheet / TemplateString）
+_NON_TEXT_TAGS = ("script", "style", "template")
+
+
+class HtmlNode(Protocol):
+    @property
+    def tag(self) -> str: ...
+
+    def attr(self, name: str) -> str: ...
+
+    def text(self) -> str: ...
+
+    def select(self, css: str) -> list["HtmlNode"]: ...
+
+    def select_one(self, css: str) -> Optional["HtmlNode"]: ...
+
+    def find_all(self, tag: str) -> list["HtmlNode"]: ...
+
+    def remove(self, tags: Iterable[str]) -> None: ...
+
+
+class HtmlDocument(HtmlNode, Protocol):
+    def body(self) -> HtmlNode: ...
+
+
+def _is_utf8(encoding: Optional[str]) -> bool:
+    return encoding is None or encoding.lower().replace("-", "").replace("_", "") == "utf8"
+
+
+def _to_str(markup: Markup, encoding: Optional[str]) -> str:
+    if isinstance(markup, bytes):
+        return markup.decode(encoding or "utf-8", errors="replace")
+    return markup
+
+
+# ── bs4 后端 ──────────────────────────────────
+
+class _SoupNode:
+    __slots__ = ("_tag",)
+
+    def __init__(self, tag):
+        self._tag = tag
+
+    @property
+    def tag(self) -> str:
+        return self._tag.name
+
+    def attr(self, name: str) -> str:
+        value = self._tag.get(name, "")
+        if isinstance(value, list):  # class 等多值属性
+            return " ".join(value)
+        return value or ""
+
+    def text(self) -> str:
+        return self._tag.get_text(strip=True)
+
+    def select(self, css: str) -> list["_SoupNode"]:
+        return [_SoupNode(t) for t in self._tag.select(css)]
+
+    def select_one(self, css: str) -> Optional["_SoupNode"]:
+        t = self._tag.select_one(css)
+        return _SoupNode(t) if t is not None else None
+
+    def find_all(self, tag: str) -> list["_SoupNode"]:
+        return [_SoupNode(t) for t in self._tag.find_all(tag)]
+
+    def remove(self, tags: Iterable[str]) -> None:
+        for t in self._tag(list(tags)):
+            t.decompose()
+
+
+class _SoupDocument(_SoupNode):
+    __slots__ = ()
+
+    def body(self) -> _SoupNode:
+        body = self._tag.find("body")
+        return _SoupNode(body) if body is not None else self
+
+
+# ── selectolax 后端 ───────────────────────────
+
+class _LexborNode:
+    __slots__ = ("_node",)
+
+    def __init__(self, node):
+        self._node = node
+
+    @property
+    def tag(self) -> str:
+        return self._node.tag
+
+    def attr(self, name: str) -> str:
+        return self._node.attributes.get(name) or ""
+
+    def text(self) -> str:
+        node = self._node
+        if node.css_first("script, style, template") is None:
+            return node.text(strip=True)
+        parts = []
+        for child in node.traverse(include_text=True):
+            if child.is_text_node and child.parent.tag not in _NON_TEXT_TAGS:
+                s = child.text_content.strip()
+                if s:
+                    parts.append(s)
+        return "".join(parts)
+
+    def _descendants(self, css: str) -> list:
+        # lexbor 的 css() 会匹配节点自身，bs4 只返回后代
+        own = self._node.mem_id
+        return [n for n in self._node.css(css) if n.mem_id != own]
+
+    def select(self, css: str) -> list["_LexborNode"]:
+        return [_LexborNode(n) for n in self._descendants(css)]
+
+    def select_one(self, css: str) -> Optional["_LexborNode"]:
+        n = self._node.css_first(css)
+        if n is not None and n.mem_id == self._node.mem_id:
+            found = self._descendants(css)
+            n = found[0] if found else None
+        return _LexborNode(n) if n is not None else None
+
+    def find_all(self, tag: str) -> list["_LexborNode"]:
+        return self.select(tag)
+
+    def remove(self, tags: Iterable[str]) -> None:
+        # 逆文档序删除：先删内层节点，再删外层节点（strip_tags 会连节点自身一起删除，不能直接用）
+        for n in reversed(self._descendants(", ".join(tags))):
+            n.decompose()
+
+
+class _LexborDocument(_LexborNode):
+    __slots__ = ("_tree",)
+
+    def __init__(self, tree):
+        super().__init__(tree.root)
+        self._tree = tree
+
+    def body(self) -> _LexborNode:
+        body = self._tree.body
+        return _LexborNode(body) if body is not None else self
+
+
+def default_backend() -> str:
+    """settings.html_parser 为 auto 时优先使用 selectolax"""
+    if settings.html_parser == "bs4" or LexborHTMLParser is None:
+        return "bs4"
+    return "selectolax"
+
+
+def parse_html(markup: Markup, encoding: Optional[str] = None, backend: Optional[str] = None) -> HtmlDocument:
+    """
+    解析 HTML，markup 可以是 str 或响应原始字节。
+
+    encoding: markup 为字节时的编码（通常取 resp.encoding），默认 UTF-8；
+    selectolax 后端遇到 UTF-8 字节时直接解析，不再解码为 str。
+    """
+    backend = backend or default_backend()
+    if backend == "selectolax":
+        if isinstance(markup, bytes) and not _is_utf8(encoding):
+            markup = _to_str(markup, encoding)
+        return _LexborDocument(LexborHTMLParser(markup))
+    return _SoupDocument(BeautifulSoup(_to_str(markup, encoding), "html.parser"))
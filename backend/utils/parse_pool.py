@@ -0,0 +1,79 @@
+"""HTML 解析进程池（可选）
+
+链接提取、摘要 / 正文提取是纯 CPU 计算，在事件循环线程上执行时只用到一个核，
+遇到 1~3 MB 的门户页面会让整个事件循环卡顿数百毫秒。
+
+settings.parse_workers > 0 时，大于 settings.parse_offload_min_bytes 的页面交给进程池解析：
+- 传入原始字节，返回体积很小的结果（链接列表、文本），进程间拷贝开销可以忽略
+- 子进程使用 spawn 方式启动，避免 fork 带走事件循环、数据库连接等线程状态
+- 进程池启动失败或中途崩溃时记录日志，之后所有解析降级为在事件循环内执行
+
+parse_workers = 0（默认）时始终在事件循环内解析，行为与未引入进程池时相同。
+"""
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional, TypeVar
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_executor: Optional[ProcessPoolExecutor] = None
+_disabled = False
+
+
+def _get_executor() -> Optional[ProcessPoolExecutor]:
+    global _executor, _disabled
+    if _disabled or settings.parse_workers <= 0:
+        return None
+    if _executor is None:
+        try:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.parse_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        except Exception as e:
+            logger.warning("HTML 解析进程池启动失败，改为在事件循环内解析: %s", e)
+            _disabled = True
+            return None
+        logger.info("HTML 解析进程池已启动（%d 个进程）", settings.parse_workers)
+    return _executor
+
+
+def _disable(reason: BaseException) -> None:
+    global _executor, _disabled
+    logger.warning("HTML 解析进程池不可用，改为在事件循环内解析: %s", reason)
+    _disabled = True
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def run_parse(func: Callable[..., T], *args, size: int = 0) -> T:
+    """
+    执行解析函数 func(*args)。
+
+    size 为待解析内容的字节数；进程池已启用且 size 不小于 parse_offload_min_bytes 时在子进程执行，
+    否则直接在当前线程执行。func 及参数、返回值都必须可 pickle（模块级函数、bytes、str、tuple 等）。
+    """
+    executor = _get_executor() if size >= settings.parse_offload_min_bytes else None
+    if executor is None:
+        return func(*args)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+    except BrokenProcessPool as e:
+        _disable(e)
+        return func(*args)
+
+
+def shutdown() -> None:
+    """应用关闭时终止子进程"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
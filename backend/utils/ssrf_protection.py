@@ -1,8 +1,22 @@
-"""SSRF 防护 - 拒绝内网 IP 地址"""
+"""SSRF 防护 - 拒绝内网 IP 地址
+
+- validate_url：同步校验（阻塞式 DNS 解析），供非异步场景使用
+- validate_url_async：异步校验，DNS 结果按主机名缓存 settings.dns_cache_ttl 秒
+- SSRFSafeTransport：httpx 传输层，建立 TCP 连接时只连接已校验过的 IP（DNS pinning），
+  重定向目标同样经过校验，避免 DNS rebinding（校验时解析到公网、连接时解析到内网）
+"""
+import asyncio
 import ipaddress
 import socket
+from typing import Iterable, Optional
 from urllib.parse import urlparse
 
+import httpcore
+import httpx
+
+from backend.config import settings
+from backend.utils.ttl_cache import AsyncTTLCache
+
 
 _PRIVATE_NETWORKS = [
     ipaddress.ip_network("10.0.0.0/8"),
@@ -16,16 +30,16 @@ _PRIVATE_NETWORKS = [
 
 ALLOWED_SCHEMES = {"http", "https"}
 
+# 主机名 → 解析得到的 IP 列表
+_dns_cache: AsyncTTLCache[str, list[str]] = AsyncTTLCache(ttl=settings.dns_cache_ttl, maxsize=4096)
+
 
 class SSRFError(ValueError):
     pass
 
 
-def validate_url(url: str) -> None:
-    """
-    校验 URL 是否安全（非内网地址）。
-    如果不安全，抛出 SSRFError。
-    """
+def _parse_hostname(url: str) -> str:
+    """校验协议并返回主机名"""
     parsed = urlparse(url)
 
     if parsed.scheme not in ALLOWED_SCHEMES:
@@ -34,15 +48,13 @@ def validate_url(url: str) -> None:
     hostname = parsed.hostname
     if not hostname:
         raise SSRFError("URL 缺少主机名")
+    return hostname
 
-    # 解析主机名到 IP
-    try:
-        infos = socket.getaddrinfo(hostname, None)
-    except socket.gaierror as e:
-        raise SSRFError(f"无法解析主机名 {hostname}: {e}") from e
 
-    for info in infos:
-        addr = info[4][0]
+def _check_addresses(addrs: Iterable[str]) -> list[str]:
+    """任一地址属于内网即拒绝，返回可用的 IP 列表"""
+    valid: list[str] = []
+    for addr in addrs:
         try:
             ip = ipaddress.ip_address(addr)
         except ValueError:
@@ -50,3 +62,94 @@ def validate_url(url: str) -> None:
         for network in _PRIVATE_NETWORKS:
             if ip in network:
                 raise SSRFError(f"目标 IP {addr} 属于内网地址，拒绝访问")
+        if addr not in valid:
+            valid.append(addr)
+    return valid
+
+
+def validate_url(url: str) -> None:
+    """
+    校验 URL 是否安全（非内网地址）。
+    如果不安全，抛出 SSRFError。
+    """
+    hostname = _parse_hostname(url)
+
+    # 解析主机名到 IP
+    try:
+        infos = socket.getaddrinfo(hostname, None)
+    except socket.gaierror as e:
+        raise SSRFError(f"无法解析主机名 {hostname}: {e}") from e
+
+    _check_addresses(info[4][0] for info in infos)
+
+
+async def _resolve(hostname: str) -> list[str]:
+    loop = asyncio.get_running_loop()
+    try:
+        infos = await loop.getaddrinfo(hostname, None, type=socket.SOCK_STREAM)
+    except socket.gaierror as e:
+        raise SSRFError(f"无法解析主机名 {hostname}: {e}") from e
+    return [info[4][0] for info in infos]
+
+
+async def resolve_host(hostname: str) -> str:
+    """
+    异步解析并校验主机名，返回用于连接的 IP（解析结果中的第一个）。
+
+    解析结果按主机名缓存，并发解析同一主机名只发起一次 DNS 查询；解析失败不缓存。
+    """
+    addrs, _ = await _dns_cache.get_or_load(hostname, lambda: _resolve(hostname))
+    valid = _check_addresses(addrs)
+    if not valid:
+        raise SSRFError(f"无法解析主机名 {hostname}: 无可用地址")
+    return valid[0]
+
+
+async def validate_url_async(url: str) -> str:
+    """
+    异步校验 URL 是否安全（非内网地址），不阻塞事件循环。
+    返回校验通过的 IP；不安全时抛出 SSRFError。
+    """
+    return await resolve_host(_parse_hostname(url))
+
+
+class _PinnedNetworkBackend(httpcore.AsyncNetworkBackend):
+    """建立 TCP 连接前校验主机名，并直接连接校验通过的 IP"""
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend):
+        self._backend = backend
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[Iterable] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        ip = await resolve_host(host)
+        return await self._backend.connect_tcp(
+            ip, port, timeout=timeout, local_address=local_address, socket_options=socket_options,
+        )
+
+    async def connect_unix_socket(self, path: str, timeout: Optional[float] = None,
+                                  socket_options: Optional[Iterable] = None) -> httpcore.AsyncNetworkStream:
+        raise SSRFError("不允许连接 Unix socket")
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+class SSRFSafeTransport(httpx.AsyncHTTPTransport):
+    """
+    带 SSRF 防护和 DNS pinning 的 httpx 传输层。
+
+    连接池仍以主机名区分连接，TLS SNI 和证书校验使用原主机名，
+    只有底层 TCP 连接的目标地址替换为校验通过的 IP。
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # httpx 未公开 network_backend 参数，直接包装连接池的网络后端
+        pool = self._pool
+        pool._network_backend = _PinnedNetworkBackend(pool._network_backend)
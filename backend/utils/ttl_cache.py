@@ -0,0 +1,96 @@
+"""带有效期和并发合并（single-flight）的异步缓存
+
+- 条目在 ttl 秒内视为新鲜，直接返回
+- 同一个 key 同时有多个协程请求时，只执行一次 loader，其余协程等待同一结果
+- loader 抛出异常时不缓存，异常传递给所有等待者
+- maxsize 限制条目数，超出时淘汰最久未使用的条目
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class AsyncTTLCache(Generic[K, V]):
+    def __init__(self, ttl: float, maxsize: Optional[int] = None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        # key → (value, loaded_at 墙钟时间戳, expires_at 单调时钟)
+        self._entries: "OrderedDict[K, tuple[V, float, float]]" = OrderedDict()
+        self._inflight: dict[K, asyncio.Future] = {}
+
+    def get(self, key: K) -> Optional[tuple[V, float]]:
+        """返回未过期的 (value, loaded_at)，不存在或已过期返回 None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, loaded_at, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value, loaded_at
+
+    def set(self, key: K, value: V, loaded_at: Optional[float] = None, ttl: Optional[float] = None) -> None:
+        loaded_at = time.time() if loaded_at is None else loaded_at
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (value, loaded_at, expires_at)
+        self._entries.move_to_end(key)
+        if self.maxsize is not None:
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    async def get_or_load(self, key: K, loader: Callable[[], Awaitable[V]]) -> tuple[V, float]:
+        """
+        返回 (value, loaded_at)。
+
+        缓存新鲜时直接返回；否则执行 loader（同一 key 的并发请求共享同一次执行）。
+        loaded_at 为数据实际加载完成的时间戳（time.time()），而非本次调用时间。
+        """
+        while True:
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # 发起加载的协程被取消：若当前协程本身未被取消，则重新发起加载
+                if inflight.cancelled() and not asyncio.current_task().cancelling():
+                    continue
+                raise
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # 标记异常已读取，避免无等待者时告警
+            raise
+        else:
+            loaded_at = time.time()
+            self.set(key, value, loaded_at)
+            future.set_result((value, loaded_at))
+            return value, loaded_at
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate(self, key: Optional[K] = None) -> None:
+        """删除单个 key，或在 key 为 None 时清空缓存"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,75 @@
+"""URL 规范化 - 识别同一篇文章的不同 URL 写法
+
+同一篇文章常以多种 URL 出现：带 utm_* / spm 等跟踪参数、http 与 https、移动版与桌面版域名、
+多个新闻源转载同一链接。canonicalize() 把它们统一成一个可直接请求的规范 URL：
+- scheme、主机名转小写，去掉默认端口和 #fragment
+- 去掉跟踪参数（settings.url_tracking_params，支持 "utm_*" 前缀通配），其余参数保持原始编码并排序
+- 按域名规则（settings.url_canonical_rules）替换主机名、强制 https、额外去掉参数，例如：
+  {"m.example.com": {"host": "www.example.com", "https": true, "drop_params": ["from_app"]}}
+
+dedup_key() 在规范 URL 的基础上忽略 scheme，用于判断两个 URL 是否为同一篇文章；
+实际请求仍使用规范 URL（不会把只支持 http 的站点改成 https）。
+"""
+from typing import Optional
+from urllib.parse import unquote, urlsplit, urlunsplit
+
+from backend.config import settings
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _is_tracking(name: str, patterns: list[str]) -> bool:
+    name = name.lower()
+    for pattern in patterns:
+        if pattern.endswith("*"):
+            if name.startswith(pattern[:-1]):
+                return True
+        elif name == pattern:
+            return True
+    return False
+
+
+def canonicalize(url: str, rules: Optional[dict[str, dict]] = None,
+                 tracking_params: Optional[list[str]] = None) -> str:
+    """返回规范 URL；无法解析的 URL 原样返回"""
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if not host:
+        return url
+
+    rules = settings.url_canonical_rules if rules is None else rules
+    patterns = [p.lower() for p in (settings.url_tracking_params if tracking_params is None else tracking_params)]
+
+    rule = rules.get(host, {})
+    host = rule.get("host", host).lower()
+    if rule.get("https") and scheme == "http":
+        scheme = "https"
+        if port == 80:
+            port = None
+    drop = [p.lower() for p in rule.get("drop_params", [])]
+
+    netloc = host
+    if port is not None and port != _DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{port}"
+
+    # 逐个参数保留原始编码（不解码再编码，避免改变服务端看到的参数）
+    params = []
+    for item in parts.query.split("&"):
+        if not item:
+            continue
+        name = unquote(item.split("=", 1)[0])
+        if not _is_tracking(name, patterns) and name.lower() not in drop:
+            params.append(item)
+    params.sort()
+
+    return urlunsplit((scheme, netloc, parts.path or "/", "&".join(params), ""))
+
+
+def dedup_key(url: str) -> str:
+    """去重用的 key：规范 URL 去掉 scheme（http / https 视为同一篇）"""
+    return canonicalize(url).split("://", 1)[-1]
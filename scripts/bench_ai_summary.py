@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+AI 摘要并发基准测试
+
+用固定延迟的假 API 模拟通义千问往返时间，对比：
+- 旧实现：在协程中直接调用同步 Generation.call（阻塞事件循环，N 篇 ≈ N 次往返）
+- 新实现：AioGeneration 异步调用 + 全局并发限制（N 篇 ≈ N/并发数 次往返）
+
+用法：
+    python scripts/bench_ai_summary.py [--articles 20] [--latency 0.5] [--concurrency 5]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.services import ai_summary  # noqa: E402
+
+ARTICLE_HTML = "<article>" + "".join(
+    f"<p>第{i}段：新能源行业今日发布重要政策，多家企业积极响应并公布投资计划。</p>" for i in range(20)
+) + "</article>"
+
+
+def _response():
+    return SimpleNamespace(status_code=200, output=SimpleNamespace(text="基准测试摘要"), message="")
+
+
+async def bench_blocking(n: int, latency: float) -> float:
+    """旧实现：同步调用直接跑在事件循环上"""
+    def blocking_call(**kwargs):
+        time.sleep(latency)
+        return _response()
+
+    async def one():
+        await asyncio.sleep(0)
+        return blocking_call()
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one() for _ in range(n)])
+    return time.perf_counter() - start
+
+
+async def bench_async(n: int, latency: float) -> float:
+    """新实现：generate_summary_with_ai 走 AioGeneration + 全局 Semaphore"""
+    async def fake_call(**kwargs):
+        await asyncio.sleep(latency)
+        return _response()
+
+    with patch.object(ai_summary.AioGeneration, "call", side_effect=fake_call):
+        start = time.perf_counter()
+        await asyncio.gather(*[ai_summary.generate_summary_with_ai(ARTICLE_HTML) for _ in range(n)])
+        return time.perf_counter() - start
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.5, help="模拟单次 API 往返耗时（秒）")
+    parser.add_argument("--concurrency", type=int, default=5)
+    args = parser.parse_args()
+
+    ai_summary.settings.dashscope_api_key = ai_summary.settings.dashscope_api_key or "bench-key"
+    ai_summary.settings.ai_summary_concurrency = args.concurrency
+    ai_summary._llm_semaphore = None
+
+    n, lat, c = args.articles, args.latency, args.concurrency
+    print(f"文章数={n} 单次往返={lat:.2f}s 并发上限={c}")
+
+    t_old = await bench_blocking(n, lat)
+    print(f"旧实现（阻塞调用）: {t_old:6.2f}s ≈ {t_old / lat:5.1f} 次往返（理论 {n}）")
+
+    t_new = await bench_async(n, lat)
+    print(f"新实现（异步+限流）: {t_new:6.2f}s ≈ {t_new / lat:5.1f} 次往返（理论 {-(-n // c)}）")
+    print(f"加速比: {t_old / t_new:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+采集阶段数据库等待时间基准（50 个源的合成采集）
+
+列表页请求用固定延迟的假响应代替，SeenArticle 表预先写入 --seen 条记录（临时 SQLite 文件）。对比：
+- 旧方式：每个源采集完列表页后各自对共享 session 做一次 IN 查询。
+  同一个 AsyncSession 不支持并发操作，这里用一把锁让它们排队（这是共享 session 能达到的最好情况），
+  统计各源花在等锁 + 查询上的时间总和
+- 新方式：crawl_sources 并发采集期间不访问 session，采集结束后一次查询过滤所有源的候选
+
+用法：
+    python scripts/bench_crawl_db.py [--sources 50] [--links 40] [--seen 20000] [--latency 0.05]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from backend.database import Base  # noqa: E402
+from backend.models.seen_article import SeenArticle, url_hash  # noqa: E402
+from backend.services import news_crawler  # noqa: E402
+
+
+def _article_url(source: int, i: int) -> str:
+    return f"https://news{source}.example.com/article/{i:05d}.html"
+
+
+def _list_page(source: int, n: int) -> bytes:
+    links = "".join(f'<a href="{_article_url(source, i)}">第 {i} 条行业新闻标题</a>' for i in range(n))
+    return f"<html><body>{links}</body></html>".encode("utf-8")
+
+
+async def _run(args) -> None:
+    tmpdir = tempfile.mkdtemp()
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmpdir}/bench.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        # 每个源的前一半链接已推送过，其余为历史填充数据
+        rows = [
+            {"url_hash": url_hash(_article_url(s, i)), "url": _article_url(s, i), "title": ""}
+            for s in range(args.sources) for i in range(args.links // 2)
+        ]
+        rows += [
+            {"url_hash": url_hash(f"https://old.example.com/{i}"), "url": f"https://old.example.com/{i}", "title": ""}
+            for i in range(max(0, args.seen - len(rows)))
+        ]
+        await conn.execute(insert(SeenArticle), rows)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    sources = [
+        {"id": None, "url": f"https://news{s}.example.com/list", "name": f"源{s}", "weight": 5,
+         "keywords": None, "link_selector": "a", "language": "zh"}
+        for s in range(args.sources)
+    ]
+    pages = {src["url"]: _list_page(s, args.links) for s, src in enumerate(sources)}
+
+    async def fake_fetch(client, url, stats=None, **kwargs):
+        await asyncio.sleep(args.latency)
+        return pages[url], "utf-8"
+
+    # 旧方式：每个源在共享 session 上各查一次，排队等待
+    lock = asyncio.Lock()
+    old_wait = 0.0
+
+    async def old_collect(db, source):
+        nonlocal old_wait
+        candidates = await news_crawler._collect_candidates(None, source)
+        start = time.perf_counter()
+        async with lock:
+            by_hash = {url_hash(c.url): c.url for c in candidates}
+            result = await db.execute(
+                select(SeenArticle.url_hash).where(SeenArticle.url_hash.in_(list(by_hash)))
+            )
+            seen = {by_hash[row[0]] for row in result}
+        old_wait += time.perf_counter() - start
+        return [c for c in candidates if c.url not in seen]
+
+    with patch.object(news_crawler, "_fetch_page_bytes", side_effect=fake_fetch):
+        async with factory() as db:
+            start = time.perf_counter()
+            old = await asyncio.gather(*[old_collect(db, s) for s in sources])
+            old_total = time.perf_counter() - start
+
+        # 新方式：采集结束后一次查询
+        async def fake_summary(client, url, **kwargs):
+            return kwargs.get("original_title", ""), ""
+
+        new_wait = 0.0
+        queries = 0
+
+        async with factory() as db:
+            execute = db.execute
+
+            async def timed_execute(*a, **kw):
+                nonlocal new_wait, queries
+                start = time.perf_counter()
+                try:
+                    return await execute(*a, **kw)
+                finally:
+                    new_wait += time.perf_counter() - start
+                    queries += 1
+
+            with patch.object(db, "execute", side_effect=timed_execute), \
+                    patch.object(news_crawler, "_fetch_article_summary", side_effect=fake_summary):
+                start = time.perf_counter()
+                items = await news_crawler.crawl_sources(sources, db, detect_changes=False)
+                new_total = time.perf_counter() - start
+
+    await engine.dispose()
+
+    print(f"源数={args.sources}  每源链接={args.links}  SeenArticle 行数={max(args.seen, args.sources * args.links // 2)}"
+          f"  列表页延迟={args.latency * 1000:.0f}ms")
+    print(f"旧方式（每源一次查询，共享 session 排队）: 查询 {args.sources:4d} 次  "
+          f"DB 等待合计 {old_wait * 1000:8.1f} ms  总耗时 {old_total * 1000:8.1f} ms  未推送 {sum(map(len, old))}")
+    print(f"新方式（采集结束后一次查询）          : 查询 {queries:4d} 次  "
+          f"DB 等待合计 {new_wait * 1000:8.1f} ms  总耗时 {new_total * 1000:8.1f} ms  未推送 {len(items)}"
+          "（含剪枝和详情页阶段）")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sources", type=int, default=50)
+    parser.add_argument("--links", type=int, default=40, help="每个列表页的链接数")
+    parser.add_argument("--seen", type=int, default=20000, help="SeenArticle 表总行数")
+    parser.add_argument("--latency", type=float, default=0.05, help="模拟列表页请求耗时（秒）")
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
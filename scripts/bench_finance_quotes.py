@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+晚报行情获取基准测试：逐项下载全市场快照 vs 每个市场只下载一次
+
+用本地生成的假快照（与 stock_zh_a_spot_em 行数、列数相当）替换 AKShare 接口，
+模拟网络延迟，分别在独立子进程中运行两种实现，对比耗时和峰值 RSS。
+
+用法：
+    python scripts/bench_finance_quotes.py [--industries 5] [--stocks 10] [--latency 0.3]
+"""
+import argparse
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+MARKET_ROWS = 5500
+EXTRA_COLUMNS = 20
+
+
+def _fake_snapshot(latency: float) -> pd.DataFrame:
+    """模拟一次全市场快照下载：网络延迟 + 新分配的大表"""
+    time.sleep(latency)
+    rng = np.random.default_rng()
+    data = {
+        "代码": [f"{i:06d}" for i in range(MARKET_ROWS)],
+        "名称": [f"股票{i}" for i in range(MARKET_ROWS)],
+        "最新价": rng.uniform(1, 500, MARKET_ROWS),
+        "涨跌幅": rng.uniform(-10, 10, MARKET_ROWS),
+    }
+    for c in range(EXTRA_COLUMNS):
+        data[f"字段{c}"] = rng.uniform(0, 1, MARKET_ROWS)
+    return pd.DataFrame(data)
+
+
+def _items(industries: int, stocks: int) -> list[dict]:
+    return [
+        {"symbol": f"{(ind * stocks + s) * 7 % MARKET_ROWS:06d}", "name": "", "item_type": "stock"}
+        for ind in range(industries) for s in range(stocks)
+    ]
+
+
+async def _run_legacy(items: list[dict], latency: float) -> int:
+    """旧实现：每个数据项在默认线程池里各自下载一次全市场快照"""
+    def fetch_one(symbol: str):
+        df = _fake_snapshot(latency)
+        row = df[df["代码"] == symbol]
+        return None if row.empty else float(row.iloc[0]["最新价"])
+
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(*[loop.run_in_executor(None, fetch_one, i["symbol"]) for i in items])
+    return sum(1 for r in results if r is not None)
+
+
+async def _run_batched(items: list[dict], latency: float) -> int:
+    """新实现：finance_crawler.fetch_quotes（每个市场一次快照）"""
+    from unittest.mock import patch
+    from backend.services import finance_crawler
+
+    with patch.object(finance_crawler.ak, "stock_zh_a_spot_em", side_effect=lambda: _fake_snapshot(latency)):
+        quotes = await finance_crawler.fetch_quotes(items)
+    return len(quotes)
+
+
+def _child(mode: str, industries: int, stocks: int, latency: float) -> None:
+    # 两种模式都先导入 akshare 等依赖，保证 RSS 基线一致
+    from backend.services import finance_crawler  # noqa: F401
+
+    items = _items(industries, stocks)
+    runner = _run_legacy if mode == "legacy" else _run_batched
+    start = time.perf_counter()
+    count = asyncio.run(runner(items, latency))
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # Linux 单位为 KB
+    print(f"{elapsed:.3f} {peak_kb} {count}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--industries", type=int, default=5)
+    parser.add_argument("--stocks", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.3, help="模拟单次快照下载耗时（秒）")
+    parser.add_argument("--child", choices=["legacy", "batched"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child, args.industries, args.stocks, args.latency)
+        return
+
+    n = args.industries * args.stocks
+    print(f"数据项={n}（{args.industries} 个行业 × {args.stocks} 只股票），快照 {MARKET_ROWS} 行，延迟 {args.latency}s")
+    for mode, label in (("legacy", "旧实现（逐项下载）"), ("batched", "新实现（按市场批量）")):
+        out = subprocess.run(
+            [sys.executable, __file__, "--child", mode,
+             "--industries", str(args.industries), "--stocks", str(args.stocks), "--latency", str(args.latency)],
+            capture_output=True, text=True, check=True,
+        ).stdout.split()
+        elapsed, peak_kb, count = float(out[0]), int(out[1]), int(out[2])
+        print(f"{label}: 耗时 {elapsed:6.2f}s  峰值 RSS {peak_kb / 1024:7.1f} MB  成功 {count}/{n}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+HTML 解析后端微基准（bs4 html.parser vs selectolax）
+
+用合成的列表页 / 详情页（接近真实站点的体量），分别测量以下函数在两种后端下的单次耗时：
+- _extract_links           列表页链接提取
+- extract_document         详情页解析（AI 摘要和降级摘要共用）
+- 健康检查选择器匹配        parse_html(...).select(selector)
+
+输入均为 UTF-8 原始字节（与采集时一致）。
+
+用法：
+    python scripts/bench_html_parser.py [--links 300] [--paragraphs 60] [--repeat 50]
+"""
+import argparse
+import os
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.services.article_extractor import extract_document  # noqa: E402
+from backend.services.news_crawler import _extract_links  # noqa: E402
+from backend.utils import html_parser  # noqa: E402
+
+_BOILERPLATE = (
+    "<head><title>新闻中心</title><style>" + "body{margin:0}" * 200 + "</style>"
+    "<script>" + "var x=1;" * 500 + "</script></head>"
+    "<header><nav>" + "".join(f'<a href="/c{i}">栏目{i}</a>' for i in range(40)) + "</nav></header>"
+)
+
+
+def _list_page(n: int) -> bytes:
+    items = "".join(
+        f'<li><span class="date">2024-05-{i % 28 + 1:02d}</span>'
+        f'<a href="/news/2024/{i:05d}.html" title="新闻标题{i}">第 {i} 条行业新闻：储能与光伏市场最新动态</a></li>'
+        for i in range(n)
+    )
+    html = f'<html>{_BOILERPLATE}<body><div class="news-list"><ul>{items}</ul></div><footer>版权所有</footer></body></html>'
+    return html.encode("utf-8")
+
+
+def _article_page(n: int) -> bytes:
+    paras = "".join(
+        f"<p>　　第 {i} 段：国家能源局发布数据显示，前三季度全国可再生能源发电量同比增长，"
+        f"<a href='/k{i}'>相关链接</a>行业专家认为市场需求仍将稳步增长。</p>"
+        for i in range(n)
+    )
+    html = (
+        f'<html>{_BOILERPLATE}<body><div class="sidebar">' + "<p>推荐阅读</p>" * 30 + "</div>"
+        f'<div class="article-content"><h1>标题</h1>{paras}</div>'
+        f'<footer><p>版权所有 © 2024</p></footer></body></html>'
+    )
+    return html.encode("utf-8")
+
+
+def _bench(func, repeat: int) -> float:
+    func()  # 预热
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--links", type=int, default=300, help="列表页链接数")
+    parser.add_argument("--paragraphs", type=int, default=60, help="详情页段落数")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    if html_parser.LexborHTMLParser is None:
+        print("未安装 selectolax，无法对比（pip install selectolax）")
+        return
+
+    list_page = _list_page(args.links)
+    article = _article_page(args.paragraphs)
+    print(f"列表页 {len(list_page) / 1024:.0f} KB（{args.links} 链接）  "
+          f"详情页 {len(article) / 1024:.0f} KB（{args.paragraphs} 段）  重复 {args.repeat} 次")
+
+    cases = {
+        "_extract_links": lambda: _extract_links(list_page, "https://news.example.com/", ".news-list a", "utf-8"),
+        "extract_document": lambda: extract_document(article, "utf-8"),
+        "健康检查 select": lambda: html_parser.parse_html(list_page, "utf-8").select(".news-list a"),
+    }
+
+    print(f"{'函数':<24}{'bs4 (ms)':>12}{'selectolax (ms)':>18}{'加速':>8}")
+    for name, func in cases.items():
+        with patch.object(html_parser.settings, "html_parser", "bs4"):
+            slow = _bench(func, args.repeat)
+        with patch.object(html_parser.settings, "html_parser", "auto"):
+            fast = _bench(func, args.repeat)
+        print(f"{name:<24}{slow * 1000:>12.2f}{fast * 1000:>18.2f}{slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
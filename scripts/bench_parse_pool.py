@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+HTML 解析进程池扩展性基准（50 个源的合成采集）
+
+模拟一次采集的解析阶段：每个源一个大列表页（默认约 1.5 MB）和若干篇详情页，
+全部并发交给 run_parse，对比不同 parse_workers 下的：
+- 总耗时（墙钟）
+- 事件循环最长卡顿（后台协程每 10ms 醒来一次，记录最大间隔）
+
+parse_workers=0 为在事件循环内解析（基线）。进程池启动耗时单独预热，不计入结果。
+
+用法：
+    python scripts/bench_parse_pool.py [--sources 50] [--links 6000] [--articles 5] [--workers 0,1,2,4]
+                                       [--parser auto|bs4]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.services.article_extractor import extract_document  # noqa: E402
+from backend.services.news_crawler import _extract_links  # noqa: E402
+from backend.utils import parse_pool  # noqa: E402
+from backend.utils.html_parser import default_backend  # noqa: E402
+
+
+def _list_page(source: int, n: int) -> bytes:
+    items = "".join(
+        f'<li><span class="date">2024-05-{i % 28 + 1:02d}</span>'
+        f'<a href="/s{source}/news/{i:05d}.html">第 {i} 条行业新闻：储能与光伏市场最新动态</a></li>'
+        for i in range(n)
+    )
+    return f'<html><body><div class="news-list"><ul>{items}</ul></div></body></html>'.encode("utf-8")
+
+
+def _article_page(n: int) -> bytes:
+    paras = "".join(
+        f"<p>　　第 {i} 段：国家能源局发布数据显示，前三季度全国可再生能源发电量同比增长，"
+        f"行业专家认为市场需求仍将稳步增长。</p>"
+        for i in range(n)
+    )
+    return f'<html><body><div class="article-content">{paras}</div></body></html>'.encode("utf-8")
+
+
+async def _run(lists: list[bytes], articles: list[bytes]) -> tuple[float, float]:
+    """返回 (总耗时, 事件循环最长卡顿)"""
+    stop = asyncio.Event()
+    max_gap = 0.0
+
+    async def ticker() -> None:
+        nonlocal max_gap
+        last = time.perf_counter()
+        while not stop.is_set():
+            await asyncio.sleep(0.01)
+            now = time.perf_counter()
+            max_gap = max(max_gap, now - last - 0.01)
+            last = now
+
+    tick = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(
+        *[parse_pool.run_parse(_extract_links, page, "https://news.example.com/", ".news-list a", "utf-8",
+                               size=len(page)) for page in lists],
+        *[parse_pool.run_parse(extract_document, page, "utf-8", size=len(page)) for page in articles],
+    )
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await tick
+    return elapsed, max_gap
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sources", type=int, default=50)
+    parser.add_argument("--links", type=int, default=6000, help="每个列表页的链接数（6000 约 1.5 MB）")
+    parser.add_argument("--articles", type=int, default=5, help="每个源的详情页数")
+    parser.add_argument("--workers", default="0,1,2,4", help="逗号分隔的进程数列表")
+    parser.add_argument("--parser", default="auto", choices=["auto", "bs4"])
+    args = parser.parse_args()
+
+    os.environ["HTML_PARSER"] = args.parser  # 子进程（spawn）从环境变量读取配置
+    lists = [_list_page(i, args.links) for i in range(args.sources)]
+    articles = [_article_page(400) for _ in range(args.sources * args.articles)]
+    total_mb = (sum(map(len, lists)) + sum(map(len, articles))) / 1024 / 1024
+
+    with patch.object(parse_pool.settings, "html_parser", args.parser):
+        print(f"解析后端={default_backend()}  CPU 核数={os.cpu_count()}  "
+              f"列表页 {len(lists)} 个（各 {len(lists[0]) / 1024:.0f} KB） 详情页 {len(articles)} 个  共 {total_mb:.0f} MB")
+        print(f"{'parse_workers':>14}{'总耗时 (s)':>12}{'加速':>8}{'循环最长卡顿 (ms)':>20}")
+
+        baseline = None
+        for workers in [int(w) for w in args.workers.split(",")]:
+            with patch.multiple(parse_pool.settings, parse_workers=workers, parse_offload_min_bytes=0):
+                if workers > 0:
+                    # 预热：启动全部子进程并完成 import
+                    asyncio.run(_run(lists[:workers] * 2, []))
+                elapsed, stall = asyncio.run(_run(lists, articles))
+                parse_pool.shutdown()
+            baseline = baseline or elapsed
+            print(f"{workers:>14}{elapsed:>12.2f}{baseline / elapsed:>7.1f}x{stall * 1000:>20.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+SeenArticle 表结构基准：url 唯一索引（旧） vs 64 位 URL 哈希主键（新）
+
+分别在临时 SQLite 文件中写入 --rows 条记录，对比：
+- 写入吞吐（每批 --batch 条，一个事务）
+- VACUUM 后的数据库文件大小
+- IN 查询延迟（每次 --in-size 个 URL，一半已存在）
+
+用法：
+    python scripts/bench_seen_article_schema.py [--rows 1000000] [--batch 10000] [--in-size 500] [--queries 200]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy.dialects import sqlite as sqlite_dialect  # noqa: E402
+from sqlalchemy.schema import CreateTable  # noqa: E402
+
+from backend.models.seen_article import SeenArticle, url_hash  # noqa: E402
+
+# 迁移前的表结构（自增 id + url 唯一索引）
+_OLD_DDL = [
+    "CREATE TABLE seen_article (id INTEGER NOT NULL PRIMARY KEY, url VARCHAR(1000) NOT NULL, "
+    "title VARCHAR(500) NOT NULL, source_id INTEGER, first_seen_at DATETIME DEFAULT (CURRENT_TIMESTAMP))",
+    "CREATE UNIQUE INDEX ix_seen_article_url ON seen_article (url)",
+]
+_NEW_DDL = [str(CreateTable(SeenArticle.__table__).compile(dialect=sqlite_dialect.dialect()))]
+
+
+def _url(i: int) -> str:
+    # 打乱编号顺序：真实链接按写入顺序并不单调，避免 URL 索引得到顺序追加的优势
+    n = i * 2654435761 % 4294967296
+    return f"https://www.example-news-site.com.cn/html/2024/industry/{n % 997:04d}/content_{n:010d}.shtml"
+
+
+def _bench(name: str, ddl: list[str], hashed: bool, args) -> None:
+    path = os.path.join(tempfile.mkdtemp(), f"{name}.db")
+    conn = sqlite3.connect(path)
+    for stmt in ddl:
+        conn.execute(stmt)
+
+    if hashed:
+        insert = "INSERT INTO seen_article (url_hash, url, title, first_seen_at) VALUES (?, ?, '', CURRENT_TIMESTAMP)"
+    else:
+        insert = "INSERT INTO seen_article (url, title, first_seen_at) VALUES (?, '', CURRENT_TIMESTAMP)"
+
+    start = time.perf_counter()
+    for lo in range(0, args.rows, args.batch):
+        urls = [_url(i) for i in range(lo, min(lo + args.batch, args.rows))]
+        with conn:
+            conn.executemany(insert, [(url_hash(u), u) for u in urls] if hashed else [(u,) for u in urls])
+    insert_rate = args.rows / (time.perf_counter() - start)
+
+    conn.execute("VACUUM")
+    size_mb = os.path.getsize(path) / 1024 / 1024
+
+    rng = random.Random(0)
+    placeholders = ",".join("?" * args.in_size)
+    if hashed:
+        query = f"SELECT url_hash FROM seen_article WHERE url_hash IN ({placeholders})"
+    else:
+        query = f"SELECT url FROM seen_article WHERE url IN ({placeholders})"
+    latencies = []
+    for _ in range(args.queries):
+        urls = [_url(rng.randrange(args.rows)) for _ in range(args.in_size // 2)]
+        urls += [_url(args.rows + rng.randrange(args.rows)) for _ in range(args.in_size - len(urls))]
+        params = [url_hash(u) for u in urls] if hashed else urls
+        start = time.perf_counter()
+        conn.execute(query, params).fetchall()
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+    latencies.sort()
+    print(f"{name:28s}: 写入 {insert_rate:10.0f} 行/s  文件 {size_mb:7.1f} MB  "
+          f"IN({args.in_size}) 中位 {latencies[len(latencies) // 2] * 1000:6.2f} ms  "
+          f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:6.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=10_000)
+    parser.add_argument("--in-size", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"行数={args.rows}  批大小={args.batch}  URL 平均长度={sum(len(_url(i)) for i in range(1000)) // 1000}")
+    _bench("旧：url 唯一索引", _OLD_DDL, False, args)
+    _bench("新：url_hash 主键", _NEW_DDL, True, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+已推送 URL 索引基准：内存占用、误判率、节省的查库次数
+
+临时 SQLite 中写入 --seen 条 SeenArticle（其中 --recent-ratio 比例在近期窗口内），
+再用 --candidates 个候选 URL（其中 --seen-ratio 比例为已推送）调用 seen_index.classify，
+统计免查库的比例和布隆过滤器实测误判率。
+
+用法：
+    python scripts/bench_seen_index.py [--seen 30000] [--recent-ratio 0.3]
+                                       [--candidates 20000] [--seen-ratio 0.05]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from backend.database import Base  # noqa: E402
+from backend.models.seen_article import SeenArticle, url_hash  # noqa: E402
+from backend.services import seen_index as seen_index_module  # noqa: E402
+
+
+async def _run(args) -> None:
+    tmpdir = tempfile.mkdtemp()
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmpdir}/bench.db")
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    n_recent = int(args.seen * args.recent_ratio)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[SeenArticle.__table__])
+        urls = [f"https://news.example.com/seen/{i}" for i in range(args.seen)]
+        await conn.execute(insert(SeenArticle), [
+            {"url_hash": url_hash(url), "url": url, "title": "",
+             "first_seen_at": now if i < n_recent else now - timedelta(days=5)}
+            for i, url in enumerate(urls)
+        ])
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    n_seen = int(args.candidates * args.seen_ratio)
+    candidates = [f"https://news.example.com/seen/{i * args.seen // max(1, n_seen)}" for i in range(n_seen)]
+    candidates += [f"https://news.example.com/new/{i}" for i in range(args.candidates - n_seen)]
+    seen_urls = set(candidates[:n_seen])
+
+    with patch.object(seen_index_module, "AsyncSessionLocal", factory), \
+            patch.object(seen_index_module.settings, "seen_index_enabled", True):
+        index = seen_index_module.SeenIndex()
+        start = time.perf_counter()
+        await index.ensure_loaded()
+        load_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        _, to_check = await index.classify(candidates)
+        classify_us = (time.perf_counter() - start) / len(candidates) * 1e6
+        index.record_db_result(to_check, {u for u in to_check if u in seen_urls})
+
+    await engine.dispose()
+
+    s = index.stats
+    negatives = args.candidates - n_seen
+    print(f"SeenArticle={args.seen}（近期 {n_recent}）  候选={args.candidates}（已推送 {n_seen}）")
+    print(f"加载耗时        : {load_ms:8.1f} ms")
+    print(f"内存占用        : {index.memory_bytes() / 1024:8.1f} KB（布隆过滤器 {index._bloom.nbytes / 1024:.1f} KB，"
+          f"{index._bloom.num_hashes} 个哈希函数）")
+    print(f"判定耗时        : {classify_us:8.2f} µs/URL")
+    print(f"免查库          : {s.definite_misses + s.recent_hits} / {s.lookups}（{s.saved_rate * 100:.1f}%）")
+    print(f"误判率（实测）  : {s.false_positives / negatives * 100 if negatives else 0:.3f}%"
+          f"（估计 {index._bloom.estimated_error_rate() * 100:.3f}%）")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seen", type=int, default=30000, help="SeenArticle 行数")
+    parser.add_argument("--recent-ratio", type=float, default=0.3, help="近期窗口内的比例")
+    parser.add_argument("--candidates", type=int, default=20000, help="候选 URL 数")
+    parser.add_argument("--seen-ratio", type=float, default=0.05, help="候选中已推送的比例")
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
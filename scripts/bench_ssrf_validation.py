@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+SSRF 校验单 URL 开销微基准（冷缓存 / 热缓存）
+
+用固定延迟的假 DNS 解析模拟慢速解析器，对比：
+- validate_url（同步，每次都阻塞解析）
+- validate_url_async 冷缓存（首次解析该主机名）
+- validate_url_async 热缓存（命中 DNS 缓存）
+
+用法：
+    python scripts/bench_ssrf_validation.py [--urls 500] [--hosts 20] [--dns-latency 0.02]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.utils import ssrf_protection  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--urls", type=int, default=500)
+    parser.add_argument("--hosts", type=int, default=20)
+    parser.add_argument("--dns-latency", type=float, default=0.02, help="模拟单次 DNS 解析耗时（秒）")
+    args = parser.parse_args()
+
+    urls = [f"https://news{i % args.hosts}.example.com/article/{i}" for i in range(args.urls)]
+    latency = args.dns_latency
+
+    def slow_getaddrinfo(host, *a, **kw):
+        time.sleep(latency)
+        return [(None, None, None, None, ("93.184.216.34", 0))]
+
+    async def slow_resolve(host):
+        await asyncio.sleep(latency)
+        return ["93.184.216.34"]
+
+    print(f"URL 数={args.urls}  主机数={args.hosts}  DNS 延迟={latency * 1000:.0f}ms")
+
+    with patch.object(ssrf_protection.socket, "getaddrinfo", side_effect=slow_getaddrinfo):
+        start = time.perf_counter()
+        for url in urls[:args.hosts]:
+            ssrf_protection.validate_url(url)
+        per_url = (time.perf_counter() - start) / args.hosts
+        print(f"validate_url（同步阻塞）        : {per_url * 1e6:10.1f} µs/URL")
+
+    async def run_async() -> None:
+        ssrf_protection._dns_cache.invalidate()
+        with patch.object(ssrf_protection, "_resolve", side_effect=slow_resolve):
+            start = time.perf_counter()
+            for url in urls[:args.hosts]:
+                await ssrf_protection.validate_url_async(url)
+            cold = (time.perf_counter() - start) / args.hosts
+
+            start = time.perf_counter()
+            for url in urls:
+                await ssrf_protection.validate_url_async(url)
+            warm = (time.perf_counter() - start) / len(urls)
+
+            ssrf_protection._dns_cache.invalidate()
+            start = time.perf_counter()
+            await asyncio.gather(*[ssrf_protection.validate_url_async(u) for u in urls])
+            concurrent = time.perf_counter() - start
+
+        print(f"validate_url_async 冷缓存      : {cold * 1e6:10.1f} µs/URL（不阻塞事件循环）")
+        print(f"validate_url_async 热缓存      : {warm * 1e6:10.1f} µs/URL")
+        print(f"并发校验 {len(urls)} 个 URL（冷缓存）: {concurrent * 1000:8.1f} ms（同一主机名只解析一次）")
+
+    asyncio.run(run_async())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""测试共用的数据库 fixture
+
+db_engine / session_factory 使用内存 SQLite，避免读写真实数据库。默认建好全部表，
+可用 @pytest.mark.db_tables(表, ...) 只建指定的表（不带参数时不建表，例如测试旧表结构的迁移）。
+
+需要让某个模块的 AsyncSessionLocal 指向测试数据库时，在测试文件中覆盖 session_factory 并只 patch 该模块：
+
+    @pytest.fixture
+    def session_factory(session_factory):
+        with patch.object(candidate_store, "AsyncSessionLocal", session_factory):
+            yield session_factory
+"""
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from backend.database import Base
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "db_tables(*tables): db_engine 只创建指定的表")
+
+
+@pytest_asyncio.fixture
+async def db_engine(request):
+    marker = request.node.get_closest_marker("db_tables")
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        if marker is None:
+            await conn.run_sync(Base.metadata.create_all)
+        elif marker.args:
+            await conn.run_sync(Base.metadata.create_all, tables=list(marker.args))
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def session_factory(db_engine):
+    return async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
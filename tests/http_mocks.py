@@ -0,0 +1,45 @@
+"""测试用的 httpx 流式响应 mock：抓取统一使用 client.stream() 分块读取响应体"""
+from contextlib import asynccontextmanager
+from typing import Optional
+from unittest.mock import MagicMock
+
+
+def mock_response(
+    status_code: int = 200,
+    content: bytes = b"",
+    headers: Optional[dict] = None,
+    encoding: str = "utf-8",
+    chunks: Optional[list[bytes]] = None,
+) -> MagicMock:
+    """
+    构造流式响应：aiter_bytes() 依次产出 chunks（默认整个 content 作为一块），
+    read_chunks 记录实际被读取的块数。
+    """
+    resp = MagicMock()
+    resp.status_code = status_code
+    resp.headers = headers or {}
+    resp.encoding = encoding
+    resp.raise_for_status = MagicMock()
+    resp.read_chunks = 0
+    body = chunks if chunks is not None else ([content] if content else [])
+
+    async def aiter_bytes():
+        for chunk in body:
+            resp.read_chunks += 1
+            yield chunk
+
+    resp.aiter_bytes = aiter_bytes
+    return resp
+
+
+def mock_client(*responses: MagicMock) -> MagicMock:
+    """client.stream() 依次返回给定响应；调用参数可通过 client.stream.call_args_list 检查"""
+    pending = list(responses)
+
+    @asynccontextmanager
+    async def stream(method, url, **kwargs):
+        yield pending.pop(0)
+
+    client = MagicMock()
+    client.stream = MagicMock(side_effect=stream)
+    return client
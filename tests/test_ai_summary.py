@@ -0,0 +1,127 @@
+"""单元测试 - AI 摘要生成（异步调用、并发限制、超时）"""
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from backend.services import ai_summary
+
+ARTICLE_HTML = "<article>" + "".join(
+    f"<p>第{i}段：新能源行业今日发布重要政策，多家企业积极响应并公布投资计划。</p>" for i in range(5)
+) + "</article>"
+
+
+def _ok_response(text: str = "这是一段测试摘要"):
+    return SimpleNamespace(status_code=200, output=SimpleNamespace(text=text), message="")
+
+
+@pytest.fixture(autouse=True)
+def _ai_settings():
+    """每个测试使用独立的 Semaphore，配置假的 API key，并屏蔽持久化缓存"""
+    ai_summary._llm_semaphore = None
+    with patch.object(ai_summary.settings, "dashscope_api_key", "test-key"), \
+            patch.object(ai_summary.summary_cache, "get_cached_summary", AsyncMock(return_value=None)), \
+            patch.object(ai_summary.summary_cache, "put_cached_summary", AsyncMock()):
+        yield
+    ai_summary._llm_semaphore = None
+
+
+class TestGenerateSummaryWithAi:
+    @pytest.mark.asyncio
+    async def test_returns_summary(self):
+        async def fake_call(**kwargs):
+            return _ok_response()
+
+        with patch.object(ai_summary.AioGeneration, "call", side_effect=fake_call):
+            title, summary = await ai_summary.generate_summary_with_ai(ARTICLE_HTML, original_title="原标题")
+        assert title == "原标题"
+        assert summary == "这是一段测试摘要"
+
+    @pytest.mark.asyncio
+    async def test_respects_global_concurrency_limit(self):
+        """同时进行的 API 请求数不超过 ai_summary_concurrency"""
+        in_flight = 0
+        peak = 0
+
+        async def fake_call(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            return _ok_response()
+
+        with patch.object(ai_summary.settings, "ai_summary_concurrency", 3), \
+                patch.object(ai_summary.AioGeneration, "call", side_effect=fake_call):
+            results = await asyncio.gather(*[
+                ai_summary.generate_summary_with_ai(ARTICLE_HTML) for _ in range(10)
+            ])
+        assert peak == 3
+        assert all(summary for _, summary in results)
+
+    @pytest.mark.asyncio
+    async def test_timeout_falls_back_to_empty_summary(self):
+        async def slow_call(**kwargs):
+            await asyncio.sleep(5)
+            return _ok_response()
+
+        with patch.object(ai_summary.settings, "ai_summary_timeout", 0.05), \
+                patch.object(ai_summary.AioGeneration, "call", side_effect=slow_call):
+            title, summary = await ai_summary.generate_summary_with_ai(ARTICLE_HTML, original_title="原标题")
+        assert (title, summary) == ("原标题", "")
+
+    @pytest.mark.asyncio
+    async def test_does_not_block_event_loop(self):
+        """AI 请求进行中，事件循环上的其他协程仍能运行（同步接口用 time.sleep 模拟，直接调用会阻塞事件循环）"""
+        ticks = 0
+        ticks_when_done = []
+
+        async def ticker():
+            nonlocal ticks
+            for _ in range(20):
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        def blocking_call(**kwargs):
+            time.sleep(0.1)
+            ticks_when_done.append(ticks)
+            return _ok_response()
+
+        async def fake_call(**kwargs):
+            await asyncio.sleep(0.1)
+            ticks_when_done.append(ticks)
+            return _ok_response()
+
+        with patch.object(ai_summary.AioGeneration, "call", side_effect=fake_call), \
+                patch("dashscope.Generation.call", side_effect=blocking_call):
+            task = asyncio.create_task(ticker())
+            await ai_summary.generate_summary_with_ai(ARTICLE_HTML)
+            await task
+        # 请求完成时 ticker 已经运行了多次
+        assert len(ticks_when_done) == 1 and ticks_when_done[0] >= 3
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_api_call(self):
+        cached = AsyncMock(return_value=("缓存标题", "缓存摘要"))
+        api = AsyncMock()
+        with patch.object(ai_summary.summary_cache, "get_cached_summary", cached), \
+                patch.object(ai_summary.AioGeneration, "call", api):
+            result = await ai_summary.generate_summary_with_ai(ARTICLE_HTML, original_title="原标题")
+        assert result == ("缓存标题", "缓存摘要")
+        api.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_successful_summary_is_cached(self):
+        async def fake_call(**kwargs):
+            resp = _ok_response()
+            resp.usage = SimpleNamespace(input_tokens=300, output_tokens=50)
+            return resp
+
+        with patch.object(ai_summary.AioGeneration, "call", side_effect=fake_call):
+            await ai_summary.generate_summary_with_ai(ARTICLE_HTML, original_title="原标题")
+        put = ai_summary.summary_cache.put_cached_summary
+        put.assert_awaited_once()
+        _, title, summary, tokens = put.await_args.args
+        assert (title, summary, tokens) == ("原标题", "这是一段测试摘要", 350)
@@ -0,0 +1,113 @@
+"""单元测试 - 文章详情页解析（AI 摘要与降级摘要共用一次解析）"""
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from backend.services import article_extractor
+from backend.services.article_extractor import ArticleDocument, SummaryStream, extract_document, get_document
+from tests.http_mocks import mock_client, mock_response
+
+_PARAGRAPH = "国家能源局发布最新数据显示，今年前三季度全国可再生能源发电量同比增长显著"
+
+ARTICLE_HTML = f"""
+<html><head>
+  <title>储能新政发布</title>
+  <meta name="Description" content="  储能行业迎来政策支持  ">
+  <meta property="og:title" content="储能新政">
+  <meta charset="utf-8">
+</head><body>
+  <header><p>网站头部导航文字，应当被忽略掉的内容</p></header>
+  <div class="detail">
+    <p>{_PARAGRAPH}。</p>
+    <p>短段落</p>
+    <p>版权所有 © 2024 某某网站 保留所有权利</p>
+    <p>第二段：行业专家认为未来一段时间市场需求仍将稳步增长。</p>
+  </div>
+</body></html>
+"""
+
+
+@pytest.fixture(autouse=True)
+def clear_doc_cache():
+    article_extractor._doc_cache.invalidate()
+    yield
+    article_extractor._doc_cache.invalidate()
+
+
+class TestExtractDocument:
+    def test_title_meta_and_container(self):
+        doc = extract_document(ARTICLE_HTML)
+        assert doc.title == "储能新政发布"
+        assert doc.meta == {"description": "储能行业迎来政策支持", "og:title": "储能新政"}
+        assert doc.container == ".detail"
+        assert "网站头部导航文字，应当被忽略掉的内容" not in doc.paragraphs
+        assert "短段落" in doc.paragraphs
+
+    def test_main_text_and_summary_share_paragraphs(self):
+        doc = extract_document(ARTICLE_HTML)
+        assert doc.main_text() == f"{_PARAGRAPH}。\n\n第二段：行业专家认为未来一段时间市场需求仍将稳步增长。"
+        summary = doc.summary(30)
+        assert summary == f"{_PARAGRAPH}。"[:30] + "..."
+
+    def test_body_when_no_container(self):
+        doc = extract_document(f"<p>{_PARAGRAPH}</p>")
+        assert doc.container == ""
+        assert doc.paragraphs == [_PARAGRAPH]
+
+
+class TestSummaryStream:
+    def test_stops_once_summary_is_long_enough(self):
+        parser = SummaryStream(max_chars=20)
+        fed = 0
+        for i in range(0, len(ARTICLE_HTML), 16):
+            parser.feed(ARTICLE_HTML[i:i + 16])
+            fed = i + 16
+            if parser.done:
+                break
+        assert parser.done
+        assert fed < len(ARTICLE_HTML)
+        doc = parser.document()
+        assert doc.title == "储能新政发布"
+        assert doc.summary(20) == f"{_PARAGRAPH}。"[:20] + "..."
+
+    def test_matches_full_extraction_summary(self):
+        """跳过 header 等无关标签内的段落，完整读取时与 extract_document 的降级摘要一致"""
+        parser = SummaryStream(max_chars=500)
+        parser.feed(ARTICLE_HTML)
+        doc = parser.document()
+        assert not parser.done
+        assert "网站头部导航文字，应当被忽略掉的内容" not in doc.paragraphs
+        assert doc.summary(500) == extract_document(ARTICLE_HTML).summary(500)
+
+
+class TestGetDocument:
+    @pytest.mark.asyncio
+    async def test_same_content_parsed_once(self):
+        raw = ARTICLE_HTML.encode("utf-8")
+        with patch.object(article_extractor, "extract_document", wraps=extract_document) as spy:
+            first = await get_document(raw, "utf-8")
+            second = await get_document(raw, "utf-8")
+        assert first is second
+        assert spy.call_count == 1
+
+
+class TestFetchArticleSummary:
+    @pytest.mark.asyncio
+    async def test_fallback_reuses_parsed_document(self):
+        """AI 摘要失败时，降级摘要复用同一次解析结果"""
+        from backend.services.news_crawler import _fetch_article_summary
+
+        client = mock_client(mock_response(200, ARTICLE_HTML.encode("utf-8")))
+
+        ai = AsyncMock(return_value=("原标题", ""))
+        with patch("backend.services.news_crawler.validate_url_async"), \
+                patch("backend.services.news_crawler.settings.dashscope_api_key", "test-key"), \
+                patch("backend.services.http_cache.load", AsyncMock(return_value=None)), \
+                patch("backend.services.ai_summary.generate_summary_with_ai", ai), \
+                patch.object(article_extractor, "extract_document", wraps=extract_document) as spy:
+            title, summary = await _fetch_article_summary(client, "https://news.example.com/a/1", original_title="原标题")
+
+        assert spy.call_count == 1
+        assert isinstance(ai.call_args.args[0], ArticleDocument)
+        assert title == "原标题"
+        assert summary.startswith(_PARAGRAPH)
@@ -0,0 +1,183 @@
+"""单元测试 - 已处理候选文章存储"""
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import select
+
+from backend.models.candidate_article import CandidateArticle
+from backend.services import candidate_store
+from backend.services.candidate_store import StoredArticle
+
+
+@pytest.fixture
+def session_factory(session_factory):
+    with patch.object(candidate_store, "AsyncSessionLocal", session_factory), \
+            patch.object(candidate_store.settings, "candidate_store_days", 3):
+        yield session_factory
+
+
+class TestCandidateStore:
+    @pytest.mark.asyncio
+    async def test_save_then_load(self, session_factory):
+        async with session_factory() as db:
+            await candidate_store.save_processed(db, [
+                ("https://a.example.com/1", StoredArticle("标题一", "摘要一", "zh"), None),
+                ("https://a.example.com/2", StoredArticle("标题二", "", "zh"), None),
+            ])
+            await db.commit()
+
+        async with session_factory() as db:
+            found = await candidate_store.load_processed(
+                db, ["https://a.example.com/1", "https://a.example.com/2", "https://a.example.com/3"],
+            )
+        # 摘要为空的不保存
+        assert found == {"https://a.example.com/1": StoredArticle("标题一", "摘要一", "zh")}
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_ignored_and_evicted(self, session_factory):
+        from backend.models.seen_article import url_hash
+
+        old = candidate_store._utcnow() - timedelta(days=5)
+        async with session_factory() as db:
+            db.add(CandidateArticle(url_hash=url_hash("https://a.example.com/old"), url="https://a.example.com/old",
+                                    title="旧文章", summary="摘要", language="zh", fetched_at=old))
+            await candidate_store.save_processed(db, [
+                ("https://a.example.com/new", StoredArticle("新文章", "摘要", "zh"), None),
+            ])
+            await db.commit()
+            assert list(await candidate_store.load_processed(
+                db, ["https://a.example.com/old", "https://a.example.com/new"],
+            )) == ["https://a.example.com/new"]
+
+        assert await candidate_store.evict_processed() == 1
+        async with session_factory() as db:
+            urls = (await db.execute(select(CandidateArticle.url))).scalars().all()
+        assert urls == ["https://a.example.com/new"]
+
+    @pytest.mark.asyncio
+    async def test_disabled(self, session_factory):
+        with patch.object(candidate_store.settings, "candidate_store_days", 0):
+            async with session_factory() as db:
+                await candidate_store.save_processed(db, [
+                    ("https://a.example.com/1", StoredArticle("标题一", "摘要一", "zh"), None),
+                ])
+                await db.commit()
+                assert await candidate_store.load_processed(db, ["https://a.example.com/1"]) == {}
+
+
+class TestCrawlReusesProcessed:
+    @pytest.mark.asyncio
+    async def test_second_crawl_skips_detail_fetch(self, session_factory, tmp_path):
+        """第一次抓取过详情页但未推送的文章，第二次采集直接复用摘要，不再抓取详情页"""
+        from backend.services.news_crawler import _article_cache, crawl_sources
+
+        page = (
+            '<a href="https://news.example.com/article-2024-1">第一篇行业新闻标题</a>'
+            '<a href="https://news.example.com/article-2024-2">第二篇行业新闻标题</a>'
+        )
+        sources = [{"id": None, "url": "https://news.example.com/list", "name": "测试源", "weight": 5}]
+        detail_calls: list[str] = []
+
+        async def fake_fetch(client, url, stats=None, **kwargs):
+            return page.encode("utf-8"), "utf-8"
+
+        async def fake_summary(client, url, **kwargs):
+            detail_calls.append(url)
+            return kwargs["original_title"], f"{url} 的摘要"
+
+        with patch("backend.services.news_crawler._fetch_page_bytes", side_effect=fake_fetch), \
+                patch("backend.services.news_crawler._fetch_article_summary", side_effect=fake_summary), \
+                patch("backend.services.news_crawler.settings.seen_index_enabled", False), \
+                patch("backend.services.news_crawler.settings.crawl_list_share_ttl", 0), \
+                patch("backend.services.news_crawler.settings.crawl_article_share_ttl", 0):
+            _article_cache.invalidate()
+            async with session_factory() as db:
+                first = await crawl_sources(sources, db, detect_changes=False)
+                await db.commit()
+            async with session_factory() as db:
+                second = await crawl_sources(sources, db, detect_changes=False)
+
+        assert len(detail_calls) == 2
+        assert sorted((i.title, i.summary) for i in second) == sorted((i.title, i.summary) for i in first)
+
+
+class TestStagedFallback:
+    @pytest.mark.asyncio
+    async def test_load_staged(self, session_factory):
+        async with session_factory() as db:
+            await candidate_store.save_processed(db, [
+                ("https://a.example.com/1", StoredArticle("标题一", "摘要一", "zh"), 1),
+                ("https://a.example.com/2", StoredArticle("标题二", "摘要二", "zh"), 2),
+            ])
+            await db.commit()
+
+        since = candidate_store._utcnow() - timedelta(hours=1)
+        async with session_factory() as db:
+            assert await candidate_store.load_staged(db, [1], since) == [(1, "https://a.example.com/1", "标题一")]
+            assert await candidate_store.load_staged(db, [], since) == []
+
+    @pytest.mark.asyncio
+    async def test_load_staged_skips_rows_before_since_and_caps(self, session_factory):
+        """上次推送之前暂存的文章已参与过推送，不再作为候选；数量不超过 limit"""
+        from backend.models.seen_article import url_hash
+
+        now = candidate_store._utcnow()
+        async with session_factory() as db:
+            db.add_all([
+                CandidateArticle(url_hash=url_hash(f"https://a.example.com/{i}"), url=f"https://a.example.com/{i}",
+                                 title=f"标题{i}", summary="摘要", language="zh", source_id=1,
+                                 fetched_at=now - timedelta(hours=i))
+                for i in range(1, 6)
+            ])
+            await db.commit()
+
+        async with session_factory() as db:
+            since = now - timedelta(hours=3, minutes=30)
+            assert [url for _, url, _ in await candidate_store.load_staged(db, [1], since)] == [
+                "https://a.example.com/1", "https://a.example.com/2", "https://a.example.com/3",
+            ]
+            assert [url for _, url, _ in await candidate_store.load_staged(db, [1], since, limit=2)] == [
+                "https://a.example.com/1", "https://a.example.com/2",
+            ]
+
+    @pytest.mark.asyncio
+    async def test_failed_list_page_uses_staged(self, session_factory):
+        """预采集暂存过的源，推送时列表页请求失败，仍能用暂存的文章（不抓取详情页）"""
+        from backend.services.circuit_breaker import breaker
+        from backend.services.news_crawler import _article_cache, crawl_sources
+
+        page = '<a href="https://news.example.com/article-2024-1">第一篇行业新闻标题</a>'
+        sources = [{"id": 7, "url": "https://news.example.com/list", "name": "测试源", "weight": 5}]
+        list_ok = True
+        detail_calls: list[str] = []
+
+        async def fake_fetch(client, url, stats=None, **kwargs):
+            if not list_ok:
+                raise ConnectionError("列表页不可用")
+            return page.encode("utf-8"), "utf-8"
+
+        async def fake_summary(client, url, **kwargs):
+            detail_calls.append(url)
+            return kwargs["original_title"], "预采集的摘要"
+
+        with patch("backend.services.news_crawler._fetch_page_bytes", side_effect=fake_fetch), \
+                patch("backend.services.news_crawler._fetch_article_summary", side_effect=fake_summary), \
+                patch("backend.services.news_crawler.settings.seen_index_enabled", False), \
+                patch("backend.services.news_crawler.settings.crawl_list_share_ttl", 0), \
+                patch("backend.services.news_crawler.settings.crawl_article_share_ttl", 0):
+            _article_cache.invalidate()
+            breaker.reset()
+            since = candidate_store._utcnow() - timedelta(minutes=1)
+            async with session_factory() as db:
+                await crawl_sources(sources, db, detect_changes=False)
+                await db.commit()
+            list_ok = False
+            async with session_factory() as db:
+                # 不给出暂存起点时不补充候选
+                assert await crawl_sources(sources, db, detect_changes=False) == []
+                items = await crawl_sources(sources, db, detect_changes=False, staged_since=since)
+            breaker.reset()
+
+        assert detail_calls == ["https://news.example.com/article-2024-1"]
+        assert [(i.title, i.summary, i.source_id) for i in items] == [("第一篇行业新闻标题", "预采集的摘要", 7)]
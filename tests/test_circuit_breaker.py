@@ -0,0 +1,134 @@
+"""单元测试 - 新闻源 / 主机熔断器"""
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from backend.services import circuit_breaker
+from backend.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpen
+
+
+@pytest.fixture
+def clock():
+    """可控的墙钟时间"""
+    now = [1_000_000.0]
+    with patch.object(circuit_breaker.time, "time", lambda: now[0]), \
+            patch.object(circuit_breaker.settings, "breaker_failure_threshold", 3), \
+            patch.object(circuit_breaker.settings, "breaker_open_seconds", 60.0):
+        yield now
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold(self, clock):
+        b = CircuitBreaker()
+        for _ in range(2):
+            b.record_failure("host:a")
+        assert b.allow("host:a") and b.state("host:a") == CLOSED
+        b.record_failure("host:a", "timeout")
+        assert b.state("host:a") == OPEN
+        with pytest.raises(CircuitOpen):
+            b.check("host:a")
+
+    def test_success_resets_failure_count(self, clock):
+        b = CircuitBreaker()
+        b.record_failure("host:a")
+        b.record_failure("host:a")
+        b.record_success("host:a")
+        b.record_failure("host:a")
+        assert b.state("host:a") == CLOSED
+
+    def test_half_open_allows_single_probe(self, clock):
+        b = CircuitBreaker()
+        for _ in range(3):
+            b.record_failure("host:a")
+        clock[0] += 61
+        assert b.state("host:a") == HALF_OPEN
+        assert b.allow("host:a") and b.is_probe("host:a")
+        assert not b.allow("host:a")  # 探测进行中，其余请求仍快速失败
+
+        b.record_failure("host:a")  # 探测失败，重新打开
+        assert b.state("host:a") == OPEN
+        clock[0] += 61
+        assert b.allow("host:a")
+        b.record_success("host:a")
+        assert b.state("host:a") == CLOSED and b.snapshot() == {}
+
+    def test_seed_from_health_check(self, clock):
+        b = CircuitBreaker()
+        checked = datetime.fromtimestamp(clock[0] - 10, tz=timezone.utc).replace(tzinfo=None)
+        b.seed("source:1", 3, checked, "HTTP 404")
+        b.seed("source:2", 1, checked)
+        assert b.snapshot() == {"source:1": OPEN}
+        # 已有进程内记录时不再按数据库结果覆盖
+        b.record_success("source:1")
+        b.seed("source:1", 5, checked)
+        assert b.state("source:1") == CLOSED
+
+    def test_seed_ignores_expired_health_check(self, clock):
+        b = CircuitBreaker()
+        checked = datetime.fromtimestamp(clock[0] - 61, tz=timezone.utc).replace(tzinfo=None)
+        b.seed("source:1", 3, checked, "HTTP 404")
+        # 已过冷却期的结果不恢复，之后的请求照常重试
+        assert b.snapshot() == {} and not b.is_probe("source:1")
+
+    def test_disabled(self, clock):
+        b = CircuitBreaker()
+        with patch.object(circuit_breaker.settings, "breaker_failure_threshold", 0):
+            for _ in range(5):
+                b.record_failure("host:a")
+            assert b.allow("host:a")
+
+
+class TestCrawlFailFast:
+    @pytest.mark.asyncio
+    async def test_open_source_is_skipped_without_request(self, clock):
+        from backend.services.news_crawler import _collect_candidates
+
+        b = CircuitBreaker()
+        with patch("backend.services.news_crawler.breaker", b), \
+                patch("backend.services.news_crawler._fetch_list_page", new_callable=AsyncMock) as fetch:
+            source = {"id": 7, "url": "https://dead.example.com/list", "name": "失效源", "weight": 5}
+            b.seed("source:7", 3, None, "HTTP 404")
+            with pytest.raises(CircuitOpen):
+                await _collect_candidates(MagicMock(), source)
+            fetch.assert_not_awaited()
+
+            clock[0] += 61  # 冷却期过后探测一次，不重试
+            fetch.side_effect = httpx.ConnectError("refused")
+            with pytest.raises(httpx.ConnectError):
+                await _collect_candidates(MagicMock(), source)
+            assert fetch.await_args.kwargs["retries"] == 1
+            assert b.state("source:7") == OPEN
+
+    @pytest.mark.asyncio
+    async def test_host_opens_after_repeated_timeouts(self, clock):
+        from backend.services.news_crawler import _with_retries
+
+        attempt = AsyncMock(side_effect=httpx.ReadTimeout("timeout"))
+        with patch("backend.services.news_crawler.breaker", CircuitBreaker()), \
+                patch("backend.services.news_crawler.asyncio.sleep", new_callable=AsyncMock):
+            for _ in range(3):
+                with pytest.raises(httpx.ReadTimeout):
+                    await _with_retries("https://slow.example.com/a", attempt, retries=2)
+            assert attempt.await_count == 6
+            with pytest.raises(CircuitOpen):
+                await _with_retries("https://slow.example.com/b", attempt, retries=2)
+            assert attempt.await_count == 6
+            # 健康检查不受熔断限制
+            with pytest.raises(httpx.ReadTimeout):
+                await _with_retries("https://slow.example.com/c", attempt, retries=1, bypass_breaker=True)
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_trip_host(self, clock):
+        from backend.services.news_crawler import _with_retries
+
+        request = httpx.Request("GET", "https://x.example.com/gone")
+        attempt = AsyncMock(side_effect=httpx.HTTPStatusError(
+            "404", request=request, response=httpx.Response(404, request=request)))
+        b = CircuitBreaker()
+        with patch("backend.services.news_crawler.breaker", b):
+            for _ in range(5):
+                with pytest.raises(httpx.HTTPStatusError):
+                    await _with_retries("https://x.example.com/gone", attempt)
+        assert b.state("host:x.example.com") == CLOSED
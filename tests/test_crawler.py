@@ -4,7 +4,31 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from backend.models.seen_article import url_hash
 from backend.services.news_crawler import NewsItem, _extract_links
+from tests.http_mocks import mock_client, mock_response
+
+
+def _page_client(html: str):
+    """列表页返回 html、详情页返回空页面的 mock client"""
+    return mock_client(mock_response(200, html.encode("utf-8")), *(mock_response(200) for _ in range(10)))
+
+
+@pytest.fixture(autouse=True)
+def _isolated_http_cache(tmp_path):
+    """HTTP 缓存写到临时目录，已推送 URL 索引关闭（全部查 mock 数据库），避免测试读写 data/；
+    清空跨行业共享的文章结果和熔断状态、关闭列表页共享（同一测试中多次采集需要拿到不同的列表页）、
+    关闭已处理文章存储和负缓存（mock 数据库只应答已推送查询）"""
+    from backend.services.circuit_breaker import breaker
+    from backend.services.news_crawler import _article_cache
+    _article_cache.invalidate()
+    breaker.reset()
+    with patch("backend.services.http_cache.settings.http_cache_dir", str(tmp_path / "http_cache")), \
+            patch("backend.services.seen_index.settings.seen_index_enabled", False), \
+            patch("backend.services.news_crawler.settings.crawl_list_share_ttl", 0), \
+            patch("backend.services.candidate_store.settings.candidate_store_days", 0), \
+            patch("backend.services.negative_cache.settings.negative_cache_hours", {}):
+        yield
 
 
 # ────────────────────────────────────────
@@ -77,6 +101,15 @@ class TestExtractLinks:
         result = _extract_links(html, self.BASE_URL, "a")
         assert len(result) == 1
 
+    def test_tracking_params_are_stripped_and_deduplicated(self):
+        """只有跟踪参数或 scheme 不同的链接视为同一篇，返回规范化后的 URL"""
+        html = (
+            '<a href="/news/article-001?utm_source=wx&id=7">带跟踪参数的标题</a>'
+            '<a href="http://news.example.com/news/article-001?id=7&spm=a1">同一篇文章的转载</a>'
+        )
+        result = _extract_links(html, self.BASE_URL, "a")
+        assert result == [("带跟踪参数的标题", "https://news.example.com/news/article-001?id=7")]
+
     def test_css_selector_filters_links(self):
         """指定 CSS 选择器时只提取匹配的链接"""
         html = '''
@@ -104,112 +137,754 @@ class TestExtractLinks:
 
 
 # ────────────────────────────────────────
-# _crawl_one_source：测试新/旧文章识别
+# crawl_sources：测试新/旧文章识别
 # ────────────────────────────────────────
 
-class TestCrawlOneSource:
+def _seen_db(*seen_urls: str):
+    """只应答已推送查询的 mock session：seen_urls 视为已推送"""
+    mock_db = AsyncMock()
+    mock_result = MagicMock()
+    mock_result.__iter__ = MagicMock(return_value=iter([(url_hash(u),) for u in seen_urls]))
+    mock_db.execute = AsyncMock(return_value=mock_result)
+    mock_db.add_all = MagicMock()
+    return mock_db
+
+
+async def _crawl_page(html: str, source: dict, db) -> list[NewsItem]:
+    from backend.services.news_crawler import crawl_sources
+
+    with patch("backend.services.news_crawler.validate_url_async"), \
+            patch("backend.services.news_crawler.httpx.AsyncClient") as client_cls:
+        client_cls.return_value.__aenter__.return_value = _page_client(html)
+        return await crawl_sources([source], db, detect_changes=False)
+
+
+class TestCrawlNewArticles:
+    _SOURCE = {
+        "id": 1, "url": "https://news.example.com",
+        "name": "测试源", "weight": 5,
+        "keywords": None, "link_selector": "a",
+    }
+
     @pytest.mark.asyncio
     async def test_returns_only_new_articles(self):
         """已在 SeenArticle 表里的 URL 不应再次返回"""
-        from backend.services.news_crawler import _crawl_one_source
-
         html = '''
         <a href="https://news.example.com/new-article-today">今天的全新文章标题内容</a>
         <a href="https://news.example.com/old-article-seen">昨天已推送过的旧文章</a>
         '''
-        source = {
-            "id": 1, "url": "https://news.example.com",
-            "name": "测试源", "weight": 5,
-            "keywords": None, "link_selector": "a",
-        }
-
-        # Mock DB session：已见过 old-article
-        mock_db = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.__iter__ = MagicMock(
-            return_value=iter([("https://news.example.com/old-article-seen",)])
-        )
-        mock_db.execute = AsyncMock(return_value=mock_result)
-        mock_db.add_all = MagicMock()
-        mock_db.commit = AsyncMock()
-
-        mock_client = AsyncMock()
-        mock_resp = MagicMock()
-        mock_resp.text = html
-        mock_resp.encoding = "utf-8"
-        mock_resp.raise_for_status = MagicMock()
-        mock_client.get = AsyncMock(return_value=mock_resp)
-
-        with patch("backend.services.news_crawler.validate_url"):
-            items = await _crawl_one_source(mock_client, mock_db, source)
+        items = await _crawl_page(html, self._SOURCE, _seen_db("https://news.example.com/old-article-seen"))
 
         assert len(items) == 1
         assert "new-article-today" in items[0].url
 
     @pytest.mark.asyncio
-    async def test_saves_new_articles_to_db(self):
-        """新文章应写入 SeenArticle 表"""
-        from backend.services.news_crawler import _crawl_one_source
-
+    async def test_does_not_write_seen_articles(self):
+        """SeenArticle 写入由 scheduler 在推送成功后完成，采集时不写入"""
         html = '<a href="https://news.example.com/brand-new-article-2024">全新未见过的文章标题</a>'
-        source = {
-            "id": 1, "url": "https://news.example.com",
-            "name": "测试源", "weight": 5,
-            "keywords": None, "link_selector": "a",
-        }
-
-        mock_db = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.__iter__ = MagicMock(return_value=iter([]))  # 没有已见记录
-        mock_db.execute = AsyncMock(return_value=mock_result)
-        mock_db.add_all = MagicMock()
-        mock_db.commit = AsyncMock()
-
-        mock_client = AsyncMock()
-        mock_resp = MagicMock()
-        mock_resp.text = html
-        mock_resp.encoding = "utf-8"
-        mock_resp.raise_for_status = MagicMock()
-        mock_client.get = AsyncMock(return_value=mock_resp)
-
-        with patch("backend.services.news_crawler.validate_url"):
-            items = await _crawl_one_source(mock_client, mock_db, source)
+        mock_db = _seen_db()
+        items = await _crawl_page(html, self._SOURCE, mock_db)
 
         assert len(items) == 1
         assert items[0].source_id == 1  # source_id 应正确传递
-        # SeenArticle 写入已移至 scheduler.py（推送成功后写入），此处不再调用 db.add_all
         mock_db.add_all.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_returns_empty_when_no_new_articles(self):
         """全部链接都已见过时，返回空列表"""
-        from backend.services.news_crawler import _crawl_one_source
-
         html = '<a href="https://news.example.com/old-known-article">已知的旧文章标题内容</a>'
-        source = {
-            "id": 1, "url": "https://news.example.com",
-            "name": "测试源", "weight": 5,
-            "keywords": None, "link_selector": "a",
-        }
+        mock_db = _seen_db("https://news.example.com/old-known-article")
+        items = await _crawl_page(html, self._SOURCE, mock_db)
+
+        assert items == []
+        mock_db.add_all.assert_not_called()
+
+
+# ────────────────────────────────────────
+# 两阶段采集：列表页粗排 + 候选预算
+# ────────────────────────────────────────
+
+class TestPruneCandidates:
+    def _candidates(self, source: dict, titles: list[str]):
+        from backend.services.news_crawler import _Candidate
+        return [
+            _Candidate(source=source, title=t, url=f"{source['url']}/article-{i}", position=i)
+            for i, t in enumerate(titles)
+        ]
+
+    def test_budget_limits_candidates(self):
+        from backend.services.news_crawler import CrawlStats, _prune_candidates
+
+        source = {"url": "https://a.example.com", "name": "A", "weight": 5}
+        stats = CrawlStats()
+        kept = _prune_candidates(self._candidates(source, [f"新闻标题{i}" for i in range(20)]), budget=5, stats=stats)
+        assert len(kept) == 5
+        assert [c.position for c in kept] == [0, 1, 2, 3, 4]
+        assert stats.keyword_passed == 20
+
+    def test_keyword_rules_prune_before_fetch(self):
+        from backend.services.news_crawler import _prune_candidates
+
+        source = {"url": "https://a.example.com", "name": "A", "weight": 5, "keywords": "!广告"}
+        kept = _prune_candidates(self._candidates(source, ["广告推广内容", "正常行业新闻"]))
+        assert [c.title for c in kept] == ["正常行业新闻"]
+
+    def test_interleaves_sources_with_equal_score(self):
+        from backend.services.news_crawler import _prune_candidates
+
+        a = {"url": "https://a.example.com", "name": "A", "weight": 5}
+        b = {"url": "https://b.example.com", "name": "B", "weight": 5}
+        candidates = self._candidates(a, ["A新闻一号", "A新闻二号"]) + self._candidates(b, ["B新闻一号", "B新闻二号"])
+        kept = _prune_candidates(candidates, budget=2)
+        assert {c.source["name"] for c in kept} == {"A", "B"}
+
+    def test_industry_keywords_prefer_matching_titles(self):
+        from backend.services.news_crawler import _prune_candidates
+
+        source = {"url": "https://a.example.com", "name": "A", "weight": 5}
+        kept = _prune_candidates(self._candidates(source, ["今日天气晴朗", "原油价格上涨"]), budget=1,
+                                 industry_keywords="+原油")
+        assert kept[0].title == "原油价格上涨"
+
+    def test_english_source_kept_despite_chinese_keywords(self):
+        """英文源列表页标题未翻译，中文 +词不能在抓取前剪掉候选"""
+        from backend.services.news_crawler import _prune_candidates
+
+        source = {"url": "https://en.example.com", "name": "EN", "weight": 5, "keywords": "+原油", "language": "en"}
+        kept = _prune_candidates(self._candidates(source, ["Oil prices rise sharply", "OPEC output news"]),
+                                 industry_keywords="+原油")
+        assert [c.title for c in kept] == ["Oil prices rise sharply", "OPEC output news"]
+
+
+class TestDedupeCandidates:
+    def test_keeps_highest_weight_source(self):
+        from backend.services.news_crawler import CrawlStats, _Candidate, _dedupe_candidates
+
+        low = {"url": "https://a.example.com", "name": "A", "weight": 3}
+        high = {"url": "https://b.example.com", "name": "B", "weight": 8}
+        candidates = [
+            _Candidate(source=low, title="同一篇转载文章", url="https://x.example.com/a/1?utm_medium=feed", position=0),
+            _Candidate(source=low, title="只有A源的文章", url="https://x.example.com/a/2", position=1),
+            _Candidate(source=high, title="同一篇转载文章", url="http://x.example.com/a/1", position=5),
+        ]
+        stats = CrawlStats()
+        kept = _dedupe_candidates(candidates, stats)
+        assert [(c.source["name"], c.url) for c in kept] == [
+            ("A", "https://x.example.com/a/2"), ("B", "http://x.example.com/a/1"),
+        ]
+        assert stats.duplicate_candidates == 1
+
+
+class TestSharedArticles:
+    @pytest.mark.asyncio
+    async def test_industries_share_detail_fetch(self):
+        """两个行业同时抓取同一篇文章时只请求一次详情页，中文源各自保留列表页标题"""
+        import asyncio
+        from backend.services.news_crawler import CrawlStats, _Candidate, _fetch_candidates
+
+        calls = 0
+
+        async def fake_summary(client, url, **kwargs):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return kwargs["original_title"], "共享摘要"
+
+        a = {"url": "https://a.example.com", "name": "A", "weight": 5}
+        b = {"url": "https://b.example.com", "name": "B", "weight": 5}
+        stats_a, stats_b = CrawlStats(), CrawlStats()
+        with patch("backend.services.news_crawler._fetch_article_summary", side_effect=fake_summary):
+            items_a, items_b = await asyncio.gather(
+                _fetch_candidates(None, [_Candidate(a, "A源标题文章", "https://x.example.com/n/1?utm_source=a", 0)], stats_a),
+                _fetch_candidates(None, [_Candidate(b, "B源标题文章", "https://x.example.com/n/1", 0)], stats_b),
+            )
+
+        assert calls == 1
+        assert (items_a[0].title, items_a[0].summary) == ("A源标题文章", "共享摘要")
+        assert (items_b[0].title, items_b[0].summary) == ("B源标题文章", "共享摘要")
+        assert stats_a.shared_articles + stats_b.shared_articles == 1
+
+    @pytest.mark.asyncio
+    async def test_industries_share_list_page(self):
+        """两个行业同时采集同一个列表页：列表页和文章各只请求一次，结果分别返回给两个行业"""
+        import asyncio
+        from backend.services.news_crawler import _list_page_cache, crawl_sources
+
+        _list_page_cache.invalidate()
+        page = '<a href="https://news.example.com/article-2024-1">共同关注的行业新闻</a>'
+        fetched: list[str] = []
+
+        async def fake_fetch(client, url, stats=None, **kwargs):
+            fetched.append(url)
+            await asyncio.sleep(0.01)
+            return page.encode("utf-8"), "utf-8"
+
+        async def fake_summary(client, url, **kwargs):
+            fetched.append(url)
+            return kwargs["original_title"], "摘要"
+
+        def empty_db():
+            db = AsyncMock()
+            result = MagicMock()
+            result.__iter__ = MagicMock(return_value=iter([]))
+            db.execute = AsyncMock(return_value=result)
+            return db
+
+        sources_a = [{**_SOURCE, "id": 1, "url": "https://news.example.com/list?utm_source=a", "name": "A"}]
+        sources_b = [{**_SOURCE, "id": 2, "url": "https://news.example.com/list", "name": "B"}]
+        with patch("backend.services.news_crawler.settings.crawl_list_share_ttl", 300), \
+                patch("backend.services.news_crawler._fetch_page_bytes", side_effect=fake_fetch), \
+                patch("backend.services.news_crawler._fetch_article_summary", side_effect=fake_summary):
+            items_a, items_b = await asyncio.gather(
+                crawl_sources(sources_a, empty_db(), detect_changes=False),
+                crawl_sources(sources_b, empty_db(), detect_changes=False),
+            )
+        _list_page_cache.invalidate()
+
+        assert len(fetched) == 2
+        assert [i.source_id for i in items_a] == [1]
+        assert [i.source_id for i in items_b] == [2]
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_is_not_shared(self):
+        from backend.services.news_crawler import _Candidate, _fetch_candidates
+
+        source = {"url": "https://a.example.com", "name": "A", "weight": 5}
+        fake = AsyncMock(side_effect=[("文章标题一号", ""), ("文章标题一号", "重试后的摘要")])
+        with patch("backend.services.news_crawler._fetch_article_summary", fake):
+            first = await _fetch_candidates(None, [_Candidate(source, "文章标题一号", "https://x.example.com/n/2", 0)])
+            second = await _fetch_candidates(None, [_Candidate(source, "文章标题一号", "https://x.example.com/n/2", 0)])
+
+        assert fake.await_count == 2
+        assert first[0].summary == "" and second[0].summary == "重试后的摘要"
+
+    @pytest.mark.asyncio
+    async def test_degraded_result_is_not_shared(self):
+        """采集时长用尽时的降级摘要不共享，之后的行业重新抓取并生成 AI 摘要"""
+        from backend.services.news_crawler import CrawlStats, _Candidate, _fetch_candidates
+
+        async def fake_summary(client, url, stats=None, **kwargs):
+            if fake.await_count == 1:
+                stats.degraded_articles.add(url)
+                return kwargs["original_title"], "降级摘要"
+            return kwargs["original_title"], "AI 摘要"
+
+        fake = AsyncMock(side_effect=fake_summary)
+        source = {"url": "https://a.example.com", "name": "A", "weight": 5}
+        url = "https://x.example.com/n/3"
+        with patch("backend.services.news_crawler._fetch_article_summary", fake):
+            first = await _fetch_candidates(None, [_Candidate(source, "文章标题三号", url, 0)], CrawlStats())
+            second = await _fetch_candidates(None, [_Candidate(source, "文章标题三号", url, 0)], CrawlStats())
+
+        assert fake.await_count == 2
+        assert first[0].summary == "降级摘要" and second[0].summary == "AI 摘要"
+
+    @pytest.mark.asyncio
+    async def test_degraded_result_is_not_stored(self):
+        from backend.services.news_crawler import CrawlStats, crawl_sources
+
+        page = '<a href="https://news.example.com/article-2024-1">第一篇行业新闻标题</a>' \
+               '<a href="https://news.example.com/article-2024-2">第二篇行业新闻标题</a>'
+
+        async def fake_fetch(client, url, stats=None, **kwargs):
+            return page.encode("utf-8"), "utf-8"
+
+        async def fake_summary(client, url, stats=None, **kwargs):
+            if url.endswith("-1"):
+                stats.degraded_articles.add(url)
+            return kwargs["original_title"], "摘要"
 
         mock_db = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.__iter__ = MagicMock(
-            return_value=iter([("https://news.example.com/old-known-article",)])
-        )
-        mock_db.execute = AsyncMock(return_value=mock_result)
-        mock_db.add_all = MagicMock()
-        mock_db.commit = AsyncMock()
+        result = MagicMock()
+        result.__iter__ = MagicMock(return_value=iter([]))
+        mock_db.execute = AsyncMock(return_value=result)
+        stats = CrawlStats()
+        with patch("backend.services.news_crawler._fetch_page_bytes", side_effect=fake_fetch), \
+                patch("backend.services.news_crawler._fetch_article_summary", side_effect=fake_summary):
+            items = await crawl_sources([_SOURCE], mock_db, detect_changes=False, stats=stats, save_state=False)
 
-        mock_client = AsyncMock()
-        mock_resp = MagicMock()
-        mock_resp.text = html
-        mock_resp.encoding = "utf-8"
-        mock_resp.raise_for_status = MagicMock()
-        mock_client.get = AsyncMock(return_value=mock_resp)
+        assert len(items) == 2
+        assert [url for url, _, _ in stats.processed] == ["https://news.example.com/article-2024-2"]
 
-        with patch("backend.services.news_crawler.validate_url"):
-            items = await _crawl_one_source(mock_client, mock_db, source)
 
-        assert items == []
-        mock_db.add_all.assert_not_called()
+# ────────────────────────────────────────
+# CrawlScheduler：全局 / 按主机并发与最小间隔
+# ────────────────────────────────────────
+
+class TestCrawlScheduler:
+    async def _run(self, scheduler, urls: list[str], hold: float = 0.02):
+        import asyncio
+        from collections import Counter
+        from urllib.parse import urlparse
+
+        active: Counter = Counter()
+        peak_host: Counter = Counter()
+        peak_total = 0
+
+        async def one(url):
+            nonlocal peak_total
+            async with scheduler.slot(url):
+                host = urlparse(url).hostname
+                active[host] += 1
+                peak_host[host] = max(peak_host[host], active[host])
+                peak_total = max(peak_total, sum(active.values()))
+                await asyncio.sleep(hold)
+                active[host] -= 1
+
+        await asyncio.gather(*[one(u) for u in urls])
+        return peak_total, peak_host
+
+    @pytest.mark.asyncio
+    async def test_limits_per_host_and_globally(self):
+        from backend.services.news_crawler import CrawlScheduler
+
+        scheduler = CrawlScheduler(max_in_flight=5, per_host=2)
+        urls = [f"https://a.example.com/{i}" for i in range(10)] + [f"https://b{i}.example.com/" for i in range(10)]
+        peak_total, peak_host = await self._run(scheduler, urls)
+        assert peak_total == 5
+        assert peak_host["a.example.com"] == 2
+
+    @pytest.mark.asyncio
+    async def test_min_delay_between_requests_to_same_host(self):
+        import time
+        from backend.services.news_crawler import CrawlScheduler
+
+        scheduler = CrawlScheduler(max_in_flight=10, per_host=10, host_delays={"slow.example.com": 0.05})
+        start = time.monotonic()
+        await self._run(scheduler, [f"https://slow.example.com/{i}" for i in range(4)], hold=0)
+        assert time.monotonic() - start >= 0.15
+
+    @pytest.mark.asyncio
+    async def test_records_queue_wait_per_host(self):
+        import asyncio
+        from backend.services.news_crawler import CrawlScheduler, CrawlStats
+
+        scheduler = CrawlScheduler(max_in_flight=10, per_host=1)
+        stats = CrawlStats()
+
+        async def one(i):
+            async with scheduler.slot(f"https://a.example.com/{i}", stats):
+                await asyncio.sleep(0.02)
+
+        await asyncio.gather(*[one(i) for i in range(3)])
+        count, total, peak = stats.host_waits["a.example.com"]
+        assert count == 3
+        assert peak >= 0.04
+
+
+# ────────────────────────────────────────
+# 列表页变化检测
+# ────────────────────────────────────────
+
+def _list_client(*pages: str):
+    """依次返回给定列表页内容的 mock client"""
+    return mock_client(*(mock_response(200, html.encode("utf-8")) for html in pages))
+
+
+_SOURCE = {
+    "id": 1, "url": "https://news.example.com",
+    "name": "测试源", "weight": 5,
+    "keywords": None, "link_selector": "a",
+}
+_PAGE_V1 = '<a href="https://news.example.com/article-one-2024">第一篇文章的完整标题</a>'
+_PAGE_V2 = _PAGE_V1 + '<a href="https://news.example.com/article-two-2024">第二篇文章的完整标题</a>'
+
+
+class TestListChangeDetection:
+    @pytest.mark.asyncio
+    async def test_unchanged_page_short_circuits(self):
+        from backend.services.news_crawler import CrawlStats, _collect_candidates, _content_hash, _ListFingerprint
+
+        previous = _ListFingerprint(_content_hash(_PAGE_V1.encode("utf-8"), "a"), set())
+        stats = CrawlStats()
+        fingerprints = {}
+
+        with patch("backend.services.news_crawler.validate_url_async"):
+            result = await _collect_candidates(
+                _list_client(_PAGE_V1), _SOURCE, stats, previous, fingerprints,
+            )
+
+        assert result == []
+        assert stats.unchanged_sources == 1
+        assert fingerprints == {}  # 指纹不变，无需重写
+
+    def test_volatile_markup_ignored(self):
+        from backend.services.news_crawler import _content_hash
+
+        a = (_PAGE_V1 + '<script>var t = 1700000000;</script>\n<!-- rendered 09:00 -->').encode("utf-8")
+        b = (_PAGE_V1 + '<script>var t = 1700000999;</script>  <!-- rendered 09:05 -->').encode("utf-8")
+        assert _content_hash(a, "a") == _content_hash(b, "a")
+        assert _content_hash(a, "a") != _content_hash(a, "ul a")
+
+    @pytest.mark.asyncio
+    async def test_changed_page_returns_only_new_links(self):
+        from backend.services.news_crawler import _collect_candidates, _link_hash, _ListFingerprint
+
+        previous = _ListFingerprint("old", {_link_hash("https://news.example.com/article-one-2024")})
+        fingerprints = {}
+
+        with patch("backend.services.news_crawler.validate_url_async"):
+            result = await _collect_candidates(
+                _list_client(_PAGE_V2), _SOURCE, None, previous, fingerprints,
+            )
+
+        assert [c.url for c in result] == ["https://news.example.com/article-two-2024"]
+        assert len(fingerprints[1].link_hashes) == 2
+
+    @pytest.mark.asyncio
+    async def test_fingerprints_persist_only_on_commit(self, session_factory):
+        from backend.models.source_snapshot import SourceSnapshot
+        from backend.services.news_crawler import crawl_sources
+
+        async def fake_summary(client, url, **kwargs):
+            return kwargs.get("original_title", ""), "摘要"
+
+        client = _list_client(_PAGE_V1, _PAGE_V1, _PAGE_V1)
+        with patch("backend.services.news_crawler.validate_url_async"), \
+                patch("backend.services.news_crawler.httpx.AsyncClient") as client_cls, \
+                patch("backend.services.news_crawler._fetch_article_summary", side_effect=fake_summary):
+            client_cls.return_value.__aenter__.return_value = client
+
+            # 推送失败（未提交）：指纹不生效，下次仍返回文章
+            async with session_factory() as db:
+                assert len(await crawl_sources([_SOURCE], db)) == 1
+                await db.rollback()
+            async with session_factory() as db:
+                assert len(await crawl_sources([_SOURCE], db)) == 1
+                await db.commit()
+            # 提交后列表页未变化，直接跳过
+            async with session_factory() as db:
+                assert await crawl_sources([_SOURCE], db) == []
+                assert (await db.get(SourceSnapshot, 1)) is not None
+
+    @pytest.mark.asyncio
+    async def test_cut_off_article_returns_next_crawl(self, session_factory):
+        """到期被取消的文章不记入指纹，提交后列表页未变化也会再次返回"""
+        import asyncio
+        from backend.services.news_crawler import crawl_sources
+
+        calls = []
+
+        async def fake_summary(client, url, **kwargs):
+            calls.append(url)
+            if "article-two" in url and calls.count(url) == 1:
+                await asyncio.sleep(10)
+            return kwargs.get("original_title", ""), "摘要"
+
+        client = _list_client(_PAGE_V2, _PAGE_V2)
+        with patch("backend.services.news_crawler.validate_url_async"), \
+                patch("backend.services.news_crawler.httpx.AsyncClient") as client_cls, \
+                patch("backend.services.news_crawler._fetch_article_summary", side_effect=fake_summary), \
+                patch("backend.services.news_crawler._DEADLINE_GRACE", 0.05):
+            client_cls.return_value.__aenter__.return_value = client
+
+            async with session_factory() as db:
+                items = await crawl_sources([_SOURCE], db, time_budget=0.2)
+                await db.commit()
+            assert sorted((i.url, i.summary) for i in items) == [
+                ("https://news.example.com/article-one-2024", "摘要"),
+                ("https://news.example.com/article-two-2024", ""),
+            ]
+
+            async with session_factory() as db:
+                items = await crawl_sources([_SOURCE], db, time_budget=0.2)
+            assert [(i.url, i.summary) for i in items] == [("https://news.example.com/article-two-2024", "摘要")]
+
+    @pytest.mark.asyncio
+    async def test_no_write_lock_during_detail_phase(self, tmp_path):
+        """列表页变化时，详情页和 AI 摘要阶段其他连接（如摘要缓存）仍能写入数据库"""
+        from sqlalchemy import text
+        from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+        from backend.database import Base
+        from backend.services.news_crawler import crawl_sources
+
+        db_url = f"sqlite+aiosqlite:///{tmp_path}/app.db"
+        engine = create_async_engine(db_url)
+        other = create_async_engine(db_url, connect_args={"timeout": 0.2})
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        async def fake_summary(client, url, **kwargs):
+            async with other.begin() as conn:
+                await conn.execute(text(
+                    "INSERT INTO source_snapshot (source_id, content_hash, link_hashes) VALUES (99, 'x', '[]')"
+                ))
+            return kwargs.get("original_title", ""), "摘要"
+
+        with patch("backend.services.news_crawler.validate_url_async"), \
+                patch("backend.services.news_crawler.httpx.AsyncClient") as client_cls, \
+                patch("backend.services.news_crawler._fetch_article_summary", side_effect=fake_summary):
+            client_cls.return_value.__aenter__.return_value = _list_client(_PAGE_V1)
+            async with factory() as db:
+                items = await crawl_sources([_SOURCE], db)
+                await db.commit()
+
+        assert [i.summary for i in items] == ["摘要"]
+        await other.dispose()
+        await engine.dispose()
+
+
+class TestSessionFreeCollection:
+    @pytest.mark.asyncio
+    async def test_concurrent_collection_never_touches_session(self):
+        """并发采集期间不访问 session，已推送过滤合并为一次查询"""
+        import asyncio
+        from backend.services.news_crawler import crawl_sources
+
+        sources = [
+            {**_SOURCE, "id": i, "url": f"https://news{i}.example.com", "name": f"源{i}"}
+            for i in range(5)
+        ]
+        pages = [
+            f'<a href="https://news{i}.example.com/article-{i}-2024">第{i}篇文章的完整标题</a>'
+            for i in range(5)
+        ]
+        collecting = 0
+
+        async def fake_fetch(client, url, stats=None, **kwargs):
+            nonlocal collecting
+            collecting += 1
+            await asyncio.sleep(0.01)
+            collecting -= 1
+            i = int(url.split("news")[1].split(".")[0])
+            return pages[i].encode("utf-8"), "utf-8"
+
+        async def fake_execute(*args, **kwargs):
+            assert collecting == 0, "并发采集期间访问了 session"
+            result = MagicMock()
+            result.__iter__ = MagicMock(return_value=iter([(url_hash("https://news0.example.com/article-0-2024"),)]))
+            return result
+
+        async def fake_summary(client, url, **kwargs):
+            return kwargs.get("original_title", ""), "摘要"
+
+        mock_db = AsyncMock()
+        mock_db.execute = AsyncMock(side_effect=fake_execute)
+        with patch("backend.services.news_crawler._fetch_page_bytes", side_effect=fake_fetch), \
+                patch("backend.services.news_crawler._fetch_article_summary", side_effect=fake_summary):
+            items = await crawl_sources(sources, mock_db, detect_changes=False)
+
+        assert mock_db.execute.await_count == 1
+        assert sorted(item.source_id for item in items) == [1, 2, 3, 4]
+
+
+# ────────────────────────────────────────
+# 详情页流式读取（未启用 AI，只需要降级摘要）
+# ────────────────────────────────────────
+
+def _stream_client(chunks: list[bytes], content_type: str = "text/html; charset=utf-8"):
+    """详情页分块返回 chunks 的 mock client 及其响应（resp.read_chunks 为实际读取的块数）"""
+    resp = mock_response(200, headers={"content-type": content_type}, chunks=chunks)
+    return mock_client(resp), resp
+
+
+_LONG_PARAGRAPH = "国家能源局发布最新数据显示，今年前三季度全国可再生能源发电量同比增长显著。"
+
+
+class TestStreamArticleDocument:
+    @pytest.mark.asyncio
+    async def test_stops_reading_once_summary_collected(self):
+        from backend.services.news_crawler import CrawlStats, _stream_article_document
+
+        chunks = [f"<html><body><p>{_LONG_PARAGRAPH}</p>".encode("utf-8")]
+        chunks += [b"<p>" + "后续段落内容".encode("utf-8") * 50 + b"</p>"] * 20
+        client, resp = _stream_client(chunks)
+        stats = CrawlStats()
+
+        with patch("backend.services.news_crawler.validate_url_async"):
+            doc = await _stream_article_document(client, "https://news.example.com/a/1", 30, stats)
+
+        assert resp.read_chunks == 1
+        assert doc.summary(30) == _LONG_PARAGRAPH[:30] + "..."
+        assert stats.streams_stopped_early == 1
+        assert stats.bytes_downloaded == len(chunks[0])
+
+    @pytest.mark.asyncio
+    async def test_byte_cap(self):
+        from backend.services.news_crawler import _stream_article_document
+
+        client, resp = _stream_client([b"<p>" + b"x" * 1024] * 10)
+        with patch("backend.services.news_crawler.validate_url_async"), \
+                patch("backend.services.news_crawler.settings.summary_stream_max_bytes", 2048):
+            await _stream_article_document(client, "https://news.example.com/a/1")
+
+        assert resp.read_chunks == 2
+
+    @pytest.mark.asyncio
+    async def test_rejects_non_html_before_body(self):
+        from backend.services.news_crawler import _stream_article_document
+
+        client, resp = _stream_client([b"%PDF-1.7"], content_type="application/pdf")
+        with patch("backend.services.news_crawler.validate_url_async"), \
+                pytest.raises(ValueError):
+            await _stream_article_document(client, "https://news.example.com/a/1.pdf")
+
+        assert resp.read_chunks == 0
+
+    @pytest.mark.asyncio
+    async def test_used_only_without_ai(self):
+        from backend.services.news_crawler import _fetch_article_summary
+
+        client, _ = _stream_client([f"<p>{_LONG_PARAGRAPH}</p>".encode("utf-8")])
+        with patch("backend.services.news_crawler.validate_url_async"), \
+                patch("backend.services.news_crawler.settings.dashscope_api_key", ""):
+            title, summary = await _fetch_article_summary(
+                client, "https://news.example.com/a/1", original_title="原标题",
+            )
+
+        assert title == "原标题"
+        assert summary == _LONG_PARAGRAPH
+
+
+# ────────────────────────────────────────
+# 采集时长上限：到期取消未完成的请求，用已完成的结果继续
+# ────────────────────────────────────────
+
+class TestCrawlDeadline:
+    @pytest.mark.asyncio
+    async def test_slow_list_page_is_cut_off(self):
+        import asyncio
+        from backend.services.news_crawler import CrawlStats, crawl_sources
+
+        sources = [
+            {**_SOURCE, "id": 1, "url": "https://fast.example.com", "name": "快源"},
+            {**_SOURCE, "id": 2, "url": "https://slow.example.com", "name": "慢源"},
+        ]
+
+        async def fake_fetch(client, url, stats=None, **kwargs):
+            if "slow" in url:
+                await asyncio.sleep(10)
+            return '<a href="https://fast.example.com/article-2024-1">快源新闻标题</a>'.encode("utf-8"), "utf-8"
+
+        async def fake_summary(client, url, **kwargs):
+            return kwargs["original_title"], "摘要"
+
+        mock_db = AsyncMock()
+        result = MagicMock()
+        result.__iter__ = MagicMock(return_value=iter([]))
+        mock_db.execute = AsyncMock(return_value=result)
+        stats = CrawlStats()
+        with patch("backend.services.news_crawler._fetch_page_bytes", side_effect=fake_fetch), \
+                patch("backend.services.news_crawler._fetch_article_summary", side_effect=fake_summary):
+            items = await asyncio.wait_for(
+                crawl_sources(sources, mock_db, detect_changes=False, time_budget=0.2, stats=stats), timeout=2,
+            )
+
+        assert [i.source_id for i in items] == [1]
+        assert stats.cut_off_sources == {"慢源"}
+
+    @pytest.mark.asyncio
+    async def test_unfinished_detail_fetch_is_cancelled(self):
+        import asyncio
+        from backend.services.news_crawler import CrawlStats, _Candidate, _fetch_candidates, _loop_time
+
+        async def fake_summary(client, url, **kwargs):
+            if "slow" in url:
+                await asyncio.sleep(10)
+            return kwargs["original_title"], "摘要"
+
+        source = {"url": "https://a.example.com", "name": "A", "weight": 5}
+        stats = CrawlStats()
+        with patch("backend.services.news_crawler._fetch_article_summary", side_effect=fake_summary), \
+                patch("backend.services.news_crawler._DEADLINE_GRACE", 0.05):
+            items = await _fetch_candidates(None, [
+                _Candidate(source, "已完成的文章", "https://a.example.com/fast", 0),
+                _Candidate(source, "未完成的文章", "https://a.example.com/slow", 1),
+            ], stats, deadline=_loop_time() + 0.05)
+
+        assert [(i.title, i.summary) for i in items] == [("已完成的文章", "摘要"), ("未完成的文章", "")]
+        assert stats.cut_off_articles == 1 and stats.cut_off_sources == {"A"}
+
+    @pytest.mark.asyncio
+    async def test_slow_ai_falls_back_to_extraction(self):
+        import asyncio
+        from backend.services.news_crawler import CrawlStats, _fetch_article_summary, _loop_time
+
+        html = "<html><body><p>" + "这是一段足够长的正文内容，用于生成降级摘要。" * 5 + "</p></body></html>"
+
+        async def slow_ai(*args, **kwargs):
+            await asyncio.sleep(10)
+            return "AI 标题", "AI 摘要"
+
+        stats = CrawlStats()
+        with patch("backend.services.news_crawler.settings.dashscope_api_key", "test-key"), \
+                patch("backend.services.news_crawler._fetch_page_bytes",
+                      AsyncMock(return_value=(html.encode("utf-8"), "utf-8"))), \
+                patch("backend.services.ai_summary.generate_summary_with_ai", side_effect=slow_ai):
+            title, summary = await _fetch_article_summary(
+                None, "https://a.example.com/1", original_title="原标题", stats=stats, deadline=_loop_time() + 0.05,
+            )
+
+        assert title == "原标题"
+        assert summary.startswith("这是一段足够长的正文内容")
+        assert stats.ai_cut_off == 1
+        assert stats.degraded_articles == {"https://a.example.com/1"}
+
+
+# ────────────────────────────────────────
+# 响应体大小限制与全局下载字节预算
+# ────────────────────────────────────────
+
+class TestResponseLimits:
+    @pytest.mark.asyncio
+    async def test_oversized_body_truncated_and_not_cached(self):
+        from backend.services import http_cache
+        from backend.services.news_crawler import CrawlStats, _fetch_page_bytes
+
+        url = "https://news.example.com/huge"
+        resp = mock_response(200, headers={"etag": '"1"'}, chunks=[b"a" * 1024] * 8)
+        stats = CrawlStats()
+        with patch("backend.services.news_crawler.validate_url_async"), \
+                patch("backend.services.news_crawler.settings.crawl_max_response_bytes", 2500):
+            content, _ = await _fetch_page_bytes(mock_client(resp), url, stats=stats)
+
+        assert len(content) == 2500
+        assert resp.read_chunks == 3
+        assert stats.truncated_responses == 1
+        assert await http_cache.load(url) is None
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("headers", [
+        {"content-type": "application/octet-stream"},
+        {"content-type": "text/html", "content-length": str(50 * 1024 * 1024)},
+    ])
+    async def test_rejected_before_body(self, headers):
+        from backend.services.news_crawler import CrawlStats, ResponseRejected, _fetch_page_bytes
+
+        resp = mock_response(200, b"x" * 10, headers)
+        stats = CrawlStats()
+        with patch("backend.services.news_crawler.validate_url_async"), \
+                pytest.raises(ResponseRejected):
+            await _fetch_page_bytes(mock_client(resp), "https://news.example.com/file", stats=stats)
+
+        assert resp.read_chunks == 0
+        assert stats.rejected_responses == 1
+
+    @pytest.mark.asyncio
+    async def test_byte_budget_backpressure(self):
+        import asyncio
+        from backend.services.news_crawler import ByteBudget, CrawlStats
+
+        budget = ByteBudget(limit=300, reserve=100)
+        stats = CrawlStats()
+        first_done = asyncio.Event()
+        order = []
+
+        async def big():
+            async with budget.hold(stats) as held:
+                held.add(250)  # 超出预占额度，追加不阻塞
+                order.append("big")
+                await asyncio.sleep(0.02)
+            first_done.set()
+
+        async def small():
+            await asyncio.sleep(0.005)
+            async with budget.hold(stats):
+                order.append("small")
+                assert first_done.is_set()
+
+        await asyncio.gather(big(), small())
+        assert order == ["big", "small"]
+        assert stats.budget_waits == 1
+        assert budget.in_use == 0
@@ -0,0 +1,118 @@
+"""单元测试 - 金融数据采集（按市场批量获取快照、快照缓存）"""
+import asyncio
+import time
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from backend.services import finance_crawler
+from backend.services.finance_crawler import fetch_quotes
+
+
+def _a_share_df() -> pd.DataFrame:
+    return pd.DataFrame({
+        "代码": ["300274", "300750", "601012"],
+        "名称": ["阳光电源", "宁德时代", "隆基绿能"],
+        "最新价": [149.163, 365.341, 18.129],
+        "涨跌幅": [-4.723, -2.8, -1.951],
+        "成交量": [1, 2, 3],
+    })
+
+
+def _futures_df() -> pd.DataFrame:
+    return pd.DataFrame({
+        "代码": ["LCPT", "LALT", "XAU"],
+        "名称": ["综合铜", "综合铝", "黄金"],
+        "最新价": [12863.0, 3088.5, 0.0],
+        "涨跌幅": ["0.19%", "0.65", "0"],
+    })
+
+
+@pytest.fixture(autouse=True)
+def _clear_snapshot_cache():
+    finance_crawler._snapshot_cache.invalidate()
+    yield
+    finance_crawler._snapshot_cache.invalidate()
+
+
+class TestFetchQuotes:
+    @pytest.mark.asyncio
+    async def test_downloads_each_market_snapshot_once(self):
+        items = [
+            {"symbol": "300274", "name": "阳光电源", "item_type": "stock"},
+            {"symbol": "300750", "name": "宁德时代", "item_type": "stock"},
+            {"symbol": "601012", "name": "隆基绿能", "item_type": "stock"},
+            {"symbol": "cu2505", "name": "沪铜主力", "item_type": "futures"},
+            {"symbol": "al2505", "name": "沪铝主力", "item_type": "futures"},
+        ]
+        with patch.object(finance_crawler.ak, "stock_zh_a_spot_em", return_value=_a_share_df()) as a_api, \
+                patch.object(finance_crawler.ak, "futures_global_spot_em", return_value=_futures_df()) as f_api, \
+                patch.object(finance_crawler.ak, "stock_hk_spot_em") as hk_api:
+            quotes = await fetch_quotes(items)
+
+        assert a_api.call_count == 1
+        assert f_api.call_count == 1
+        hk_api.assert_not_called()
+        assert [q.symbol for q in quotes] == ["300274", "300750", "601012", "cu2505", "al2505"]
+        assert quotes[0].price == 149.16
+        assert quotes[0].change_pct == -4.72
+        assert quotes[3].price == 12863.0 and quotes[3].change_pct == 0.19
+        assert quotes[3].item_type == "futures"
+
+    @pytest.mark.asyncio
+    async def test_missing_symbol_and_failed_market_are_skipped(self):
+        items = [
+            {"symbol": "999999", "name": "不存在", "item_type": "stock"},
+            {"symbol": "300750", "name": "宁德时代", "item_type": "stock"},
+            {"symbol": "00700", "name": "腾讯控股", "item_type": "stock_hk"},
+        ]
+        with patch.object(finance_crawler.ak, "stock_zh_a_spot_em", return_value=_a_share_df()), \
+                patch.object(finance_crawler.ak, "stock_hk_spot_em", side_effect=RuntimeError("网络错误")):
+            quotes = await fetch_quotes(items)
+
+        assert [q.symbol for q in quotes] == ["300750"]
+
+    @pytest.mark.asyncio
+    async def test_futures_invalid_price_is_skipped(self):
+        items = [{"symbol": "XAU", "name": "黄金", "item_type": "futures"}]
+        with patch.object(finance_crawler.ak, "futures_global_spot_em", return_value=_futures_df()):
+            assert await fetch_quotes(items) == []
+
+
+class TestSnapshotCache:
+    ITEMS = [{"symbol": "300750", "name": "宁德时代", "item_type": "stock"}]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_industries_share_one_download(self):
+        calls = 0
+
+        def slow_snapshot():
+            nonlocal calls
+            calls += 1
+            time.sleep(0.05)
+            return _a_share_df()
+
+        with patch.object(finance_crawler.ak, "stock_zh_a_spot_em", side_effect=slow_snapshot):
+            results = await asyncio.gather(*[fetch_quotes(self.ITEMS) for _ in range(5)])
+            # 有效期内再次请求也直接使用缓存
+            await fetch_quotes(self.ITEMS)
+
+        assert calls == 1
+        assert all(len(r) == 1 for r in results)
+
+    @pytest.mark.asyncio
+    async def test_timestamp_is_snapshot_fetch_time(self):
+        with patch.object(finance_crawler.ak, "stock_zh_a_spot_em", return_value=_a_share_df()):
+            first = await fetch_quotes(self.ITEMS)
+            await asyncio.sleep(0.02)
+            second = await fetch_quotes(self.ITEMS)
+        assert second[0].timestamp == first[0].timestamp
+
+    @pytest.mark.asyncio
+    async def test_expired_snapshot_is_refetched(self):
+        with patch.object(finance_crawler._snapshot_cache, "ttl", 0), \
+                patch.object(finance_crawler.ak, "stock_zh_a_spot_em", return_value=_a_share_df()) as api:
+            await fetch_quotes(self.ITEMS)
+            await fetch_quotes(self.ITEMS)
+        assert api.call_count == 2
@@ -0,0 +1,159 @@
+"""单元测试 - HTML 解析后端一致性（selectolax 与 bs4 html.parser 输出相同）"""
+from unittest.mock import patch
+
+import pytest
+
+from backend.services.article_extractor import extract_document
+from backend.services.news_crawler import _extract_links
+from backend.utils import html_parser
+
+pytestmark = pytest.mark.skipif(html_parser.LexborHTMLParser is None, reason="未安装 selectolax")
+
+_PARAGRAPH = "国家能源局发布最新数据显示，今年前三季度全国可再生能源发电量同比增长显著"
+
+LIST_PAGES = {
+    "plain": """
+        <html><body>
+        <nav><a href="/">首页</a><a href="/about">关于</a></nav>
+        <ul class="news-list">
+          <li><a href="/news/2024/001.html">　储能行业迎来新一轮政策支持&nbsp;</a></li>
+          <li><a href="https://other.example.com/a/123">铜价 <b>创新高</b>，市场情绪回暖</a></li>
+          <li><a href="/news/2024/002.html" title="锂电池产能扩张的最新进展"></a></li>
+          <li><a href="/news/2024/001.html">重复链接应该被去重处理</a></li>
+          <li><a href="#top">返回顶部链接</a></li>
+          <li><a href="javascript:void(0)">脚本链接不应提取</a></li>
+          <li><a href="/news/2024/003.html">更多</a></li>
+          <li><a href="/news/2024/004.html"><!-- 注释 -->光伏组件<span>价格</span>下跌</a></li>
+        </ul>
+        <div class="footer"><a href="/news/2024/footer.html">页脚里的新闻链接</a></div>
+        </body></html>
+    """,
+    "fragment": """
+        <div class="list"><a href="/art/20240501/x.html">没有 html/body 的片段页面标题</a></div>
+        <p>散落文字 <a href="/art/20240502/y.html">段落中的另一篇文章</a></p>
+    """,
+}
+
+SELECTORS = ["a", ".news-list a", "ul.news-list li a", ".news-list", ".list", "li > a", "div"]
+
+ARTICLE_PAGES = {
+    "article": f"""
+        <html><head><title>标题</title><style>p {{ color: red; }}</style></head><body>
+        <header><p>网站头部导航文字，应当被忽略掉的内容</p></header>
+        <article>
+          <h1>标题</h1>
+          <p>{_PARAGRAPH}。</p>
+          <p>短段落</p>
+          <p>　　第二段内容：风电和光伏新增装机容量持续保持高位运行态势。<script>var x = "脚本内容";</script></p>
+          <p>版权所有 © 2024 某某网站 保留所有权利 转载请注明出处</p>
+          <nav><p>导航中的段落文字不应出现在摘要或正文当中</p></nav>
+          <p>首页 | 新闻 | 政策 | 数据 | 关于我们的网站导航</p>
+          <p>第三段：行业专家认为&nbsp;未来一段时间市场需求仍将稳步增长，价格趋于稳定。</p>
+        </article>
+        <footer><p>页脚中的联系方式和备案信息等内容文字</p></footer>
+        </body></html>
+    """,
+    "content_class": f"""
+        <html><body>
+        <div class="sidebar"><p>侧边栏推荐阅读内容，不属于正文部分的段落</p></div>
+        <div class="main-content">
+          <div><p>{_PARAGRAPH}，相关企业积极布局。</p></div>
+          <aside><p>旁注内容不应该被提取到正文里面去的段落文字</p></aside>
+          <p>1234567890123456</p>
+          <p>更多精彩内容请扫一扫关注公众号获取最新资讯动态</p>
+        </div>
+        </body></html>
+    """,
+    "no_container": f"""
+        <p>{_PARAGRAPH}。</p>
+        <p>没有 article/main 容器时，从整个 body 中提取段落文字内容。</p>
+    """,
+}
+
+
+def _with_backend(backend: str, func, *args):
+    setting = "bs4" if backend == "bs4" else "auto"
+    with patch.object(html_parser.settings, "html_parser", setting):
+        assert html_parser.default_backend() == backend
+        return func(*args)
+
+
+def _article_text(html, encoding=None):
+    return extract_document(html, encoding).main_text()
+
+
+def _summary(html, max_chars):
+    return extract_document(html).summary(max_chars)
+
+
+def _parity(func, *args):
+    expected = _with_backend("bs4", func, *args)
+    actual = _with_backend("selectolax", func, *args)
+    assert actual == expected
+    return actual
+
+
+class TestExtractLinksParity:
+    @pytest.mark.parametrize("page", list(LIST_PAGES))
+    @pytest.mark.parametrize("selector", SELECTORS)
+    def test_same_links(self, page, selector):
+        _parity(_extract_links, LIST_PAGES[page], "https://news.example.com/index.html", selector)
+
+    def test_expected_output(self):
+        links = _parity(_extract_links, LIST_PAGES["plain"], "https://news.example.com/", ".news-list a")
+        assert links == [
+            ("储能行业迎来新一轮政策支持", "https://news.example.com/news/2024/001.html"),
+            ("铜价创新高，市场情绪回暖", "https://other.example.com/a/123"),
+            ("锂电池产能扩张的最新进展", "https://news.example.com/news/2024/002.html"),
+            ("光伏组件价格下跌", "https://news.example.com/news/2024/004.html"),
+        ]
+
+    def test_bytes_input(self):
+        html = LIST_PAGES["plain"]
+        expected = _with_backend("bs4", _extract_links, html, "https://news.example.com/", "a")
+        for encoding in ("utf-8", "gbk"):
+            raw = html.encode(encoding)
+            assert _parity(_extract_links, raw, "https://news.example.com/", "a", encoding) == expected
+
+
+class TestArticleTextParity:
+    @pytest.mark.parametrize("page", list(ARTICLE_PAGES))
+    def test_summary(self, page):
+        assert _parity(_summary, ARTICLE_PAGES[page], 140)
+
+    @pytest.mark.parametrize("page", list(ARTICLE_PAGES))
+    def test_main_text(self, page):
+        assert _parity(_article_text, ARTICLE_PAGES[page])
+
+    @pytest.mark.parametrize("page", list(ARTICLE_PAGES))
+    def test_whole_document(self, page):
+        _parity(extract_document, ARTICLE_PAGES[page])
+
+    def test_script_text_excluded(self):
+        text = _parity(_article_text, ARTICLE_PAGES["article"])
+        assert "脚本内容" not in text
+        assert "导航中的段落" not in text
+        assert "第二段内容" in text
+
+    def test_gb18030_bytes(self):
+        raw = ARTICLE_PAGES["article"].encode("gb18030")
+        expected = _with_backend("bs4", _article_text, ARTICLE_PAGES["article"])
+        assert _parity(_article_text, raw, "gb18030") == expected
+
+
+class TestNodeApi:
+    def test_select_excludes_self(self):
+        for backend in ("bs4", "selectolax"):
+            doc = html_parser.parse_html('<div id="a"><div>x</div></div>', backend=backend)
+            outer = doc.select_one("#a")
+            assert len(outer.select("div")) == 1
+            assert outer.select_one("div").text() == "x"
+
+    def test_remove_nested(self):
+        for backend in ("bs4", "selectolax"):
+            doc = html_parser.parse_html(
+                "<main><nav>a<nav>b</nav></nav><p>keep</p><footer><nav>c</nav></footer></main>", backend=backend,
+            )
+            main = doc.select_one("main")
+            main.remove(["nav", "footer"])
+            assert main.text() == "keep"
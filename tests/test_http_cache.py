@@ -0,0 +1,98 @@
+"""单元测试 - HTTP 条件请求磁盘缓存"""
+import os
+from unittest.mock import patch
+
+import pytest
+
+from backend.services import http_cache
+from tests.http_mocks import mock_client, mock_response
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path):
+    """缓存写到临时目录，并重置进程内的总大小计数"""
+    path = tmp_path / "http_cache"
+    with patch.object(http_cache.settings, "http_cache_dir", str(path)), \
+            patch.object(http_cache.settings, "http_cache_max_bytes", 10 * 1024 * 1024), \
+            patch.object(http_cache, "_total_bytes", None):
+        yield path
+
+
+class TestHttpCacheStore:
+    @pytest.mark.asyncio
+    async def test_round_trip(self):
+        await http_cache.store("https://a.example.com/", "正文".encode("gbk"), "gbk", '"v1"', None)
+        cached = await http_cache.load("https://a.example.com/")
+        assert cached.content.decode("gbk") == "正文"
+        assert cached.conditional_headers() == {"If-None-Match": '"v1"'}
+
+    @pytest.mark.asyncio
+    async def test_skips_responses_without_validators(self, cache_dir):
+        await http_cache.store("https://a.example.com/", b"body", "utf-8", None, None)
+        assert await http_cache.load("https://a.example.com/") is None
+        assert not cache_dir.exists()
+
+    @pytest.mark.asyncio
+    async def test_disabled_when_max_bytes_zero(self):
+        with patch.object(http_cache.settings, "http_cache_max_bytes", 0):
+            await http_cache.store("https://a.example.com/", b"body", "utf-8", '"v1"', None)
+            assert await http_cache.load("https://a.example.com/") is None
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self, cache_dir):
+        body = os.urandom(4000)  # 随机数据不可压缩，便于估算文件大小
+        with patch.object(http_cache.settings, "http_cache_max_bytes", 10000):
+            await http_cache.store("https://a.example.com/1", body, None, '"1"', None)
+            await http_cache.store("https://a.example.com/2", body, None, '"2"', None)
+            # 让 1 比 2 更晚被使用
+            os.utime(http_cache._path("https://a.example.com/2"), (1, 1))
+            await http_cache.touch("https://a.example.com/1")
+            await http_cache.store("https://a.example.com/3", body, None, '"3"', None)
+
+        assert await http_cache.load("https://a.example.com/2") is None
+        assert await http_cache.load("https://a.example.com/1") is not None
+        assert await http_cache.load("https://a.example.com/3") is not None
+
+
+class TestFetchPageConditional:
+    @pytest.mark.asyncio
+    async def test_304_served_from_disk(self):
+        from backend.services.news_crawler import CrawlStats, _fetch_page_bytes
+
+        url = "https://news.example.com/list"
+        html = "<html>列表页</html>".encode("utf-8")
+        client = mock_client(
+            mock_response(200, html, {"etag": '"abc"', "last-modified": "Wed, 01 Jan 2025 00:00:00 GMT"}),
+            mock_response(304),
+        )
+        stats = CrawlStats()
+
+        with patch("backend.services.news_crawler.validate_url_async"):
+            first = await _fetch_page_bytes(client, url, stats=stats)
+            second = await _fetch_page_bytes(client, url, stats=stats)
+
+        assert first == second == (html, "utf-8")
+        assert client.stream.call_args_list[0].kwargs["headers"] is None
+        assert client.stream.call_args_list[1].kwargs["headers"] == {
+            "If-None-Match": '"abc"', "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT",
+        }
+        assert stats.bytes_downloaded == len(html)
+        assert stats.bytes_from_cache == len(html)
+
+    @pytest.mark.asyncio
+    async def test_changed_page_replaces_cache(self):
+        from backend.services.news_crawler import _fetch_page_bytes
+
+        url = "https://news.example.com/list"
+        client = mock_client(
+            mock_response(200, b"old", {"etag": '"1"'}),
+            mock_response(200, b"new", {"etag": '"2"'}),
+        )
+
+        with patch("backend.services.news_crawler.validate_url_async"):
+            await _fetch_page_bytes(client, url)
+            assert await _fetch_page_bytes(client, url) == (b"new", "utf-8")
+
+        cached = await http_cache.load(url)
+        assert cached.content == b"new"
+        assert cached.etag == '"2"'
@@ -0,0 +1,111 @@
+"""单元测试 - 详情页负缓存"""
+from datetime import timedelta
+from unittest.mock import patch
+
+import httpx
+import pytest
+from sqlalchemy import select
+
+from backend.models.failed_article import FailedArticle
+from backend.services import negative_cache
+
+_HOURS = {"http_4xx": 168, "empty": 24, "timeout": 1, "error": 0}
+
+
+@pytest.fixture
+def session_factory(session_factory):
+    with patch.object(negative_cache, "AsyncSessionLocal", session_factory), \
+            patch.object(negative_cache, "stats", negative_cache.NegativeCacheStats()), \
+            patch.object(negative_cache.settings, "negative_cache_hours", _HOURS):
+        yield session_factory
+
+
+class TestNegativeCache:
+    @pytest.mark.asyncio
+    async def test_ttl_per_reason(self, session_factory):
+        async with session_factory() as db:
+            await negative_cache.save_failed(db, {
+                "https://a.example.com/404": "http_4xx",
+                "https://a.example.com/slow": "timeout",
+                "https://a.example.com/other": "error",  # 有效期为 0，不缓存
+            })
+            await db.commit()
+            rows = {r.url: r for r in (await db.execute(select(FailedArticle))).scalars()}
+
+        assert set(rows) == {"https://a.example.com/404", "https://a.example.com/slow"}
+        assert rows["https://a.example.com/404"].expires_at - rows["https://a.example.com/404"].failed_at \
+            == timedelta(hours=168)
+        assert rows["https://a.example.com/slow"].expires_at - rows["https://a.example.com/slow"].failed_at \
+            == timedelta(hours=1)
+        assert negative_cache.stats.recorded == {"http_4xx": 1, "timeout": 1}
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_ignored_and_evicted(self, session_factory):
+        from backend.models.seen_article import url_hash
+
+        now = negative_cache._utcnow()
+        async with session_factory() as db:
+            for url, expires_at in [("https://a.example.com/old", now - timedelta(minutes=1)),
+                                    ("https://a.example.com/new", now + timedelta(hours=1))]:
+                db.add(FailedArticle(url_hash=url_hash(url), url=url, reason="timeout",
+                                     failed_at=now - timedelta(hours=1), expires_at=expires_at))
+            await db.commit()
+            found = await negative_cache.load_failed(
+                db, ["https://a.example.com/old", "https://a.example.com/new", "https://a.example.com/ok"],
+            )
+        assert found == {"https://a.example.com/new": "timeout"}
+        assert negative_cache.stats.avoided == {"timeout": 1}
+
+        assert await negative_cache.evict_failed() == 1
+
+
+class TestFailureReason:
+    def _status_error(self, code: int) -> httpx.HTTPStatusError:
+        request = httpx.Request("GET", "https://a.example.com/x")
+        return httpx.HTTPStatusError("err", request=request, response=httpx.Response(code, request=request))
+
+    def test_classification(self):
+        from backend.services.news_crawler import ResponseRejected, _failure_reason
+
+        assert _failure_reason(self._status_error(404)) == "http_4xx"
+        assert _failure_reason(self._status_error(429)) == "server_error"
+        assert _failure_reason(self._status_error(503)) == "server_error"
+        assert _failure_reason(httpx.ReadTimeout("timeout")) == "timeout"
+        assert _failure_reason(ResponseRejected("非网页响应")) == "rejected"
+        assert _failure_reason(httpx.ConnectError("refused")) == "error"
+
+
+class TestCrawlSkipsFailed:
+    @pytest.mark.asyncio
+    async def test_failed_article_not_fetched_again(self, session_factory):
+        """详情页 404 的文章写入负缓存，下次采集不再请求"""
+        from backend.services.news_crawler import _article_cache, crawl_sources
+
+        page = '<a href="https://news.example.com/article-2024-404">已被删除的新闻标题</a>'
+        sources = [{"id": None, "url": "https://news.example.com/list", "name": "测试源", "weight": 5}]
+        detail_calls: list[str] = []
+
+        async def fake_fetch(client, url, stats=None, **kwargs):
+            if url.endswith("/list"):
+                return page.encode("utf-8"), "utf-8"
+            detail_calls.append(url)
+            request = httpx.Request("GET", url)
+            raise httpx.HTTPStatusError("404", request=request, response=httpx.Response(404, request=request))
+
+        with patch("backend.services.news_crawler._fetch_page_bytes", side_effect=fake_fetch), \
+                patch("backend.services.news_crawler.settings.dashscope_api_key", "test-key"), \
+                patch("backend.services.news_crawler.settings.seen_index_enabled", False), \
+                patch("backend.services.news_crawler.settings.candidate_store_days", 0), \
+                patch("backend.services.news_crawler.settings.crawl_list_share_ttl", 0), \
+                patch("backend.services.news_crawler.settings.crawl_article_share_ttl", 0):
+            _article_cache.invalidate()
+            async with session_factory() as db:
+                await crawl_sources(sources, db, detect_changes=False)
+                await db.commit()
+            async with session_factory() as db:
+                items = await crawl_sources(sources, db, detect_changes=False)
+
+        assert detail_calls == ["https://news.example.com/article-2024-404"]
+        assert items == []
+        assert negative_cache.stats.recorded == {"http_4xx": 1}
+        assert negative_cache.stats.avoided == {"http_4xx": 1}
@@ -0,0 +1,61 @@
+"""单元测试 - HTML 解析进程池"""
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from backend.services.news_crawler import _extract_links
+from backend.utils import parse_pool
+
+_HTML = '<ul><li><a href="/news/2024/001.html">储能行业迎来新一轮政策支持</a></li></ul>'.encode("utf-8")
+_EXPECTED = [("储能行业迎来新一轮政策支持", "https://news.example.com/news/2024/001.html")]
+
+
+@pytest.fixture(autouse=True)
+def reset_pool():
+    with patch.object(parse_pool, "_executor", None), patch.object(parse_pool, "_disabled", False):
+        yield
+        parse_pool.shutdown()
+
+
+def _settings(workers: int, min_bytes: int = 0):
+    return patch.multiple(parse_pool.settings, parse_workers=workers, parse_offload_min_bytes=min_bytes)
+
+
+class TestRunParse:
+    @pytest.mark.asyncio
+    async def test_in_loop_when_disabled(self):
+        with _settings(0), patch.object(parse_pool, "ProcessPoolExecutor") as pool_cls:
+            result = await parse_pool.run_parse(_extract_links, _HTML, "https://news.example.com/", "a", size=len(_HTML))
+        assert result == _EXPECTED
+        pool_cls.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_small_pages_stay_in_loop(self):
+        with _settings(2, min_bytes=1024), patch.object(parse_pool, "ProcessPoolExecutor") as pool_cls:
+            await parse_pool.run_parse(_extract_links, _HTML, "https://news.example.com/", "a", size=len(_HTML))
+        pool_cls.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_runs_in_worker_process(self):
+        with _settings(1):
+            result = await parse_pool.run_parse(_extract_links, _HTML, "https://news.example.com/", "a", size=len(_HTML))
+            assert parse_pool._executor is not None
+        assert result == _EXPECTED
+
+    @pytest.mark.asyncio
+    async def test_falls_back_when_pool_fails_to_start(self):
+        with _settings(2), patch.object(parse_pool, "ProcessPoolExecutor", side_effect=OSError("no sem_open")):
+            result = await parse_pool.run_parse(_extract_links, _HTML, "https://news.example.com/", "a", size=len(_HTML))
+            assert result == _EXPECTED
+            assert parse_pool._disabled
+
+    @pytest.mark.asyncio
+    async def test_falls_back_when_pool_breaks(self):
+        broken = MagicMock()
+        broken.submit.side_effect = BrokenProcessPool("worker died")
+        with _settings(2), patch.object(parse_pool, "ProcessPoolExecutor", return_value=broken):
+            result = await parse_pool.run_parse(_extract_links, _HTML, "https://news.example.com/", "a", size=len(_HTML))
+            assert result == _EXPECTED
+            assert parse_pool._disabled
+            broken.shutdown.assert_called_once()
@@ -0,0 +1,74 @@
+"""早报准点送达：历史耗时估算与错开启动"""
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from backend.models.push_log import PushLog
+from backend.services.push_timing import LeadEstimate, estimate_lead, plan_start_times
+
+
+def _log(industry_id, crawl, rank=1.0, send=2.0, triggered_by="scheduler"):
+    return PushLog(
+        industry_id=industry_id, push_type="morning", status="success", triggered_by=triggered_by,
+        crawl_seconds=crawl, rank_seconds=rank, send_seconds=send,
+    )
+
+
+class TestEstimateLead:
+    @pytest.mark.asyncio
+    async def test_uses_recent_scheduled_runs(self, session_factory):
+        async with session_factory() as db:
+            db.add_all([
+                _log(1, 100.0), _log(1, 140.0, send=5.0), _log(1, 600.0, triggered_by="manual"), _log(2, 900.0),
+            ])
+            await db.commit()
+
+        with patch("backend.services.push_timing.settings.morning_lead_safety", 1.5), \
+                patch("backend.services.push_timing.settings.morning_max_lead_minutes", 30):
+            async with session_factory() as db:
+                lead = await estimate_lead(db, 1, crawl_time_budget=300.0)
+
+        # 手动触发和其他行业的记录不参与；各阶段取最大值
+        assert lead == LeadEstimate(prepare_seconds=(140.0 + 1.0) * 1.5, send_seconds=5.0)
+
+    @pytest.mark.asyncio
+    async def test_without_history_uses_crawl_budget(self, session_factory):
+        with patch("backend.services.push_timing.settings.morning_max_lead_minutes", 3):
+            async with session_factory() as db:
+                assert await estimate_lead(db, 1, crawl_time_budget=120.0) == LeadEstimate(120.0, 0.0)
+                # 采集时长上限超过最大提前量时按最大提前量
+                assert await estimate_lead(db, 1, crawl_time_budget=600.0) == LeadEstimate(180.0, 0.0)
+
+
+class TestPlanStartTimes:
+    def test_staggers_same_target(self):
+        target = datetime(2024, 1, 1, 9, 0)
+        leads = {1: LeadEstimate(60.0, 0.0), 2: LeadEstimate(60.0, 0.0), 3: LeadEstimate(300.0, 10.0)}
+        with patch("backend.services.push_timing.settings.morning_stagger_seconds", 30):
+            plan = plan_start_times(leads, target, earliest=target - timedelta(minutes=30))
+
+        starts = sorted(start for start, _ in plan.values())
+        assert all(b - a >= timedelta(seconds=30) for a, b in zip(starts, starts[1:]))
+        # 只会提前启动，不会推迟
+        for industry_id, (start, send_at) in plan.items():
+            assert start <= send_at - timedelta(seconds=leads[industry_id].prepare_seconds)
+        assert plan[3][1] == target - timedelta(seconds=10)
+
+    def test_never_before_earliest(self):
+        target = datetime(2024, 1, 1, 9, 0)
+        earliest = target - timedelta(seconds=100)
+        plan = plan_start_times({1: LeadEstimate(600.0, 0.0)}, target, earliest=earliest)
+        assert plan == {1: (earliest, target)}
+
+    def test_clamped_starts_keep_stagger(self):
+        target = datetime(2024, 1, 1, 9, 0)
+        earliest = target - timedelta(seconds=100)
+        leads = {i: LeadEstimate(600.0 + i, 0.0) for i in (1, 2, 3)}
+        with patch("backend.services.push_timing.settings.morning_stagger_seconds", 30):
+            plan = plan_start_times(leads, target, earliest=earliest)
+
+        # 三个行业都早于 earliest：从 earliest 起依次间隔 30 秒，耗时长的先启动
+        assert [plan[i][0] for i in (3, 2, 1)] == [
+            earliest, earliest + timedelta(seconds=30), earliest + timedelta(seconds=60),
+        ]
@@ -8,6 +8,7 @@ from backend.services.news_ranking import (
     _keyword_score,
     _timeliness_score,
     _weight_score,
+    prescore_title,
     score_and_rank,
 )
 
@@ -160,3 +161,28 @@ class TestScoreAndRank:
         items = [make_item("唯一新闻")]
         result = score_and_rank(items, top_n=10)
         assert len(result) == 1
+
+
+# ── prescore_title ────────────────────────────────────────
+class TestPrescoreTitle:
+    def test_source_must_have_missing_filters(self):
+        assert prescore_title("苹果公司新闻", 5, "+原油") is None
+
+    def test_industry_must_not_in_title_filters(self):
+        assert prescore_title("这是广告推广内容", 5, None, "!广告") is None
+
+    def test_industry_must_have_only_boosts(self):
+        """行业 +词未命中标题时不过滤（可能在摘要中命中），只是得分更低"""
+        hit = prescore_title("原油价格上涨", 5, None, "+原油")
+        miss = prescore_title("能源市场周报", 5, None, "+原油")
+        assert miss is not None
+        assert hit > miss
+
+    def test_higher_weight_scores_higher(self):
+        assert prescore_title("行业新闻标题", 9) > prescore_title("行业新闻标题", 2)
+
+    def test_english_source_not_filtered_by_chinese_keywords(self):
+        """英文源标题尚未翻译，中文关键词无法判断，不过滤、只按来源权重打分"""
+        assert prescore_title("Oil prices rise", 5, "+原油", "+原油 !广告", language="en") is not None
+        assert prescore_title("Oil prices rise", 9, "+原油", language="en") > \
+            prescore_title("Oil prices rise", 2, "+原油", language="en")
@@ -0,0 +1,182 @@
+"""单元测试 - 早报推送任务：准点发送与采集结果的提交时机"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+
+from backend.models import Industry, NewsSource, Recipient, SeenArticle, SmtpConfig
+from backend.models.candidate_article import CandidateArticle
+from backend.models.push_log import PushLog
+from backend.models.source_snapshot import SourceSnapshot
+from backend.services.candidate_store import StoredArticle
+from backend.services.news_crawler import NewsItem, _link_hash
+from backend.tasks import scheduler
+
+_URL = "https://news.example.com/article-2024-1"
+
+
+@pytest_asyncio.fixture
+async def session_factory(session_factory):
+    """一个行业，配置好新闻源、收件人和 SMTP"""
+    async with session_factory() as db:
+        db.add(Industry(id=1, name="测试行业", top_n=5))
+        db.add(NewsSource(id=1, industry_id=1, name="测试源", url="https://news.example.com"))
+        db.add(Recipient(industry_id=1, email="a@example.com"))
+        db.add(SmtpConfig(host="smtp.example.com", username="bot@example.com", password_encrypted="x"))
+        await db.commit()
+    with patch.object(scheduler, "AsyncSessionLocal", session_factory):
+        scheduler._consecutive_failures.clear()
+        scheduler._last_precrawl.clear()
+        scheduler._precrawl_started.clear()
+        yield session_factory
+
+
+async def _fake_crawl(sources, db, stats=None, save_state=True, **kwargs):
+    """返回一篇文章，采集结果只记录在 stats 中（与 save_state=False 时的 crawl_sources 一致）"""
+    assert save_state is False
+    stats.processed.append((_URL, StoredArticle("行业新闻标题", "摘要", "zh"), 1))
+    return [NewsItem(
+        title="行业新闻标题", url=_URL, published_at=datetime.now(timezone.utc), source_name="测试源",
+        source_weight=5, summary="摘要", source_id=1,
+    )]
+
+
+async def _count(factory, model) -> int:
+    async with factory() as db:
+        return await db.scalar(select(func.count()).select_from(model))
+
+
+def _patch_pipeline(send):
+    return (
+        patch.object(scheduler, "crawl_sources", side_effect=_fake_crawl),
+        patch.object(scheduler, "deduplicate", side_effect=lambda items: items),
+        patch.object(scheduler, "send_morning_report", side_effect=send),
+    )
+
+
+class TestMorningPush:
+    @pytest.mark.asyncio
+    async def test_waits_for_send_at_before_sending(self, session_factory):
+        send_at = datetime.now(scheduler._TZ) + timedelta(seconds=0.3)
+        sent_at = []
+
+        async def send(*args, **kwargs):
+            sent_at.append(datetime.now(scheduler._TZ))
+            # 等待期间采集结果尚未写入
+            assert await _count(session_factory, CandidateArticle) == 0
+            return "<html></html>"
+
+        crawl, dedup, mail = _patch_pipeline(send)
+        with crawl, dedup, mail:
+            await scheduler.run_morning_push(1, send_at=send_at)
+
+        assert sent_at[0] >= send_at
+        assert await _count(session_factory, CandidateArticle) == 1
+        assert await _count(session_factory, SeenArticle) == 1
+        async with session_factory() as db:
+            log = (await db.execute(select(PushLog))).scalar_one()
+        assert log.status == "success"
+        assert log.crawl_seconds is not None and log.send_seconds is not None
+
+    @pytest.mark.asyncio
+    async def test_failed_send_keeps_crawl_state_uncommitted(self, session_factory):
+        crawl, dedup, mail = _patch_pipeline(AsyncMock(side_effect=ConnectionError("SMTP 不可用")))
+        with crawl, dedup, mail:
+            await scheduler.run_morning_push(1, send_at=datetime.now(scheduler._TZ))
+
+        # 发送失败：不写入暂存候选和已推送记录，下次仍视为新文章
+        assert await _count(session_factory, CandidateArticle) == 0
+        assert await _count(session_factory, SeenArticle) == 0
+        async with session_factory() as db:
+            log = (await db.execute(select(PushLog))).scalar_one()
+        assert log.status == "failed"
+
+
+class TestMorningOnTime:
+    @pytest.mark.asyncio
+    async def test_staggers_starts_and_sends_at_target(self, session_factory):
+        async with session_factory() as db:
+            db.add(Industry(id=2, name="第二行业", top_n=5))
+            for industry in await db.scalars(select(Industry)):
+                industry.crawl_time_budget = 120
+            await db.commit()
+
+        target = (datetime.now(scheduler._TZ) + timedelta(minutes=10)).replace(second=0, microsecond=0)
+        starts: list[datetime] = []
+        pushes: list[tuple[int, datetime]] = []
+
+        async def fake_sleep(when):
+            starts.append(when)
+
+        async def fake_push(industry_id, triggered_by, send_at=None):
+            pushes.append((industry_id, send_at))
+
+        with patch.object(scheduler, "_sleep_until", side_effect=fake_sleep), \
+                patch.object(scheduler, "run_morning_push", side_effect=fake_push), \
+                patch.object(scheduler.settings, "morning_stagger_seconds", 60):
+            await asyncio.wait_for(scheduler.run_morning_on_time([1, 2], target.hour, target.minute), 2)
+
+        # 没有历史耗时：按采集时长上限提前 120 秒，同一时刻的两个行业相隔 60 秒启动
+        assert sorted(starts) == [target - timedelta(seconds=180), target - timedelta(seconds=120)]
+        assert sorted(pushes) == [(1, target), (2, target)]
+
+
+class TestStagedSince:
+    @pytest.mark.asyncio
+    async def test_later_of_last_push_and_precrawl_start(self, session_factory):
+        last_push = datetime(2024, 1, 1, 1, 0)
+        async with session_factory() as db:
+            assert await scheduler._staged_since(db, 1) is None
+            db.add(PushLog(industry_id=1, push_type="morning", status="success", created_at=last_push))
+            db.add(PushLog(industry_id=1, push_type="morning", status="failed",
+                           created_at=last_push + timedelta(hours=1)))
+            await db.commit()
+            assert await scheduler._staged_since(db, 1) == last_push
+
+            scheduler._precrawl_started[1] = last_push + timedelta(hours=20)
+            assert await scheduler._staged_since(db, 1) == last_push + timedelta(hours=20)
+
+
+class TestPrecrawl:
+    @pytest.mark.asyncio
+    async def test_skips_links_in_last_push_fingerprint(self, session_factory):
+        pushed = "https://news.example.com/article-2024-1"
+        page = (
+            f'<a href="{pushed}">上次推送时已处理的文章</a>'
+            '<a href="https://news.example.com/article-2024-2">之后新出现的文章</a>'
+        ).encode("utf-8")
+        async with session_factory() as db:
+            db.add(SourceSnapshot(source_id=1, content_hash="old", link_hashes=f'["{_link_hash(pushed)}"]'))
+            await db.commit()
+
+        fetched = []
+
+        async def fake_summary(client, url, **kwargs):
+            fetched.append(url)
+            return kwargs["original_title"], "摘要"
+
+        with patch("backend.services.news_crawler._fetch_source_page", AsyncMock(return_value=(page, "utf-8"))), \
+                patch("backend.services.news_crawler._fetch_article_summary", side_effect=fake_summary), \
+                patch("backend.services.seen_index.settings.seen_index_enabled", False):
+            await scheduler.precrawl_industry(1)
+
+        assert fetched == ["https://news.example.com/article-2024-2"]
+        assert await _count(session_factory, CandidateArticle) == 1
+        # 预采集不写入指纹
+        async with session_factory() as db:
+            assert (await db.get(SourceSnapshot, 1)).content_hash == "old"
+
+    def test_due_only_within_window_before_push(self):
+        now = datetime(2024, 1, 1, 6, 0, tzinfo=scheduler._TZ)
+        schedules = [(1, 7, 0), (2, 8, 30), (3, 5, 0), (1, 8, 0), (4, 9, 30)]
+        with patch.object(scheduler.settings, "precrawl_window_minutes", 180), \
+                patch.object(scheduler.settings, "morning_on_time", False):
+            assert scheduler._precrawl_due(schedules, now) == [1, 2]
+        # 准点早报提前 30 分钟触发，距早报不足 30 分钟时不再预采集
+        with patch.object(scheduler.settings, "precrawl_window_minutes", 180), \
+                patch.object(scheduler.settings, "morning_on_time", True), \
+                patch.object(scheduler.settings, "morning_max_lead_minutes", 30):
+            assert scheduler._precrawl_due([(1, 6, 20), (2, 6, 40)], now) == [2]
@@ -0,0 +1,142 @@
+"""单元测试 - 布隆过滤器与进程内已推送 URL 索引"""
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from backend.models.seen_article import SeenArticle, url_hash
+from backend.services import seen_index as seen_index_module
+from backend.services.seen_index import SeenIndex
+from backend.utils.bloom import BloomFilter
+
+
+class TestBloomFilter:
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(1000, 0.01)
+        urls = [f"https://news.example.com/a/{i}" for i in range(1000)]
+        for url in urls:
+            bloom.add(url)
+        assert all(url in bloom for url in urls)
+
+    def test_false_positive_rate_near_target(self):
+        bloom = BloomFilter(5000, 0.01)
+        for i in range(5000):
+            bloom.add(f"https://news.example.com/seen/{i}")
+        fp = sum(f"https://news.example.com/new/{i}" in bloom for i in range(20000))
+        assert fp / 20000 < 0.02
+        assert bloom.estimated_error_rate() == pytest.approx(0.01, rel=0.2)
+
+
+@pytest.fixture
+def session_factory(session_factory):
+    with patch.object(seen_index_module, "AsyncSessionLocal", session_factory), \
+            patch.object(seen_index_module.settings, "seen_index_enabled", True):
+        yield session_factory
+
+
+async def _seed(factory, *rows: tuple[str, datetime]) -> None:
+    async with factory() as db:
+        db.add_all(SeenArticle(url_hash=url_hash(url), url=url, title="", first_seen_at=at) for url, at in rows)
+        await db.commit()
+
+
+class TestSeenIndex:
+    @pytest.mark.asyncio
+    async def test_classify(self, session_factory):
+        now = datetime.now(timezone.utc)
+        await _seed(
+            session_factory,
+            ("https://a.example.com/recent", now),
+            ("https://a.example.com/old", now - timedelta(days=5)),
+        )
+        index = SeenIndex()
+
+        seen, to_check = await index.classify([
+            "https://a.example.com/recent", "https://a.example.com/old", "https://a.example.com/new",
+        ])
+
+        assert seen == {"https://a.example.com/recent"}
+        assert to_check == ["https://a.example.com/old"]  # 不在近期集合中，仍需查库
+        assert index.stats.definite_misses == 1
+
+        index.record_db_result(to_check, {"https://a.example.com/old"})
+        seen, to_check = await index.classify(["https://a.example.com/old"])
+        assert seen == {"https://a.example.com/old"} and to_check == []
+
+    @pytest.mark.asyncio
+    async def test_add_and_rebuild(self, session_factory):
+        index = SeenIndex()
+        assert await index.ensure_loaded()
+
+        index.add(["https://a.example.com/pushed"])
+        seen, _ = await index.classify(["https://a.example.com/pushed"])
+        assert seen == {"https://a.example.com/pushed"}
+
+        # 数据库中没有该记录，重建后不再视为已推送
+        await index.rebuild()
+        seen, to_check = await index.classify(["https://a.example.com/pushed"])
+        assert seen == set() and to_check == []
+
+    @pytest.mark.asyncio
+    async def test_disabled_or_load_failure_checks_everything(self, session_factory):
+        index = SeenIndex()
+        with patch.object(seen_index_module.settings, "seen_index_enabled", False):
+            assert await index.classify(["https://a.example.com/x"]) == (set(), ["https://a.example.com/x"])
+
+        with patch.object(seen_index_module, "AsyncSessionLocal", side_effect=RuntimeError("db down")):
+            assert await index.classify(["https://a.example.com/x"]) == (set(), ["https://a.example.com/x"])
+        assert not index.loaded
+
+
+class TestSeenArticleMigration:
+    @pytest.mark.asyncio
+    @pytest.mark.db_tables()
+    async def test_url_indexed_table_migrated_to_hash_key(self, db_engine):
+        from sqlalchemy import text
+        from backend.database import _migrate_seen_article
+
+        async with db_engine.begin() as conn:
+            await conn.execute(text(
+                "CREATE TABLE seen_article (id INTEGER PRIMARY KEY, url VARCHAR(1000) NOT NULL, "
+                "title VARCHAR(500) NOT NULL, source_id INTEGER, first_seen_at DATETIME)"
+            ))
+            await conn.execute(text("CREATE UNIQUE INDEX ix_seen_article_url ON seen_article (url)"))
+            await conn.execute(text(
+                "INSERT INTO seen_article (url, title, first_seen_at) VALUES "
+                "('https://a.example.com/1', '标题一', '2025-01-01 00:00:00'), "
+                "('https://a.example.com/2', '标题二', '2025-01-02 00:00:00')"
+            ))
+            await conn.run_sync(_migrate_seen_article)
+            await conn.run_sync(_migrate_seen_article)  # 已迁移时不再处理
+
+            rows = (await conn.execute(text("SELECT url_hash, url, title FROM seen_article ORDER BY url"))).all()
+            indexes = (await conn.execute(text("PRAGMA index_list(seen_article)"))).all()
+
+        assert rows == [
+            (url_hash("https://a.example.com/1"), "https://a.example.com/1", "标题一"),
+            (url_hash("https://a.example.com/2"), "https://a.example.com/2", "标题二"),
+        ]
+        assert indexes == []  # 哈希即 rowid，不再有 URL 索引
+
+    @pytest.mark.asyncio
+    async def test_raw_urls_rehashed_as_canonical(self, db_engine):
+        """规范化之前按原始 URL 写入的记录改用规范化 URL 的哈希，规范化后的候选能查到"""
+        from sqlalchemy import insert, text
+        from backend.database import _canonicalize_seen_article
+
+        raw = "https://a.example.com/1?utm_source=wx"
+        async with db_engine.begin() as conn:
+            await conn.execute(insert(SeenArticle), [
+                {"url_hash": url_hash(raw), "url": raw, "title": "标题一"},
+                # 规范化后与已有记录相同：只保留已有记录
+                {"url_hash": url_hash("https://a.example.com/2?spm=x"), "url": "https://a.example.com/2?spm=x",
+                 "title": "旧写法"},
+                {"url_hash": url_hash("https://a.example.com/2"), "url": "https://a.example.com/2", "title": "标题二"},
+            ])
+            await conn.run_sync(_canonicalize_seen_article)
+            rows = (await conn.execute(text("SELECT url_hash, url, title FROM seen_article ORDER BY url"))).all()
+
+        assert rows == [
+            (url_hash("https://a.example.com/1"), "https://a.example.com/1", "标题一"),
+            (url_hash("https://a.example.com/2"), "https://a.example.com/2", "标题二"),
+        ]
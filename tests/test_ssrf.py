@@ -1,6 +1,6 @@
 """单元测试 - SSRF 防护"""
 import pytest
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 from backend.utils.ssrf_protection import validate_url, SSRFError
 
 
@@ -46,3 +46,76 @@ class TestValidateUrl:
     def test_missing_hostname(self):
         with pytest.raises(SSRFError, match="主机名"):
             validate_url("http:///feed")
+
+
+class TestValidateUrlAsync:
+    def setup_method(self):
+        from backend.utils import ssrf_protection
+        ssrf_protection._dns_cache.invalidate()
+
+    @pytest.mark.asyncio
+    async def test_returns_validated_ip_and_caches_dns(self):
+        from backend.utils import ssrf_protection
+        from backend.utils.ssrf_protection import validate_url_async
+
+        resolver = AsyncMock(return_value=["93.184.216.34"])
+        with patch.object(ssrf_protection, "_resolve", resolver):
+            ip1 = await validate_url_async("https://news.example.com/a")
+            ip2 = await validate_url_async("https://news.example.com/b")
+        assert ip1 == ip2 == "93.184.216.34"
+        resolver.assert_awaited_once_with("news.example.com")
+
+    @pytest.mark.asyncio
+    async def test_reject_private_ip(self):
+        from backend.utils import ssrf_protection
+        from backend.utils.ssrf_protection import validate_url_async
+
+        with patch.object(ssrf_protection, "_resolve", AsyncMock(return_value=["8.8.8.8", "10.0.0.1"])):
+            with pytest.raises(SSRFError, match="内网地址"):
+                await validate_url_async("http://mixed.example.com/feed")
+
+    @pytest.mark.asyncio
+    async def test_reject_scheme_without_dns(self):
+        from backend.utils import ssrf_protection
+        from backend.utils.ssrf_protection import validate_url_async
+
+        resolver = AsyncMock()
+        with patch.object(ssrf_protection, "_resolve", resolver):
+            with pytest.raises(SSRFError, match="不允许的协议"):
+                await validate_url_async("file:///etc/passwd")
+        resolver.assert_not_called()
+
+
+class TestPinnedNetworkBackend:
+    def setup_method(self):
+        from backend.utils import ssrf_protection
+        ssrf_protection._dns_cache.invalidate()
+
+    @pytest.mark.asyncio
+    async def test_connects_to_validated_ip(self):
+        from backend.utils import ssrf_protection
+
+        inner = AsyncMock()
+        backend = ssrf_protection._PinnedNetworkBackend(inner)
+        with patch.object(ssrf_protection, "_resolve", AsyncMock(return_value=["93.184.216.34"])):
+            await backend.connect_tcp("news.example.com", 443, timeout=5.0)
+        inner.connect_tcp.assert_awaited_once()
+        assert inner.connect_tcp.await_args.args == ("93.184.216.34", 443)
+
+    @pytest.mark.asyncio
+    async def test_rebinding_to_private_ip_is_rejected(self):
+        """DNS 被篡改为内网地址时，连接阶段直接拒绝"""
+        from backend.utils import ssrf_protection
+
+        inner = AsyncMock()
+        backend = ssrf_protection._PinnedNetworkBackend(inner)
+        with patch.object(ssrf_protection, "_resolve", AsyncMock(return_value=["127.0.0.1"])):
+            with pytest.raises(SSRFError):
+                await backend.connect_tcp("evil.example.com", 80)
+        inner.connect_tcp.assert_not_called()
+
+    def test_transport_wraps_pool_backend(self):
+        from backend.utils.ssrf_protection import SSRFSafeTransport, _PinnedNetworkBackend
+
+        transport = SSRFSafeTransport()
+        assert isinstance(transport._pool._network_backend, _PinnedNetworkBackend)
@@ -0,0 +1,67 @@
+"""单元测试 - AI 摘要持久化缓存"""
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import select
+
+from backend.models.summary_cache import SummaryCache
+from backend.services import summary_cache
+
+
+@pytest.fixture
+def session_factory(session_factory):
+    with patch.object(summary_cache, "AsyncSessionLocal", session_factory), \
+            patch.object(summary_cache, "stats", summary_cache.SummaryCacheStats()):
+        yield session_factory
+
+
+class TestMakeCacheKey:
+    def test_same_input_same_key(self):
+        assert summary_cache.make_cache_key("正文", "zh", 140) == summary_cache.make_cache_key("正文", "zh", 140)
+
+    def test_max_chars_and_language_change_key(self):
+        base = summary_cache.make_cache_key("正文", "zh", 140)
+        assert summary_cache.make_cache_key("正文", "zh", 200) != base
+        assert summary_cache.make_cache_key("正文", "en", 140) != base
+
+    def test_english_key_includes_original_title(self):
+        assert (summary_cache.make_cache_key("body", "en", 140, "Title A")
+                != summary_cache.make_cache_key("body", "en", 140, "Title B"))
+
+
+class TestSummaryCache:
+    @pytest.mark.asyncio
+    async def test_miss_then_hit(self, session_factory):
+        assert await summary_cache.get_cached_summary("k1") is None
+        await summary_cache.put_cached_summary("k1", "标题", "摘要", tokens=120)
+        assert await summary_cache.get_cached_summary("k1") == ("标题", "摘要")
+
+        s = summary_cache.stats
+        assert (s.hits, s.misses, s.saved_tokens) == (1, 1, 120)
+        assert s.hit_rate == pytest.approx(0.5)
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_miss(self, session_factory):
+        async with session_factory() as db:
+            db.add(SummaryCache(key="old", title="", summary="摘要",
+                                created_at=summary_cache._utcnow() - timedelta(days=400)))
+            await db.commit()
+        assert await summary_cache.get_cached_summary("old") is None
+
+    @pytest.mark.asyncio
+    async def test_evict_trims_to_max_entries_by_lru(self, session_factory):
+        now = summary_cache._utcnow()
+        async with session_factory() as db:
+            for i in range(5):
+                db.add(SummaryCache(key=f"k{i}", title="", summary="摘要",
+                                    created_at=now, last_used_at=now - timedelta(minutes=i)))
+            await db.commit()
+
+        with patch.object(summary_cache.settings, "summary_cache_max_entries", 3):
+            removed = await summary_cache.evict_summary_cache()
+
+        assert removed == 2
+        async with session_factory() as db:
+            keys = set((await db.execute(select(SummaryCache.key))).scalars())
+        assert keys == {"k0", "k1", "k2"}
@@ -0,0 +1,70 @@
+"""单元测试 - 带有效期和 single-flight 的异步缓存"""
+import asyncio
+
+import pytest
+
+from backend.utils.ttl_cache import AsyncTTLCache
+
+
+class TestAsyncTTLCache:
+    @pytest.mark.asyncio
+    async def test_concurrent_loads_are_coalesced(self):
+        cache: AsyncTTLCache[str, int] = AsyncTTLCache(ttl=60)
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return 42
+
+        results = await asyncio.gather(*[cache.get_or_load("k", loader) for _ in range(10)])
+        assert calls == 1
+        assert {value for value, _ in results} == {42}
+        assert len({loaded_at for _, loaded_at in results}) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_load_is_not_cached(self):
+        cache: AsyncTTLCache[str, int] = AsyncTTLCache(ttl=60)
+
+        async def failing():
+            raise RuntimeError("下载失败")
+
+        async def ok():
+            return 1
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_load("k", failing)
+        assert (await cache.get_or_load("k", ok))[0] == 1
+
+    @pytest.mark.asyncio
+    async def test_waiter_retries_when_leader_cancelled(self):
+        cache: AsyncTTLCache[str, str] = AsyncTTLCache(ttl=60)
+
+        async def slow():
+            await asyncio.sleep(10)
+            return "leader"
+
+        async def fast():
+            return "waiter"
+
+        leader = asyncio.create_task(cache.get_or_load("k", slow))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_load("k", fast))
+        await asyncio.sleep(0)
+        leader.cancel()
+        assert (await waiter)[0] == "waiter"
+
+    def test_expired_entry_is_dropped(self):
+        cache: AsyncTTLCache[str, int] = AsyncTTLCache(ttl=0)
+        cache.set("k", 1)
+        assert cache.get("k") is None
+
+    def test_maxsize_evicts_least_recently_used(self):
+        cache: AsyncTTLCache[str, int] = AsyncTTLCache(ttl=60, maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
@@ -0,0 +1,37 @@
+from backend.utils.url_canonical import canonicalize, dedup_key
+
+_TRACKING = ["utm_*", "spm", "share_from"]
+
+
+class TestCanonicalize:
+    def test_lowercases_and_drops_default_port_and_fragment(self):
+        assert canonicalize("HTTPS://News.Example.COM:443/a/B?x=1#top", {}, _TRACKING) == \
+            "https://news.example.com/a/B?x=1"
+
+    def test_keeps_non_default_port(self):
+        assert canonicalize("http://example.com:8080/a", {}, _TRACKING) == "http://example.com:8080/a"
+
+    def test_strips_tracking_params_and_sorts_rest(self):
+        url = "https://example.com/a?b=2&utm_source=wx&UTM_Medium=x&spm=1.2&a=%E4%B8%AD"
+        assert canonicalize(url, {}, _TRACKING) == "https://example.com/a?a=%E4%B8%AD&b=2"
+
+    def test_host_rule(self):
+        rules = {"m.example.com": {"host": "www.example.com", "https": True, "drop_params": ["ref"]}}
+        assert canonicalize("http://m.example.com/news/1?ref=app&id=3", rules, _TRACKING) == \
+            "https://www.example.com/news/1?id=3"
+
+    def test_unparseable_url_returned_unchanged(self):
+        assert canonicalize("http://[bad/path", {}, _TRACKING) == "http://[bad/path"
+        assert canonicalize("/relative/only", {}, _TRACKING) == "/relative/only"
+
+
+class TestDedupKey:
+    def test_ignores_scheme_and_tracking(self):
+        assert dedup_key("http://example.com/a?utm_source=x") == dedup_key("https://example.com/a")
+
+    def test_distinguishes_different_articles(self):
+        assert dedup_key("https://example.com/a?id=1") != dedup_key("https://example.com/a?id=2")
+
+    def test_from_param_is_kept_by_default(self):
+        """from 常用作分页 / 文章 ID，默认不当作跟踪参数"""
+        assert dedup_key("https://example.com/list?from=20") != dedup_key("https://example.com/list?from=40")